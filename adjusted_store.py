@@ -0,0 +1,329 @@
+"""
+BIST Trading System - Adjusted Price Store Module
+Raw OHLCV plus a corporate-actions table, with adjusted prices computed lazily from cached factors
+"""
+
+import os
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data_storage import DataStorage, get_storage, ticker_from_filename
+
+logger = logging.getLogger(__name__)
+
+ACTIONS_NAME = "corporate_actions.csv"
+FACTORS_NAME = "adjustment_factors.csv"
+
+# Type is 'split' (Value = new shares per old share, e.g. 2.0 for a 100% bedelsiz issue),
+# 'rights' (bedelli issue: Value = new shares per old share, Price = subscription price)
+# or 'dividend' (Value = cash per share). In_Raw marks actions the stored raw prices
+# already reflect, which are never applied again.
+ACTION_COLUMNS = ['Ticker', 'Date', 'Type', 'Value', 'Price', 'In_Raw', 'Source', 'Recorded']
+
+# Factors of the actions on Date, cumulated with every later action; they apply to bars before Date
+FACTOR_COLUMNS = ['Ticker', 'Date', 'Split_Factor', 'Total_Factor', 'Volume_Factor']
+
+ADJUSTMENTS = ('none', 'split', 'total')
+
+def local_days(index: pd.DatetimeIndex, timezone: str = "Europe/Istanbul") -> pd.DatetimeIndex:
+    """Exchange-local calendar day of every bar, as naive midnight timestamps"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert(timezone).tz_localize(None)
+    return index.normalize()
+
+def actions_from_history(ticker: str, data: pd.DataFrame) -> pd.DataFrame:
+    """Split and dividend events in the 'Stock Splits'/'Dividends' columns of a yfinance frame"""
+    days = local_days(data.index)
+    events = []
+    for column, kind in (('Stock Splits', 'split'), ('Dividends', 'dividend')):
+        if column not in data.columns:
+            continue
+        values = data[column].fillna(0).to_numpy(dtype=np.float64)
+        hits = np.flatnonzero((values > 0) & ((values != 1) if kind == 'split' else True))
+        events.extend({'Ticker': ticker, 'Date': days[i].strftime('%Y-%m-%d'), 'Type': kind,
+                       'Value': float(values[i]), 'Price': np.nan} for i in hits)
+    return pd.DataFrame(events, columns=['Ticker', 'Date', 'Type', 'Value', 'Price'])
+
+def undo_split_adjustment(data: pd.DataFrame, splits: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert split-adjusted bars back to the prices and volumes that actually traded
+    
+    Yahoo expresses every bar in today's share count, so bars before a split
+    in the fetched window are multiplied back by its ratio (volumes divided).
+    
+    Args:
+        data: Fetched bars
+        splits: Split actions inside the fetched window
+    """
+    if splits.empty:
+        return data
+    data = data.copy()
+    split_days = pd.DatetimeIndex(pd.to_datetime(splits['Date'])).to_numpy()
+    ratios = splits['Value'].to_numpy(dtype=np.float64)
+    order = np.argsort(split_days)
+    split_days, ratios = split_days[order], ratios[order]
+    # Product of the ratios of every split after each bar
+    later = np.concatenate([np.cumprod(ratios[::-1])[::-1], [1.0]])
+    scale = later[np.searchsorted(split_days, local_days(data.index).to_numpy(), side='right')]
+    
+    for col in ('Open', 'High', 'Low', 'Close', 'Dividends'):
+        if col in data.columns:
+            data[col] = data[col].to_numpy(dtype=np.float64) * scale
+    if 'Volume' in data.columns:
+        data['Volume'] = np.round(data['Volume'].to_numpy(dtype=np.float64) / scale)
+    return data
+
+def adjustment_factors(actions: pd.DataFrame, close: pd.Series) -> pd.DataFrame:
+    """
+    Backward adjustment factors of one ticker
+    
+    The latest prices are left unchanged and earlier bars are scaled:
+    splits by 1 / ratio, rights issues by the theoretical ex-rights price
+    over the previous close, and dividends (total-return factor only) by
+    1 - dividend / previous close.
+    
+    Args:
+        actions: The ticker's corporate actions
+        close: The ticker's raw close prices
+    
+    Returns:
+        DataFrame with FACTOR_COLUMNS except Ticker, one row per action date
+    """
+    actions = actions[~actions['In_Raw'].astype(bool)]
+    if actions.empty:
+        return pd.DataFrame(columns=FACTOR_COLUMNS[1:])
+    
+    close_days = local_days(close.index)
+    closes = close.to_numpy(dtype=np.float64)
+    rows = {}
+    for action in actions.sort_values('Date').itertuples():
+        day = pd.Timestamp(action.Date)
+        previous = np.searchsorted(close_days, day, side='left') - 1
+        previous_close = closes[previous] if previous >= 0 else np.nan
+        split, total, volume = rows.get(action.Date, (1.0, 1.0, 1.0))
+        
+        if action.Type == 'split':
+            split, total, volume = split / action.Value, total / action.Value, volume * action.Value
+        elif action.Type == 'rights' and previous_close > 0:
+            ex_rights = (previous_close + action.Value * action.Price) / (1 + action.Value)
+            factor = ex_rights / previous_close
+            split, total, volume = split * factor, total * factor, volume * (1 + action.Value)
+        elif action.Type == 'dividend' and previous_close > 0:
+            total *= 1 - action.Value / previous_close
+        rows[action.Date] = (split, total, volume)
+    
+    factors = pd.DataFrame.from_dict(rows, orient='index', columns=FACTOR_COLUMNS[2:])
+    factors = factors.iloc[::-1].cumprod().iloc[::-1]
+    return factors.rename_axis('Date').reset_index()
+
+class AdjustedPriceStore:
+    """
+    Raw daily OHLCV per ticker with a separate corporate-actions table
+    
+    Raw files never change when a split or dividend happens; adjusted series
+    are derived on read from per-ticker adjustment factors. The factors are
+    cached in memory and in ``adjustment_factors.csv``, and recording a new
+    action only drops the cached factors of that ticker.
+    """
+    
+    def __init__(self, data_dir: str = "data/adjusted",
+                 storage: Union[str, DataStorage] = "csv",
+                 timezone: str = "Europe/Istanbul"):
+        """
+        Args:
+            data_dir: Directory holding the raw files and the two tables
+            storage: Storage backend name ('csv', 'parquet', 'feather') or instance
+            timezone: Exchange timezone used to match bars with action dates
+        """
+        self.data_dir = data_dir
+        self.storage = get_storage(storage, data_dir) if isinstance(storage, str) else storage
+        self.timezone = timezone
+        self.actions_path = os.path.join(data_dir, ACTIONS_NAME)
+        self.factors_path = os.path.join(data_dir, FACTORS_NAME)
+        os.makedirs(data_dir, exist_ok=True)
+        self._actions = self._read_table(self.actions_path, ACTION_COLUMNS)
+        self._actions['In_Raw'] = self._actions['In_Raw'].astype(bool)
+        factors = self._read_table(self.factors_path, FACTOR_COLUMNS)
+        self._factors = {ticker: group.drop(columns='Ticker').reset_index(drop=True)
+                         for ticker, group in factors.groupby('Ticker')}
+    
+    @staticmethod
+    def _read_table(path: str, columns: List[str]) -> pd.DataFrame:
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=columns)
+        return pd.read_csv(path, dtype={'Ticker': 'str', 'Date': 'str', 'Type': 'str'})
+    
+    @staticmethod
+    def _write_table(data: pd.DataFrame, path: str) -> None:
+        data.to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    
+    def raw_path(self, ticker: str) -> str:
+        return self.storage.path_for(ticker, "raw", "1d")
+    
+    def tickers(self) -> List[str]:
+        """Tickers with a stored raw file (the action and factor tables share the directory)"""
+        suffix = f"_raw_1d{self.storage.extension}"
+        return [ticker_from_filename(file) for file in self.storage.list_files() if file.endswith(suffix)]
+    
+    def raw(self, ticker: str) -> pd.DataFrame:
+        """Stored raw bars of a ticker (empty when it has none)"""
+        path = self.raw_path(ticker)
+        return self.storage.load(path) if os.path.exists(path) else pd.DataFrame()
+    
+    def actions(self, ticker: Optional[str] = None) -> pd.DataFrame:
+        """Corporate actions, optionally of one ticker, in date order"""
+        actions = self._actions if ticker is None else self._actions[self._actions['Ticker'] == ticker]
+        return actions.sort_values(['Ticker', 'Date'], kind='stable').reset_index(drop=True)
+    
+    def record_actions(self, actions: pd.DataFrame, in_raw: bool = False,
+                       source: str = "manual") -> List[str]:
+        """
+        Add corporate actions, ignoring ones already recorded
+        
+        Args:
+            actions: Rows with Ticker, Date ('YYYY-MM-DD'), Type, Value and,
+                for rights issues, Price
+            in_raw: Whether the stored raw prices already reflect the actions
+            source: Where the actions came from ('yahoo', 'kap', 'manual', ...)
+        
+        Returns:
+            Tickers that received new actions (their factors are recomputed)
+        """
+        actions = actions.reindex(columns=ACTION_COLUMNS).copy()
+        actions['In_Raw'] = in_raw
+        actions['Source'] = source
+        actions['Recorded'] = datetime.now().isoformat(timespec='seconds')
+        
+        key = ['Ticker', 'Date', 'Type']
+        known = pd.MultiIndex.from_frame(self._actions[key]) if len(self._actions) else None
+        if known is not None:
+            actions = actions[~pd.MultiIndex.from_frame(actions[key]).isin(known)]
+        actions = actions.drop_duplicates(key)
+        if actions.empty:
+            return []
+        
+        self._actions = pd.concat([df for df in (self._actions, actions) if len(df)],
+                                  ignore_index=True)
+        self._write_table(self._actions, self.actions_path)
+        changed = sorted(actions['Ticker'].unique())
+        for ticker in changed:
+            logger.info(f"New corporate actions for {ticker}: "
+                        + ", ".join(f"{a.Type} {a.Value:g} on {a.Date}"
+                                    for a in actions[actions['Ticker'] == ticker].itertuples()))
+        self.invalidate(changed)
+        return changed
+    
+    def write_raw(self, ticker: str, data: pd.DataFrame, adjusted: str = "split") -> pd.DataFrame:
+        """
+        Merge fetched bars into a ticker's raw file and record their corporate actions
+        
+        Args:
+            ticker: Ticker symbol
+            data: Fetched bars, with 'Stock Splits'/'Dividends' columns when available
+            adjusted: Adjustment already applied to ``data``: 'split' for
+                yfinance with auto_adjust=False (undone here so the stored
+                prices are raw), 'total' for auto_adjust=True frames such as
+                the existing data files (stored as-is, their actions marked
+                In_Raw), or 'none' for unadjusted data
+        
+        Returns:
+            The merged raw bars
+        """
+        if adjusted not in ADJUSTMENTS:
+            raise ValueError(f"Unknown adjustment '{adjusted}'. Choose from: {', '.join(ADJUSTMENTS)}")
+        if data is None or data.empty:
+            return self.raw(ticker)
+        
+        events = actions_from_history(ticker, data)
+        if adjusted == "split":
+            data = undo_split_adjustment(data, events[events['Type'] == 'split'])
+            # Dividends reported next to split-adjusted prices were scaled back as well
+            events = actions_from_history(ticker, data)
+        
+        existing = self.raw(ticker)
+        if not existing.empty:
+            first = data.index.min()
+            data = data.copy()
+            if existing.index.tz is not None and data.index.tz is not None:
+                data.index = data.index.tz_convert(existing.index.tz)
+            data = pd.concat([existing[existing.index < first],
+                              data.reindex(columns=existing.columns)])
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        self.storage.save(ticker, data, "raw", "1d")
+        
+        self.record_actions(events, in_raw=adjusted == "total", source="yahoo")
+        return data
+    
+    def invalidate(self, tickers: Iterable[str]) -> None:
+        """Drop the cached factors of some tickers"""
+        for ticker in tickers:
+            self._factors.pop(ticker, None)
+        self._save_factors()
+    
+    def _save_factors(self) -> None:
+        frames = [factors.assign(Ticker=ticker) for ticker, factors in self._factors.items()
+                  if len(factors)]
+        table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        self._write_table(table.reindex(columns=FACTOR_COLUMNS), self.factors_path)
+    
+    def factors(self, ticker: str) -> pd.DataFrame:
+        """Adjustment factors of a ticker, computed on first use and cached until its actions change"""
+        if ticker in self._factors:
+            return self._factors[ticker]
+        
+        actions = self.actions(ticker)
+        if actions['In_Raw'].all():
+            # Nothing to apply: the raw prices are already the adjusted ones
+            return pd.DataFrame(columns=FACTOR_COLUMNS[1:])
+        
+        raw = self.raw(ticker)
+        close = raw['Close'] if 'Close' in raw.columns else pd.Series(dtype=np.float64)
+        self._factors[ticker] = adjustment_factors(actions, close)
+        self._save_factors()
+        logger.info(f"Computed adjustment factors for {ticker}")
+        return self._factors[ticker]
+    
+    def adjusted(self, ticker: str, kind: str = "total") -> pd.DataFrame:
+        """
+        A ticker's bars adjusted for its corporate actions
+        
+        Args:
+            ticker: Ticker symbol
+            kind: 'split' (splits and rights issues) or 'total' (also dividends)
+        
+        Returns:
+            Raw bars with prices and volume scaled by the cached factors
+        """
+        if kind not in ('split', 'total'):
+            raise ValueError("kind must be 'split' or 'total'")
+        data = self.raw(ticker)
+        factors = self.factors(ticker)
+        if data.empty or factors.empty:
+            return data
+        
+        data = data.copy()
+        action_days = pd.DatetimeIndex(pd.to_datetime(factors['Date'])).to_numpy()
+        positions = np.searchsorted(action_days, local_days(data.index, self.timezone).to_numpy(),
+                                    side='right')
+        price = np.append(factors[f"{kind.capitalize()}_Factor"].to_numpy(dtype=np.float64), 1.0)
+        volume = np.append(factors['Volume_Factor'].to_numpy(dtype=np.float64), 1.0)
+        
+        for col in ('Open', 'High', 'Low', 'Close'):
+            if col in data.columns:
+                data[col] = data[col].to_numpy(dtype=np.float64) * price[positions]
+        if 'Volume' in data.columns:
+            data['Volume'] = data['Volume'].to_numpy(dtype=np.float64) * volume[positions]
+        return data
+    
+    def load_data_dict(self, tickers: Optional[Iterable[str]] = None,
+                       kind: str = "total") -> Dict[str, pd.DataFrame]:
+        """Adjusted frames of many tickers, like ``load_market_data`` returns"""
+        tickers = list(tickers) if tickers is not None else self.tickers()
+        frames = {ticker: self.adjusted(ticker, kind) for ticker in tickers}
+        return {ticker: data for ticker, data in frames.items() if not data.empty}
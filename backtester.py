@@ -0,0 +1,275 @@
+"""
+BIST Trading System - Backtester Module
+Vectorized backtests of dates x tickers signal matrices with BIST trading costs
+"""
+
+import sys
+import logging
+from functools import partial
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import BACKTEST_SETTINGS, BIST_TICKERS
+from data_storage import detect_storage, load_market_data
+from indicators import pack, packed, sma, unpacked
+from market_panel import MarketPanel, load_saved_panel
+from market_stats import aligned_returns
+from sweep_runner import run_sweep
+
+logger = logging.getLogger(__name__)
+
+BACKTEST_STATS_COLUMNS = ['Total_Return', 'Annual_Return', 'Volatility', 'Sharpe',
+                          'Max_Drawdown', 'Avg_Turnover', 'Total_Costs']
+
+def load_backtest_panel(data_dir: str = "data",
+                        tickers: Optional[Sequence[str]] = BIST_TICKERS) -> MarketPanel:
+    """
+    Load the downloaded universe from the directory ``create_mega_viz`` reads
+    
+    The memory-mapped market panel saved after the last download is used
+    while the files are unchanged; otherwise the files are parsed.
+    
+    Args:
+        data_dir: Data directory holding the ticker files
+        tickers: Tickers to keep (defaults to config.BIST_TICKERS, None keeps all)
+    
+    Returns:
+        MarketPanel with Close and Volume for every loaded ticker
+    """
+    storage = detect_storage(data_dir)
+    saved = load_saved_panel(storage)
+    if saved is not None:
+        wanted = set(tickers) if tickers is not None else None
+        return saved.select([ticker for ticker in saved.tickers
+                             if wanted is None or ticker in wanted], ['Close', 'Volume'])
+    
+    data_dict, _ = load_market_data(storage, required_columns=('Close', 'Volume'),
+                                    exclude_prefixes=('test_',))
+    if tickers is not None:
+        wanted = set(tickers)
+        data_dict = {ticker: data for ticker, data in data_dict.items() if ticker in wanted}
+    return MarketPanel.from_data_dict(data_dict, fields=['Close', 'Volume'])
+
+def equal_weight(mask: np.ndarray) -> np.ndarray:
+    """Spread the book equally over the selected tickers of every row"""
+    mask = np.asarray(mask, dtype=np.float64)
+    counts = mask.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, mask / counts, 0.0)
+
+def target_positions(signals: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """
+    Turn target weights into the weights actually held after each close
+    
+    A ticker can only be traded on days it has a bar: on other days the
+    previous weight is carried. NaN targets on trading days mean flat.
+    """
+    signals = np.where(present, np.nan_to_num(np.asarray(signals, dtype=np.float64)), np.nan)
+    rows = np.arange(signals.shape[0])[:, None]
+    last_set = np.maximum.accumulate(np.where(present, rows, -1), axis=0)
+    cols = np.broadcast_to(np.arange(signals.shape[1]), signals.shape)
+    return np.where(last_set >= 0, signals[np.maximum(last_set, 0), cols], 0.0)
+
+def backtest_arrays(close: np.ndarray, signals: np.ndarray,
+                    commission_rate: float = BACKTEST_SETTINGS["commission_rate"],
+                    bsmv_rate: float = BACKTEST_SETTINGS["bsmv_rate"],
+                    slippage_rate: float = BACKTEST_SETTINGS["slippage_rate"],
+                    returns: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Core backtest on aligned dates x tickers arrays
+    
+    Signals are target weights decided at a day's close; they are traded at
+    that close and earn the next bar's return, so there is no lookahead.
+    Every traded unit of weight pays the commission, BSMV on the commission
+    and slippage.
+    
+    Args:
+        close: Dates x tickers close prices, NaN where a ticker has no bar
+        signals: Dates x tickers target weights
+        commission_rate: Broker commission per traded value
+        bsmv_rate: BSMV tax as a fraction of the commission
+        slippage_rate: Extra cost per traded value
+        returns: Precomputed aligned returns (computed from close when omitted)
+    
+    Returns:
+        Dictionary of arrays: positions, gross/net/cost/turnover series and
+        per-ticker pnl and costs
+    """
+    close = np.asarray(close, dtype=np.float64)
+    present = ~np.isnan(close)
+    if returns is None:
+        returns = aligned_returns(close, present)
+    returns = np.nan_to_num(returns)
+    
+    positions = target_positions(signals, present)
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    
+    trades = np.abs(np.diff(positions, axis=0, prepend=0.0))
+    cost_rate = commission_rate * (1 + bsmv_rate) + slippage_rate
+    ticker_pnl = held * returns
+    ticker_costs = trades * cost_rate
+    
+    gross = ticker_pnl.sum(axis=1)
+    costs = ticker_costs.sum(axis=1)
+    net = gross - costs
+    equity = np.cumprod(1 + net)
+    
+    return {
+        'positions': positions,
+        'gross_returns': gross,
+        'costs': costs,
+        'returns': net,
+        'turnover': trades.sum(axis=1),
+        'equity': equity,
+        'drawdown': equity / np.maximum.accumulate(equity) - 1,
+        'ticker_pnl': ticker_pnl.sum(axis=0),
+        'ticker_costs': ticker_costs.sum(axis=0),
+    }
+
+def backtest_stats(result: Dict[str, np.ndarray],
+                   periods_per_year: int = BACKTEST_SETTINGS["periods_per_year"]) -> Dict[str, float]:
+    """Summary statistics of a backtest result (BACKTEST_STATS_COLUMNS)"""
+    net = result['returns']
+    periods = max(len(net), 1)
+    total = float(result['equity'][-1] - 1) if len(net) else 0.0
+    volatility = float(np.std(net, ddof=1) * np.sqrt(periods_per_year)) if len(net) > 1 else np.nan
+    annual = float((1 + total) ** (periods_per_year / periods) - 1) if total > -1 else -1.0
+    return {
+        'Total_Return': total * 100,
+        'Annual_Return': annual * 100,
+        'Volatility': volatility * 100,
+        'Sharpe': float(np.mean(net) * periods_per_year / volatility) if volatility else np.nan,
+        'Max_Drawdown': float(result['drawdown'].min()) * 100 if len(net) else 0.0,
+        'Avg_Turnover': float(result['turnover'].mean()) if len(net) else 0.0,
+        'Total_Costs': float(result['costs'].sum()) * 100,
+    }
+
+def run_backtest(close: pd.DataFrame, signals: pd.DataFrame,
+                 periods_per_year: int = BACKTEST_SETTINGS["periods_per_year"],
+                 **costs) -> Dict:
+    """
+    Backtest a signal matrix against aligned close prices
+    
+    Args:
+        close: Dates x tickers close prices (e.g. ``panel.field('Close')``)
+        signals: Dates x tickers target weights; reindexed to ``close``,
+            missing entries mean flat
+        periods_per_year: Bars per year used to annualize the statistics
+        **costs: commission_rate, bsmv_rate and slippage_rate overrides
+    
+    Returns:
+        Dictionary with positions (DataFrame), returns, gross_returns, costs,
+        turnover, equity and drawdown (Series), attribution (DataFrame with
+        per-ticker PnL, Costs and Net_PnL) and stats (dictionary)
+    """
+    signals = signals.reindex(index=close.index, columns=close.columns)
+    result = backtest_arrays(close.to_numpy(dtype=np.float64), signals.to_numpy(dtype=np.float64),
+                             **costs)
+    
+    series = {name: pd.Series(result[name], index=close.index, name=name)
+              for name in ('returns', 'gross_returns', 'costs', 'turnover', 'equity', 'drawdown')}
+    attribution = pd.DataFrame({
+        'PnL': result['ticker_pnl'] * 100,
+        'Costs': result['ticker_costs'] * 100,
+    }, index=close.columns)
+    attribution['Net_PnL'] = attribution['PnL'] - attribution['Costs']
+    
+    return dict(series,
+                positions=pd.DataFrame(result['positions'], index=close.index, columns=close.columns),
+                attribution=attribution.sort_values('Net_PnL', ascending=False),
+                stats=backtest_stats(result, periods_per_year))
+
+def ma_crossover_signals(close: np.ndarray, fast: int = 20, slow: int = 50) -> np.ndarray:
+    """Equal-weight long book of tickers whose fast SMA is above their slow SMA"""
+    present = ~np.isnan(close)
+    order = pack(present)
+    packed_close = packed(close, order)
+    fast_ma = unpacked(sma(packed_close, fast), order, present)
+    slow_ma = unpacked(sma(packed_close, slow), order, present)
+    with np.errstate(invalid='ignore'):
+        return equal_weight(fast_ma > slow_ma)
+
+def momentum_signals(close: np.ndarray, lookback: int = 60, top: int = 20) -> np.ndarray:
+    """Equal-weight long book of the ``top`` tickers by trailing ``lookback``-bar return"""
+    if lookback < 1:
+        raise ValueError(f"Momentum lookback must be at least 1 bar, got {lookback}")
+    present = ~np.isnan(close)
+    order = pack(present)
+    packed_close = packed(close, order)
+    past = np.full(packed_close.shape, np.nan)
+    past[lookback:] = packed_close[:-lookback]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        momentum = unpacked(packed_close / past - 1, order, present)
+    
+    ranked = np.where(np.isnan(momentum), -np.inf, momentum)
+    rank = np.argsort(np.argsort(-ranked, axis=1, kind='stable'), axis=1)
+    return equal_weight((rank < top) & ~np.isnan(momentum))
+
+STRATEGIES: Dict[str, Callable[..., np.ndarray]] = {
+    'ma_crossover': ma_crossover_signals,
+    'momentum': momentum_signals,
+}
+
+def backtest_variant(panel: MarketPanel, strategy: str, costs: Optional[Dict] = None,
+                     periods_per_year: int = BACKTEST_SETTINGS["periods_per_year"],
+                     **params) -> Dict[str, float]:
+    """Backtest one parameter set of a strategy and return its summary statistics"""
+    close = np.asarray(panel.values[panel.fields.index('Close')], dtype=np.float64)
+    signals = STRATEGIES[strategy](close, **params)
+    return backtest_stats(backtest_arrays(close, signals, **(costs or {})), periods_per_year)
+
+def run_parameter_sweep(panel: MarketPanel, strategy: str, grid: Dict[str, Sequence],
+                        max_workers: Optional[int] = None,
+                        periods_per_year: int = BACKTEST_SETTINGS["periods_per_year"],
+                        **costs) -> pd.DataFrame:
+    """
+    Backtest every parameter combination of a strategy on a process pool
+    
+    The workers share the panel through ``sweep_runner.run_sweep``.
+    
+    Args:
+        panel: Market panel with a Close field
+        strategy: Name of a STRATEGIES entry
+        grid: {parameter: values} grid, e.g. {'fast': [10, 20], 'slow': [50, 100]}
+        max_workers: Number of worker processes (defaults to the CPU count)
+        periods_per_year: Bars per year used to annualize the statistics
+        **costs: commission_rate, bsmv_rate and slippage_rate overrides
+    
+    Returns:
+        DataFrame with one row per successful variant: the parameters
+        followed by the BACKTEST_STATS_COLUMNS, best Sharpe first (empty
+        if every variant failed)
+    """
+    variant = partial(backtest_variant, strategy=strategy, costs=costs,
+                      periods_per_year=periods_per_year)
+    results = run_sweep(panel, variant, grid, max_workers)
+    
+    failed = results['error'].notna()
+    if failed.any():
+        logger.warning(f"Dropping {int(failed.sum())} of {len(results)} {strategy} variants "
+                       f"that failed, e.g. {results.loc[failed, 'error'].iloc[0]}")
+    results = results.loc[~failed].reindex(columns=list(grid) + BACKTEST_STATS_COLUMNS)
+    results = results.astype(dict.fromkeys(BACKTEST_STATS_COLUMNS, np.float64))
+    return results.sort_values('Sharpe', ascending=False, ignore_index=True)
+
+def main():
+    """Sweep the moving average crossover over the downloaded universe"""
+    logging.basicConfig(level=logging.INFO)
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    panel = load_backtest_panel(data_dir)
+    if not len(panel):
+        print(f"No data found in {data_dir}")
+        return False
+    
+    print(f"Backtesting {len(panel)} tickers over {len(panel.dates)} days...")
+    results = run_parameter_sweep(panel, 'ma_crossover',
+                                  {'fast': [5, 10, 20, 50], 'slow': [50, 100, 150, 200]})
+    print(results.head(10).round(2).to_string(index=False))
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,101 +1,188 @@
-"""
-Configuration file for BIST Trading System
-"""
-
-# BIST Ticker Symbols for testing - Extended List
-BIST_TICKERS = [
-    # Original 5 tickers (keep existing data)
-    "THYAO.IS",  # Turkish Airlines
-    "GARAN.IS",  # Garanti Bank
-    "AKBNK.IS",  # Akbank
-    "ASELS.IS",  # Aselsan
-    "KRDMD.IS",  # KARDEMIR
-    
-    # New tickers to add
-    "A1CAP.IS", "A1YEN.IS", "ACSEL.IS", "ADEL.IS", "ADESE.IS", "ADGYO.IS", "AEFES.IS", "AFYON.IS", "AGESA.IS", "AGHOL.IS",
-    "AGROT.IS", "AGYO.IS", "AHGAZ.IS", "AHSGY.IS", "AKCNS.IS", "AKENR.IS", "AKFGY.IS", "AKFIS.IS", "AKFYE.IS", "AKGRT.IS",
-    "AKMGY.IS", "AKSA.IS", "AKSEN.IS", "AKSGY.IS", "AKSUE.IS", "AKYHO.IS", "ALARK.IS", "ALBRK.IS", "ALCAR.IS", "ALCTL.IS",
-    "ALFAS.IS", "ALGYO.IS", "ALKA.IS", "ALKIM.IS", "ALKLC.IS", "ALTNY.IS", "ALVES.IS", "ANELE.IS", "ANGEN.IS", "ANHYT.IS",
-    "ANSGR.IS", "APBDL.IS", "APLIB.IS", "APX30.IS", "ARASE.IS", "ARCLK.IS", "ARDYZ.IS", "ARENA.IS", "ARMGD.IS", "ARSAN.IS",
-    "ARTMS.IS", "ARZUM.IS", "ASGYO.IS", "ASTOR.IS", "ASUZU.IS", "ATAGY.IS", "ATAKP.IS", "ATATP.IS", "ATEKS.IS", "ATLAS.IS",
-    "ATSYH.IS", "AVGYO.IS", "AVHOL.IS", "AVOD.IS", "AVPGY.IS", "AVTUR.IS", "AYCES.IS", "AYDEM.IS", "AYEN.IS", "AYES.IS",
-    "AYGAZ.IS", "AZTEK.IS", "BAGFS.IS", "BAHKM.IS", "BAKAB.IS", "BALAT.IS", "BALSU.IS", "BANVT.IS", "BARMA.IS", "BASCM.IS",
-    "BASGZ.IS", "BAYRK.IS", "BEGYO.IS", "BERA.IS", "BESLR.IS", "BEYAZ.IS", "BFREN.IS", "BIENY.IS", "BIGCH.IS", "BIGEN.IS",
-    "BIMAS.IS", "BINBN.IS", "BINHO.IS", "BIOEN.IS", "BIZIM.IS", "BJKAS.IS", "BLCYT.IS", "BMSCH.IS", "BMSTL.IS", "BNTAS.IS",
-    "BOBET.IS", "BORLS.IS", "BORSK.IS", "BOSSA.IS", "BRISA.IS", "BRKO.IS", "BRKSN.IS", "BRKVY.IS", "BRLSM.IS", "BRMEN.IS",
-    "BRSAN.IS", "BRYAT.IS", "BSOKE.IS", "BTCIM.IS", "BUCIM.IS", "BULGS.IS", "BURCE.IS", "BURVA.IS", "BVSAN.IS", "BYDNR.IS",
-    "CANTE.IS", "CASA.IS", "CATES.IS", "CCOLA.IS", "CELHA.IS", "CEMAS.IS", "CEMTS.IS", "CEMZY.IS", "CEOEM.IS", "CGCAM.IS",
-    "CIMSA.IS", "CLEBI.IS", "CMBTN.IS", "CMENT.IS", "CONSE.IS", "COSMO.IS", "CRDFA.IS", "CRFSA.IS", "CUSAN.IS", "CVKMD.IS",
-    "CWENE.IS", "DAGHL.IS", "DAGI.IS", "DAPGM.IS", "DARDL.IS", "DCTTR.IS", "DENGE.IS", "DERHL.IS", "DERIM.IS", "DESA.IS",
-    "DESPC.IS", "DEVA.IS", "DGATE.IS", "DGGYO.IS", "DGNMO.IS", "DIRIT.IS", "DITAS.IS", "DMRGD.IS", "DMSAS.IS", "DNISI.IS",
-    "DOAS.IS", "DOBUR.IS", "DOCO.IS", "DOFER.IS", "DOGUB.IS", "DOHOL.IS", "DOKTA.IS", "DSTKF.IS", "DURDO.IS", "DURKN.IS",
-    "DYOBY.IS", "DZGYO.IS", "EBEBK.IS", "ECILC.IS", "ECZYT.IS", "EDATA.IS", "EDIP.IS", "EFORC.IS", "EGEEN.IS", "EGEGY.IS",
-    "EGEPO.IS", "EGGUB.IS", "EGPRO.IS", "EGSER.IS", "EKGYO.IS", "EKIZ.IS", "EKOS.IS", "EKSUN.IS", "ELITE.IS", "EMKEL.IS",
-    "EMNIS.IS", "ENDAE.IS", "ENERY.IS", "ENJSA.IS", "ENKAI.IS", "ENSRI.IS", "ENTRA.IS", "EPLAS.IS", "ERBOS.IS", "ERCB.IS",
-    "EREGL.IS", "ERSU.IS", "ESCAR.IS", "ESCOM.IS", "ESEN.IS", "ETILR.IS", "ETYAT.IS", "EUHOL.IS", "EUKYO.IS", "EUPWR.IS",
-    "EUREN.IS", "EUYO.IS", "EYGYO.IS", "FADE.IS", "FENER.IS", "FLAP.IS", "FMIZP.IS", "FONET.IS", "FORMT.IS", "FORTE.IS",
-    "FRIGO.IS", "FROTO.IS", "FZLGY.IS", "GARFA.IS", "GEDIK.IS", "GEDZA.IS", "GENIL.IS", "GENTS.IS", "GEREL.IS", "GESAN.IS",
-    "GIPTA.IS", "GLBMD.IS", "GLCVY.IS", "GLDTR.IS", "GLRMK.IS", "GLRYH.IS", "GLYHO.IS", "GMSTR.IS", "GMTAS.IS", "GOKNR.IS",
-    "GOLTS.IS", "GOODY.IS", "GOZDE.IS", "GRNYO.IS", "GRSEL.IS", "GRTHO.IS", "GSDDE.IS", "GSDHO.IS", "GSRAY.IS", "GUBRF.IS",
-    "GUNDG.IS", "GWIND.IS", "GZNMI.IS", "HALKB.IS", "HALKS.IS", "HATEK.IS", "HATSN.IS", "HDFGS.IS", "HEDEF.IS", "HEKTS.IS",
-    "HKTM.IS", "HLGYO.IS", "HOROZ.IS", "HRKET.IS", "HTTBT.IS", "HUBVC.IS", "HUNER.IS", "HURGZ.IS", "ICBCT.IS", "ICUGS.IS",
-    "IDGYO.IS", "IEYHO.IS", "IHAAS.IS", "IHEVA.IS", "IHGZT.IS", "IHLAS.IS", "IHLGM.IS", "IHYAY.IS", "IMASM.IS", "INDES.IS",
-    "INFO.IS", "INGRM.IS", "INTEK.IS", "INTEM.IS", "INVEO.IS", "INVES.IS", "IPEKE.IS", "ISATR.IS", "ISBIR.IS", "ISBTR.IS",
-    "ISCTR.IS", "ISDMR.IS", "ISFIN.IS", "ISGLK.IS", "ISGSY.IS", "ISGYO.IS", "ISIST.IS", "ISKPL.IS", "ISMEN.IS", "ISSEN.IS",
-    "ISYAT.IS", "IZENR.IS", "IZFAS.IS", "IZINV.IS", "IZMDC.IS", "JANTS.IS", "KAPLM.IS", "KAREL.IS", "KARSN.IS", "KARTN.IS",
-    "KATMR.IS", "KAYSE.IS", "KBORU.IS", "KCAER.IS", "KENT.IS", "KERVN.IS", "KFEIN.IS", "KGYO.IS", "KIMMR.IS", "KLGYO.IS",
-    "KLKIM.IS", "KLMSN.IS", "KLNMA.IS", "KLRHO.IS", "KLSER.IS", "KLSYN.IS", "KLYPV.IS", "KMPUR.IS", "KNFRT.IS", "KOCMT.IS",
-    "KONKA.IS", "KONTR.IS", "KONYA.IS", "KOPOL.IS", "KORDS.IS", "KOTON.IS", "KOZAA.IS", "KOZAL.IS", "KRDMA.IS", "KRDMB.IS",
-    "KRGYO.IS", "KRONT.IS", "KRPLS.IS", "KRSTL.IS", "KRTEK.IS", "KRVGD.IS", "KSTUR.IS", "KTLEV.IS", "KTSKR.IS", "KUTPO.IS",
-    "KUVVA.IS", "KUYAS.IS", "KZBGY.IS", "KZGYO.IS", "LIDER.IS", "LIDFA.IS", "LILAK.IS", "LINK.IS", "LKMNH.IS", "LMKDC.IS",
-    "LOGO.IS", "LRSHO.IS", "LUKSK.IS", "LYDHO.IS", "LYDYE.IS", "MAALT.IS", "MACKO.IS", "MAGEN.IS", "MAKIM.IS", "MAKTK.IS",
-    "MANAS.IS", "MARBL.IS", "MARKA.IS", "MARTI.IS", "MAVI.IS", "MEDTR.IS", "MEGAP.IS", "MEGMT.IS", "MEKAG.IS", "MEPET.IS",
-    "MERCN.IS", "MERIT.IS", "MERKO.IS", "METRO.IS", "METUR.IS", "MGROS.IS", "MHRGY.IS", "MIATK.IS", "MMCAS.IS", "MNDRS.IS",
-    "MNDTR.IS", "MOBTL.IS", "MOGAN.IS", "MOPAS.IS", "MPARK.IS", "MRGYO.IS", "MRSHL.IS", "MSGYO.IS", "MTRKS.IS", "MTRYO.IS",
-    "MZHLD.IS", "NATEN.IS", "NETAS.IS", "NIBAS.IS", "NTGAZ.IS", "NTHOL.IS", "NUGYO.IS", "NUHCM.IS", "OBAMS.IS", "OBASE.IS",
-    "ODAS.IS", "ODINE.IS", "OFSYM.IS", "ONCSM.IS", "ONRYT.IS", "OPK30.IS", "OPT25.IS", "OPTGY.IS", "OPTLR.IS", "OPX30.IS",
-    "ORCAY.IS", "ORGE.IS", "ORMA.IS", "OSMEN.IS", "OSTIM.IS", "OTKAR.IS", "OTTO.IS", "OYAKC.IS", "OYAYO.IS", "OYLUM.IS",
-    "OYYAT.IS", "OZATD.IS", "OZGYO.IS", "OZKGY.IS", "OZRDN.IS", "OZSUB.IS", "OZYSR.IS", "PAGYO.IS", "PAMEL.IS", "PAPIL.IS",
-    "PARSN.IS", "PASEU.IS", "PATEK.IS", "PCILT.IS", "PEKGY.IS", "PENGD.IS", "PENTA.IS", "PETKM.IS", "PETUN.IS", "PGSUS.IS",
-    "PINSU.IS", "PKART.IS", "PKENT.IS", "PLTUR.IS", "PNLSN.IS", "PNSUT.IS", "POLHO.IS", "POLTK.IS", "PRDGS.IS", "PRKAB.IS",
-    "PRKME.IS", "PRZMA.IS", "PSDTC.IS", "PSGYO.IS", "QNBFK.IS", "QNBTR.IS", "QTEMZ.IS", "QUAGR.IS", "RALYH.IS", "RAYSG.IS",
-    "REEDR.IS", "RGYAS.IS", "RNPOL.IS", "RODRG.IS", "RTALB.IS", "RUBNS.IS", "RUZYE.IS", "RYGYO.IS", "RYSAS.IS", "SAFKR.IS",
-    "SAMAT.IS", "SANEL.IS", "SANFM.IS", "SANKO.IS", "SARKY.IS", "SASA.IS", "SAYAS.IS", "SDTTR.IS", "SEGMN.IS", "SEGYO.IS",
-    "SEKFK.IS", "SEKUR.IS", "SELEC.IS", "SELGD.IS", "SELVA.IS", "SERNT.IS", "SEYKM.IS", "SILVR.IS", "SISE.IS", "SKBNK.IS",
-    "SKTAS.IS", "SKYLP.IS", "SKYMD.IS", "SMART.IS", "SMRTG.IS", "SMRVA.IS", "SNGYO.IS", "SNICA.IS", "SNKRN.IS", "SODSN.IS",
-    "SOKE.IS", "SOKM.IS", "SONME.IS", "SRVGY.IS", "SUMAS.IS", "SUNTK.IS", "SURGY.IS", "SUWEN.IS", "TABGD.IS", "TARKM.IS",
-    "TATEN.IS", "TATGD.IS", "TAVHL.IS", "TBORG.IS", "TCELL.IS", "TCKRC.IS", "TDGYO.IS", "TEHOL.IS", "TEKTU.IS", "TERA.IS",
-    "TEZOL.IS", "TGSAS.IS", "TKFEN.IS", "TKNSA.IS", "TLMAN.IS", "TMPOL.IS", "TMSN.IS", "TNZTP.IS", "TOASO.IS", "TRCAS.IS",
-    "TRGYO.IS", "TRILC.IS", "TSGYO.IS", "TSKB.IS", "TSPOR.IS", "TTKOM.IS", "TTRAK.IS", "TUCLK.IS", "TUKAS.IS", "TUPRS.IS",
-    "TUREX.IS", "TURGG.IS", "TURSG.IS", "UFUK.IS", "ULAS.IS", "ULKER.IS", "ULUFA.IS", "ULUSE.IS", "ULUUN.IS", "UNLU.IS",
-    "USAK.IS", "USDTR.IS", "VAKBN.IS", "VAKFN.IS", "VAKKO.IS", "VANGD.IS", "VBTYZ.IS", "VERTU.IS", "VERUS.IS", "VESBE.IS",
-    "VESTL.IS", "VKFYO.IS", "VKGYO.IS", "VKING.IS", "VRGYO.IS", "VSNMD.IS", "X030S.IS", "X100S.IS", "XBANA.IS", "XBANK.IS",
-    "XBLSM.IS", "XELKT.IS", "XFINK.IS", "XGIDA.IS", "XGMYO.IS", "XHARZ.IS", "XHOLD.IS", "XILTM.IS", "XINSA.IS", "XKAGT.IS",
-    "XKMYA.IS", "XKOBI.IS", "XKURY.IS", "XMADN.IS", "XMANA.IS", "XMESY.IS", "XSADA.IS", "XSANK.IS", "XSANT.IS", "XSBAL.IS",
-    "XSBUR.IS", "XSDNZ.IS", "XSGRT.IS", "XSIST.IS", "XSIZM.IS", "XSKAY.IS", "XSKOC.IS", "XSKON.IS", "XSPOR.IS", "XSTKR.IS",
-    "XTAST.IS", "XTCRT.IS", "XTEKS.IS", "XTM25.IS", "XTMTU.IS", "XTRZM.IS", "XTUMY.IS", "XU030.IS", "XU050.IS", "XU100.IS",
-    "XUHIZ.IS", "XULAS.IS", "XUMAL.IS", "XUSIN.IS", "XUSRD.IS", "XUTEK.IS", "XUTUM.IS", "XYLDZ.IS", "XYORT.IS", "XYUZO.IS",
-    "YAPRK.IS", "YATAS.IS", "YAYLA.IS", "YBTAS.IS", "YEOTK.IS", "YESIL.IS", "YGGYO.IS", "YGYO.IS", "YIGIT.IS", "YKBNK.IS",
-    "YKSLN.IS", "YONGA.IS", "YUNSA.IS", "YYAPI.IS", "YYLGD.IS", "Z30EA.IS", "Z30KE.IS", "Z30KP.IS", "ZEDUR.IS", "ZELOT.IS",
-    "ZGOLD.IS", "ZOREN.IS", "ZPBDL.IS", "ZPLIB.IS", "ZPT10.IS", "ZPX30.IS", "ZRE20.IS", "ZRGYO.IS", "ZSR25.IS", "ZTM25.IS"
-]
-
-# Data download settings - Updated for 2025
-DOWNLOAD_SETTINGS = {
-    "period": "ytd",  # Year to date (from beginning of 2025)
-    "interval": "1d",  # Daily data
-    "start_date": "2025-01-01",
-    "end_date": "2025-12-31"
-}
-
-# File paths
-DATA_DIR = "data"
-LOG_DIR = "logs"
-OUTPUT_DIR = "output"
-
-# API settings (if using external APIs)
-API_SETTINGS = {
-    "timeout": 30,
-    "retry_attempts": 3,
-    "delay_between_requests": 1
-}
+"""
+Configuration file for BIST Trading System
+"""
+
+# BIST Ticker Symbols for testing - Extended List
+BIST_TICKERS = [
+    # Original 5 tickers (keep existing data)
+    "THYAO.IS",  # Turkish Airlines
+    "GARAN.IS",  # Garanti Bank
+    "AKBNK.IS",  # Akbank
+    "ASELS.IS",  # Aselsan
+    "KRDMD.IS",  # KARDEMIR
+    
+    # New tickers to add
+    "A1CAP.IS", "A1YEN.IS", "ACSEL.IS", "ADEL.IS", "ADESE.IS", "ADGYO.IS", "AEFES.IS", "AFYON.IS", "AGESA.IS", "AGHOL.IS",
+    "AGROT.IS", "AGYO.IS", "AHGAZ.IS", "AHSGY.IS", "AKCNS.IS", "AKENR.IS", "AKFGY.IS", "AKFIS.IS", "AKFYE.IS", "AKGRT.IS",
+    "AKMGY.IS", "AKSA.IS", "AKSEN.IS", "AKSGY.IS", "AKSUE.IS", "AKYHO.IS", "ALARK.IS", "ALBRK.IS", "ALCAR.IS", "ALCTL.IS",
+    "ALFAS.IS", "ALGYO.IS", "ALKA.IS", "ALKIM.IS", "ALKLC.IS", "ALTNY.IS", "ALVES.IS", "ANELE.IS", "ANGEN.IS", "ANHYT.IS",
+    "ANSGR.IS", "APBDL.IS", "APLIB.IS", "APX30.IS", "ARASE.IS", "ARCLK.IS", "ARDYZ.IS", "ARENA.IS", "ARMGD.IS", "ARSAN.IS",
+    "ARTMS.IS", "ARZUM.IS", "ASGYO.IS", "ASTOR.IS", "ASUZU.IS", "ATAGY.IS", "ATAKP.IS", "ATATP.IS", "ATEKS.IS", "ATLAS.IS",
+    "ATSYH.IS", "AVGYO.IS", "AVHOL.IS", "AVOD.IS", "AVPGY.IS", "AVTUR.IS", "AYCES.IS", "AYDEM.IS", "AYEN.IS", "AYES.IS",
+    "AYGAZ.IS", "AZTEK.IS", "BAGFS.IS", "BAHKM.IS", "BAKAB.IS", "BALAT.IS", "BALSU.IS", "BANVT.IS", "BARMA.IS", "BASCM.IS",
+    "BASGZ.IS", "BAYRK.IS", "BEGYO.IS", "BERA.IS", "BESLR.IS", "BEYAZ.IS", "BFREN.IS", "BIENY.IS", "BIGCH.IS", "BIGEN.IS",
+    "BIMAS.IS", "BINBN.IS", "BINHO.IS", "BIOEN.IS", "BIZIM.IS", "BJKAS.IS", "BLCYT.IS", "BMSCH.IS", "BMSTL.IS", "BNTAS.IS",
+    "BOBET.IS", "BORLS.IS", "BORSK.IS", "BOSSA.IS", "BRISA.IS", "BRKO.IS", "BRKSN.IS", "BRKVY.IS", "BRLSM.IS", "BRMEN.IS",
+    "BRSAN.IS", "BRYAT.IS", "BSOKE.IS", "BTCIM.IS", "BUCIM.IS", "BULGS.IS", "BURCE.IS", "BURVA.IS", "BVSAN.IS", "BYDNR.IS",
+    "CANTE.IS", "CASA.IS", "CATES.IS", "CCOLA.IS", "CELHA.IS", "CEMAS.IS", "CEMTS.IS", "CEMZY.IS", "CEOEM.IS", "CGCAM.IS",
+    "CIMSA.IS", "CLEBI.IS", "CMBTN.IS", "CMENT.IS", "CONSE.IS", "COSMO.IS", "CRDFA.IS", "CRFSA.IS", "CUSAN.IS", "CVKMD.IS",
+    "CWENE.IS", "DAGHL.IS", "DAGI.IS", "DAPGM.IS", "DARDL.IS", "DCTTR.IS", "DENGE.IS", "DERHL.IS", "DERIM.IS", "DESA.IS",
+    "DESPC.IS", "DEVA.IS", "DGATE.IS", "DGGYO.IS", "DGNMO.IS", "DIRIT.IS", "DITAS.IS", "DMRGD.IS", "DMSAS.IS", "DNISI.IS",
+    "DOAS.IS", "DOBUR.IS", "DOCO.IS", "DOFER.IS", "DOGUB.IS", "DOHOL.IS", "DOKTA.IS", "DSTKF.IS", "DURDO.IS", "DURKN.IS",
+    "DYOBY.IS", "DZGYO.IS", "EBEBK.IS", "ECILC.IS", "ECZYT.IS", "EDATA.IS", "EDIP.IS", "EFORC.IS", "EGEEN.IS", "EGEGY.IS",
+    "EGEPO.IS", "EGGUB.IS", "EGPRO.IS", "EGSER.IS", "EKGYO.IS", "EKIZ.IS", "EKOS.IS", "EKSUN.IS", "ELITE.IS", "EMKEL.IS",
+    "EMNIS.IS", "ENDAE.IS", "ENERY.IS", "ENJSA.IS", "ENKAI.IS", "ENSRI.IS", "ENTRA.IS", "EPLAS.IS", "ERBOS.IS", "ERCB.IS",
+    "EREGL.IS", "ERSU.IS", "ESCAR.IS", "ESCOM.IS", "ESEN.IS", "ETILR.IS", "ETYAT.IS", "EUHOL.IS", "EUKYO.IS", "EUPWR.IS",
+    "EUREN.IS", "EUYO.IS", "EYGYO.IS", "FADE.IS", "FENER.IS", "FLAP.IS", "FMIZP.IS", "FONET.IS", "FORMT.IS", "FORTE.IS",
+    "FRIGO.IS", "FROTO.IS", "FZLGY.IS", "GARFA.IS", "GEDIK.IS", "GEDZA.IS", "GENIL.IS", "GENTS.IS", "GEREL.IS", "GESAN.IS",
+    "GIPTA.IS", "GLBMD.IS", "GLCVY.IS", "GLDTR.IS", "GLRMK.IS", "GLRYH.IS", "GLYHO.IS", "GMSTR.IS", "GMTAS.IS", "GOKNR.IS",
+    "GOLTS.IS", "GOODY.IS", "GOZDE.IS", "GRNYO.IS", "GRSEL.IS", "GRTHO.IS", "GSDDE.IS", "GSDHO.IS", "GSRAY.IS", "GUBRF.IS",
+    "GUNDG.IS", "GWIND.IS", "GZNMI.IS", "HALKB.IS", "HALKS.IS", "HATEK.IS", "HATSN.IS", "HDFGS.IS", "HEDEF.IS", "HEKTS.IS",
+    "HKTM.IS", "HLGYO.IS", "HOROZ.IS", "HRKET.IS", "HTTBT.IS", "HUBVC.IS", "HUNER.IS", "HURGZ.IS", "ICBCT.IS", "ICUGS.IS",
+    "IDGYO.IS", "IEYHO.IS", "IHAAS.IS", "IHEVA.IS", "IHGZT.IS", "IHLAS.IS", "IHLGM.IS", "IHYAY.IS", "IMASM.IS", "INDES.IS",
+    "INFO.IS", "INGRM.IS", "INTEK.IS", "INTEM.IS", "INVEO.IS", "INVES.IS", "IPEKE.IS", "ISATR.IS", "ISBIR.IS", "ISBTR.IS",
+    "ISCTR.IS", "ISDMR.IS", "ISFIN.IS", "ISGLK.IS", "ISGSY.IS", "ISGYO.IS", "ISIST.IS", "ISKPL.IS", "ISMEN.IS", "ISSEN.IS",
+    "ISYAT.IS", "IZENR.IS", "IZFAS.IS", "IZINV.IS", "IZMDC.IS", "JANTS.IS", "KAPLM.IS", "KAREL.IS", "KARSN.IS", "KARTN.IS",
+    "KATMR.IS", "KAYSE.IS", "KBORU.IS", "KCAER.IS", "KENT.IS", "KERVN.IS", "KFEIN.IS", "KGYO.IS", "KIMMR.IS", "KLGYO.IS",
+    "KLKIM.IS", "KLMSN.IS", "KLNMA.IS", "KLRHO.IS", "KLSER.IS", "KLSYN.IS", "KLYPV.IS", "KMPUR.IS", "KNFRT.IS", "KOCMT.IS",
+    "KONKA.IS", "KONTR.IS", "KONYA.IS", "KOPOL.IS", "KORDS.IS", "KOTON.IS", "KOZAA.IS", "KOZAL.IS", "KRDMA.IS", "KRDMB.IS",
+    "KRGYO.IS", "KRONT.IS", "KRPLS.IS", "KRSTL.IS", "KRTEK.IS", "KRVGD.IS", "KSTUR.IS", "KTLEV.IS", "KTSKR.IS", "KUTPO.IS",
+    "KUVVA.IS", "KUYAS.IS", "KZBGY.IS", "KZGYO.IS", "LIDER.IS", "LIDFA.IS", "LILAK.IS", "LINK.IS", "LKMNH.IS", "LMKDC.IS",
+    "LOGO.IS", "LRSHO.IS", "LUKSK.IS", "LYDHO.IS", "LYDYE.IS", "MAALT.IS", "MACKO.IS", "MAGEN.IS", "MAKIM.IS", "MAKTK.IS",
+    "MANAS.IS", "MARBL.IS", "MARKA.IS", "MARTI.IS", "MAVI.IS", "MEDTR.IS", "MEGAP.IS", "MEGMT.IS", "MEKAG.IS", "MEPET.IS",
+    "MERCN.IS", "MERIT.IS", "MERKO.IS", "METRO.IS", "METUR.IS", "MGROS.IS", "MHRGY.IS", "MIATK.IS", "MMCAS.IS", "MNDRS.IS",
+    "MNDTR.IS", "MOBTL.IS", "MOGAN.IS", "MOPAS.IS", "MPARK.IS", "MRGYO.IS", "MRSHL.IS", "MSGYO.IS", "MTRKS.IS", "MTRYO.IS",
+    "MZHLD.IS", "NATEN.IS", "NETAS.IS", "NIBAS.IS", "NTGAZ.IS", "NTHOL.IS", "NUGYO.IS", "NUHCM.IS", "OBAMS.IS", "OBASE.IS",
+    "ODAS.IS", "ODINE.IS", "OFSYM.IS", "ONCSM.IS", "ONRYT.IS", "OPK30.IS", "OPT25.IS", "OPTGY.IS", "OPTLR.IS", "OPX30.IS",
+    "ORCAY.IS", "ORGE.IS", "ORMA.IS", "OSMEN.IS", "OSTIM.IS", "OTKAR.IS", "OTTO.IS", "OYAKC.IS", "OYAYO.IS", "OYLUM.IS",
+    "OYYAT.IS", "OZATD.IS", "OZGYO.IS", "OZKGY.IS", "OZRDN.IS", "OZSUB.IS", "OZYSR.IS", "PAGYO.IS", "PAMEL.IS", "PAPIL.IS",
+    "PARSN.IS", "PASEU.IS", "PATEK.IS", "PCILT.IS", "PEKGY.IS", "PENGD.IS", "PENTA.IS", "PETKM.IS", "PETUN.IS", "PGSUS.IS",
+    "PINSU.IS", "PKART.IS", "PKENT.IS", "PLTUR.IS", "PNLSN.IS", "PNSUT.IS", "POLHO.IS", "POLTK.IS", "PRDGS.IS", "PRKAB.IS",
+    "PRKME.IS", "PRZMA.IS", "PSDTC.IS", "PSGYO.IS", "QNBFK.IS", "QNBTR.IS", "QTEMZ.IS", "QUAGR.IS", "RALYH.IS", "RAYSG.IS",
+    "REEDR.IS", "RGYAS.IS", "RNPOL.IS", "RODRG.IS", "RTALB.IS", "RUBNS.IS", "RUZYE.IS", "RYGYO.IS", "RYSAS.IS", "SAFKR.IS",
+    "SAMAT.IS", "SANEL.IS", "SANFM.IS", "SANKO.IS", "SARKY.IS", "SASA.IS", "SAYAS.IS", "SDTTR.IS", "SEGMN.IS", "SEGYO.IS",
+    "SEKFK.IS", "SEKUR.IS", "SELEC.IS", "SELGD.IS", "SELVA.IS", "SERNT.IS", "SEYKM.IS", "SILVR.IS", "SISE.IS", "SKBNK.IS",
+    "SKTAS.IS", "SKYLP.IS", "SKYMD.IS", "SMART.IS", "SMRTG.IS", "SMRVA.IS", "SNGYO.IS", "SNICA.IS", "SNKRN.IS", "SODSN.IS",
+    "SOKE.IS", "SOKM.IS", "SONME.IS", "SRVGY.IS", "SUMAS.IS", "SUNTK.IS", "SURGY.IS", "SUWEN.IS", "TABGD.IS", "TARKM.IS",
+    "TATEN.IS", "TATGD.IS", "TAVHL.IS", "TBORG.IS", "TCELL.IS", "TCKRC.IS", "TDGYO.IS", "TEHOL.IS", "TEKTU.IS", "TERA.IS",
+    "TEZOL.IS", "TGSAS.IS", "TKFEN.IS", "TKNSA.IS", "TLMAN.IS", "TMPOL.IS", "TMSN.IS", "TNZTP.IS", "TOASO.IS", "TRCAS.IS",
+    "TRGYO.IS", "TRILC.IS", "TSGYO.IS", "TSKB.IS", "TSPOR.IS", "TTKOM.IS", "TTRAK.IS", "TUCLK.IS", "TUKAS.IS", "TUPRS.IS",
+    "TUREX.IS", "TURGG.IS", "TURSG.IS", "UFUK.IS", "ULAS.IS", "ULKER.IS", "ULUFA.IS", "ULUSE.IS", "ULUUN.IS", "UNLU.IS",
+    "USAK.IS", "USDTR.IS", "VAKBN.IS", "VAKFN.IS", "VAKKO.IS", "VANGD.IS", "VBTYZ.IS", "VERTU.IS", "VERUS.IS", "VESBE.IS",
+    "VESTL.IS", "VKFYO.IS", "VKGYO.IS", "VKING.IS", "VRGYO.IS", "VSNMD.IS", "X030S.IS", "X100S.IS", "XBANA.IS", "XBANK.IS",
+    "XBLSM.IS", "XELKT.IS", "XFINK.IS", "XGIDA.IS", "XGMYO.IS", "XHARZ.IS", "XHOLD.IS", "XILTM.IS", "XINSA.IS", "XKAGT.IS",
+    "XKMYA.IS", "XKOBI.IS", "XKURY.IS", "XMADN.IS", "XMANA.IS", "XMESY.IS", "XSADA.IS", "XSANK.IS", "XSANT.IS", "XSBAL.IS",
+    "XSBUR.IS", "XSDNZ.IS", "XSGRT.IS", "XSIST.IS", "XSIZM.IS", "XSKAY.IS", "XSKOC.IS", "XSKON.IS", "XSPOR.IS", "XSTKR.IS",
+    "XTAST.IS", "XTCRT.IS", "XTEKS.IS", "XTM25.IS", "XTMTU.IS", "XTRZM.IS", "XTUMY.IS", "XU030.IS", "XU050.IS", "XU100.IS",
+    "XUHIZ.IS", "XULAS.IS", "XUMAL.IS", "XUSIN.IS", "XUSRD.IS", "XUTEK.IS", "XUTUM.IS", "XYLDZ.IS", "XYORT.IS", "XYUZO.IS",
+    "YAPRK.IS", "YATAS.IS", "YAYLA.IS", "YBTAS.IS", "YEOTK.IS", "YESIL.IS", "YGGYO.IS", "YGYO.IS", "YIGIT.IS", "YKBNK.IS",
+    "YKSLN.IS", "YONGA.IS", "YUNSA.IS", "YYAPI.IS", "YYLGD.IS", "Z30EA.IS", "Z30KE.IS", "Z30KP.IS", "ZEDUR.IS", "ZELOT.IS",
+    "ZGOLD.IS", "ZOREN.IS", "ZPBDL.IS", "ZPLIB.IS", "ZPT10.IS", "ZPX30.IS", "ZRE20.IS", "ZRGYO.IS", "ZSR25.IS", "ZTM25.IS"
+]
+
+# Data download settings - Updated for 2025
+DOWNLOAD_SETTINGS = {
+    "period": "ytd",  # Year to date (from beginning of 2025)
+    "interval": "1d",  # Daily data
+    "start_date": "2025-01-01",
+    "end_date": "2025-12-31"
+}
+
+# File paths
+DATA_DIR = "data"
+LOG_DIR = "logs"
+OUTPUT_DIR = "output"
+
+# API settings (if using external APIs)
+API_SETTINGS = {
+    "timeout": 30,  # Seconds per HTTP request
+    "retry_attempts": 3,  # Attempts per request on rate limits, 5xx responses and connection errors
+    "delay_between_requests": 1,
+    "max_workers": 8,  # Concurrent download workers
+    "requests_per_second": 4,  # Shared rate limit across all workers
+    "batch_size": 50,  # Tickers per multi-symbol download request
+    "backoff_base": 1.0,  # First retry waits up to this many seconds, doubling per attempt
+    "backoff_max": 30.0,  # Upper bound of a single retry wait
+    "failed_retry_delay": 10.0  # Pause before failed tickers are retried at the end of a run
+}
+
+# Ticker metadata cache (metadata_service.py)
+METADATA_SETTINGS = {
+    "table_path": "data/metadata/ticker_info.csv",  # Name, sector, industry, market cap and currency per ticker
+    "ttl_days": 7,  # Rows older than this are fetched again
+    "max_workers": 8,  # Concurrent info requests
+    "requests_per_second": 2  # Shared rate limit of the info requests (they are slow and rate limited)
+}
+
+# Index constituents (sectors.index_membership), as bare symbols
+# Borsa Istanbul reviews the lists each quarter; this is the 2025 Q1 snapshot
+BIST30_CONSTITUENTS = [
+    "AKBNK", "ALARK", "ARCLK", "ASELS", "ASTOR", "BIMAS", "CIMSA", "DOAS", "EKGYO", "ENKAI",
+    "EREGL", "FROTO", "GARAN", "GUBRF", "HEKTS", "ISCTR", "KCHOL", "KOZAL", "KRDMD", "MGROS",
+    "PETKM", "PGSUS", "SAHOL", "SASA", "SISE", "TCELL", "THYAO", "TOASO", "TUPRS", "YKBNK"
+]
+
+INDEX_CONSTITUENTS = {
+    "XU030": BIST30_CONSTITUENTS,
+    "XU100": BIST30_CONSTITUENTS + [
+        "AEFES", "AGHOL", "AGROT", "AKFYE", "AKSA", "AKSEN", "ALFAS", "ALTNY", "ANSGR", "BERA",
+        "BRSAN", "BRYAT", "BTCIM", "CANTE", "CCOLA", "CLEBI", "CWENE", "DOHOL", "ECILC", "EGEEN",
+        "ENERY", "ENJSA", "EUPWR", "FENER", "GESAN", "GSRAY", "HALKB", "ISMEN", "IZENR", "KARSN",
+        "KCAER", "KONTR", "KONYA", "KORDS", "KOZAA", "KTLEV", "LMKDC", "MAVI", "MIATK", "MPARK",
+        "ODAS", "OTKAR", "OYAKC", "PASEU", "QUAGR", "REEDR", "SKBNK", "SMRTG", "SOKM", "TABGD",
+        "TAVHL", "TKFEN", "TSKB", "TTKOM", "TTRAK", "TURSG", "ULKER", "VAKBN", "VESBE", "VESTL",
+        "YEOTK", "ZOREN", "BJKAS", "CEMTS", "DSTKF", "GLRMK", "KLSER", "MAGEN", "SELEC", "TUKAS"
+    ]
+}
+
+# Intraday bar settings (intraday_storage.py)
+INTRADAY_SETTINGS = {
+    "data_dir": "data/intraday",  # Partitions are written to {data_dir}/{interval}/{TICKER}/{date}.parquet
+    "timezone": "Europe/Istanbul",  # Partition dates are local trading days
+    "session_minutes": 480,  # BIST equity session 10:00-18:00, used to annualize intraday statistics
+    "max_period": {"1m": "7d", "5m": "60d", "15m": "60d", "1h": "730d"}  # Longest history Yahoo serves per interval
+}
+
+# Borsa Istanbul full-day closures (national and religious holidays); half-day sessions trade
+BIST_HOLIDAYS = [
+    # 2024
+    "2024-01-01", "2024-04-10", "2024-04-11", "2024-04-12", "2024-04-23", "2024-05-01",
+    "2024-06-17", "2024-06-18", "2024-06-19", "2024-07-15", "2024-08-30", "2024-10-29",
+    # 2025
+    "2025-01-01", "2025-03-31", "2025-04-01", "2025-04-23", "2025-05-01", "2025-05-19",
+    "2025-06-06", "2025-06-09", "2025-07-15", "2025-10-29",
+    # 2026
+    "2026-01-01", "2026-03-20", "2026-04-23", "2026-05-01", "2026-05-19", "2026-05-27",
+    "2026-05-28", "2026-05-29", "2026-07-15", "2026-10-29",
+]
+
+# Data quality checks (data_validator.py)
+VALIDATION_SETTINGS = {
+    "timezone": "Europe/Istanbul",  # Bars are assigned to local trading days for the calendar check
+    "zero_volume_bars": 5,  # Consecutive zero-volume bars reported as a streak
+    "stale_price_bars": 5,  # Consecutive unchanged closes reported as stale
+    "split_threshold": 0.25,  # Bar-to-bar moves beyond this are split-like (daily price limit is 10%)
+    "price_tolerance": 1e-6  # Relative slack for the OHLC consistency checks
+}
+
+# Analysis settings
+ANALYSIS_SETTINGS = {
+    "rolling_windows": [20, 60, 120]  # Rolling correlation/covariance windows in trading days
+}
+
+# Backtest settings (backtester.py); rates are fractions of traded value
+BACKTEST_SETTINGS = {
+    "commission_rate": 0.001,  # Broker commission per trade
+    "bsmv_rate": 0.05,  # Banking and insurance transaction tax (BSMV), charged on the commission
+    "slippage_rate": 0.0,  # Extra execution cost per trade
+    "periods_per_year": 252
+}
+
+# Live dashboard settings (dash_app.py)
+DASHBOARD_SETTINGS = {
+    "host": "127.0.0.1",
+    "port": 8050,
+    "cache_size": 256,  # Memoized figures per view
+    "check_interval": 5,  # Seconds between checks for changed data files
+    "correlation_tickers": 30  # Default correlation view size (most traded first)
+}
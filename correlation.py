@@ -0,0 +1,221 @@
+"""
+BIST Trading System - Correlation Engine
+Blockwise pairwise-complete correlation of the full universe with a memory-mapped result
+"""
+
+import os
+import json
+import logging
+import warnings
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CORRELATION_NAME = "correlation_matrix"
+
+def _block_sums(x_i: np.ndarray, m_i: np.ndarray, x_j: np.ndarray, m_j: np.ndarray):
+    """Pairwise-complete counts, sums and cross products of two column blocks"""
+    n = m_i.T @ m_j
+    sum_x = x_i.T @ m_j
+    sum_y = m_i.T @ x_j
+    sum_xx = (x_i * x_i).T @ m_j
+    sum_yy = m_i.T @ (x_j * x_j)
+    sum_xy = x_i.T @ x_j
+    return n, sum_x, sum_y, sum_xx, sum_yy, sum_xy
+
+def correlation_from_sums(n, sum_x, sum_y, sum_xx, sum_yy, sum_xy,
+                          min_periods: int = 2) -> np.ndarray:
+    """
+    Pearson correlation from pairwise counts, sums and cross products
+    
+    Pairs with fewer than ``min_periods`` common observations, or without
+    variance over their common observations, are NaN.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x * sum_x / n
+        var_y = sum_yy - sum_y * sum_y / n
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[(n < max(min_periods, 2)) | ~(var_x > 0) | ~(var_y > 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+def pairwise_correlation(returns: np.ndarray, out: Optional[np.ndarray] = None,
+                         block_size: int = 256, min_periods: int = 2) -> np.ndarray:
+    """
+    Correlation matrix of a dates x tickers array with missing days
+    
+    Like ``DataFrame.corr()``, every pair uses only the days on which both
+    tickers have a value. Columns are processed in blocks, so besides the
+    result only a few dates x ``block_size`` arrays are held in memory.
+    
+    Args:
+        returns: Dates x tickers returns, NaN where missing (may be a memmap)
+        out: Tickers x tickers array to write into (e.g. a memmap); allocated if omitted
+        block_size: Number of tickers per block
+        min_periods: Minimum number of common observations per pair
+    
+    Returns:
+        The filled tickers x tickers correlation array
+    """
+    n_tickers = returns.shape[1]
+    if out is None:
+        out = np.empty((n_tickers, n_tickers), dtype=np.float32)
+    
+    # Correlation is shift invariant; centering keeps the one-pass sums accurate
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        center = np.nanmean(returns, axis=0)
+    center = np.nan_to_num(center)
+    
+    def block(start: int):
+        values = np.asarray(returns[:, start:start + block_size], dtype=np.float64)
+        mask = ~np.isnan(values)
+        return np.where(mask, values - center[start:start + block_size], 0.0), mask.astype(np.float64)
+    
+    starts = range(0, n_tickers, block_size)
+    for i in starts:
+        x_i, m_i = block(i)
+        for j in starts:
+            if j < i:
+                continue
+            x_j, m_j = (x_i, m_i) if j == i else block(j)
+            corr = correlation_from_sums(*_block_sums(x_i, m_i, x_j, m_j), min_periods=min_periods)
+            out[i:i + block_size, j:j + block_size] = corr
+            if j != i:
+                out[j:j + block_size, i:i + block_size] = corr.T
+    
+    return out
+
+def cluster_order(corr: np.ndarray) -> np.ndarray:
+    """
+    Ticker ordering that places strongly correlated tickers next to each other
+    
+    Uses spectral seriation: tickers are sorted by the Fiedler vector of
+    the graph whose edge weights are the (non-negative) correlations.
+    Missing correlations are treated as zero.
+    
+    Args:
+        corr: Tickers x tickers correlation matrix
+    
+    Returns:
+        Integer permutation of the tickers
+    """
+    affinity = np.nan_to_num(np.asarray(corr, dtype=np.float64), nan=0.0)
+    affinity = np.clip(affinity, 0.0, None)
+    np.fill_diagonal(affinity, 0.0)
+    if len(affinity) < 3:
+        return np.arange(len(affinity))
+    
+    laplacian = np.diag(affinity.sum(axis=1)) - affinity
+    _, vectors = np.linalg.eigh(laplacian)
+    return np.argsort(vectors[:, 1], kind='stable')
+
+class CorrelationMatrix:
+    """
+    Full-universe correlation matrix stored as ``{name}.npy`` plus a ``{name}.json`` index
+    
+    The values file is float32 and opened memory-mapped, so selecting a
+    subset of tickers only reads the rows it needs.
+    """
+    
+    def __init__(self, values: np.ndarray, tickers: List[str],
+                 start: Optional[str] = None, end: Optional[str] = None):
+        self.values = values
+        self.tickers = list(tickers)
+        self.start = start
+        self.end = end
+        self._ticker_pos = {ticker: i for i, ticker in enumerate(self.tickers)}
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._ticker_pos
+    
+    @classmethod
+    def compute(cls, returns: pd.DataFrame, data_dir: str = "output",
+                name: str = CORRELATION_NAME, window: Optional[int] = None,
+                end: Optional[pd.Timestamp] = None, block_size: int = 256,
+                min_periods: int = 2) -> 'CorrelationMatrix':
+        """
+        Compute and store the correlation matrix of a dates x tickers returns frame
+        
+        Args:
+            returns: Aligned returns (e.g. ``ReturnsCache.simple``)
+            data_dir: Directory for the result files
+            name: Result base file name
+            window: Only use the last ``window`` dates up to ``end`` (rolling window)
+            end: Last date of the window (defaults to the last date)
+            block_size: Number of tickers per block
+            min_periods: Minimum number of common observations per pair
+        
+        Returns:
+            CorrelationMatrix backed by the memory-mapped result file
+        """
+        if end is not None:
+            returns = returns.loc[:end]
+        if window is not None:
+            returns = returns.iloc[-window:]
+        
+        os.makedirs(data_dir, exist_ok=True)
+        values_path = os.path.join(data_dir, f"{name}.npy")
+        index_path = os.path.join(data_dir, f"{name}.json")
+        n_tickers = returns.shape[1]
+        
+        out = np.lib.format.open_memmap(values_path + '.tmp', mode='w+', dtype=np.float32,
+                                        shape=(n_tickers, n_tickers))
+        pairwise_correlation(returns.to_numpy(), out=out, block_size=block_size,
+                             min_periods=min_periods)
+        out.flush()
+        del out
+        
+        dates = returns.index
+        index = {
+            'tickers': [str(ticker) for ticker in returns.columns],
+            'start': dates[0].isoformat() if len(dates) else None,
+            'end': dates[-1].isoformat() if len(dates) else None,
+        }
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump(index, f)
+        
+        os.replace(values_path + '.tmp', values_path)
+        os.replace(index_path + '.tmp', index_path)
+        
+        logger.info(f"Correlation matrix of {n_tickers} tickers saved to {values_path}")
+        return cls.open(data_dir, name)
+    
+    @classmethod
+    def open(cls, data_dir: str = "output", name: str = CORRELATION_NAME) -> 'CorrelationMatrix':
+        """Open a stored correlation matrix memory-mapped"""
+        with open(os.path.join(data_dir, f"{name}.json")) as f:
+            index = json.load(f)
+        values = np.load(os.path.join(data_dir, f"{name}.npy"), mmap_mode='r')
+        return cls(values, index['tickers'], index['start'], index['end'])
+    
+    def subset(self, tickers: Optional[Sequence[str]] = None,
+               cluster: bool = False) -> pd.DataFrame:
+        """
+        Correlation frame for a selection of tickers
+        
+        Args:
+            tickers: Tickers to include (all when omitted); unknown tickers are ignored
+            cluster: Reorder the tickers so correlated groups form blocks
+        
+        Returns:
+            Tickers x tickers DataFrame
+        """
+        if tickers is None:
+            tickers = self.tickers
+        tickers = [ticker for ticker in tickers if ticker in self._ticker_pos]
+        positions = np.array([self._ticker_pos[ticker] for ticker in tickers], dtype=np.int64)
+        
+        values = np.asarray(self.values[np.ix_(positions, positions)], dtype=np.float64)
+        if cluster:
+            order = cluster_order(values)
+            values = values[np.ix_(order, order)]
+            tickers = [tickers[i] for i in order]
+        
+        return pd.DataFrame(values, index=tickers, columns=tickers)
@@ -0,0 +1,279 @@
+"""
+BIST Trading System - Dash Application
+Live dashboard served from an in-memory market cache with memoized views
+"""
+
+import sys
+import time
+import logging
+import threading
+from functools import lru_cache
+from typing import Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dash import Dash, Input, Output, State, dash_table, dcc, html
+from dash.exceptions import PreventUpdate
+
+from config import DASHBOARD_SETTINGS
+from correlation import cluster_order, pairwise_correlation
+from data_storage import detect_storage, load_market_data, storage_fingerprint
+from market_panel import MarketPanel, load_saved_panel
+from market_stats import compute_market_stats
+from market_universe import MarketUniverse
+from returns_cache import ReturnsCache
+
+logger = logging.getLogger(__name__)
+
+class MarketCache:
+    """
+    The data directory loaded once and shared by every request
+    
+    The storage fingerprint (file names, sizes and mtimes) is checked at
+    most every ``check_interval`` seconds; when it changes the data is
+    reloaded (from the saved market panel when that is current) and
+    ``version`` is incremented, which also retires every memoized view
+    built from the old data.
+    """
+    
+    def __init__(self, data_dir: str = "data", check_interval: float = 5.0):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self.version = 0
+        self.fingerprint = None
+        self.data_dict: Mapping[str, pd.DataFrame] = {}
+        self.returns: Optional[ReturnsCache] = None
+        self.market_stats = pd.DataFrame()
+        self._checked = 0.0
+        self._lock = threading.Lock()
+    
+    def refresh(self, force: bool = False) -> int:
+        """
+        Reload the data if the files changed since the last load
+        
+        Returns:
+            The current data version
+        """
+        now = time.monotonic()
+        if not force and now - self._checked < self.check_interval:
+            return self.version
+        
+        with self._lock:
+            self._checked = now
+            storage = detect_storage(self.data_dir)
+            fingerprint = storage_fingerprint(storage)
+            if fingerprint == self.fingerprint and not force:
+                return self.version
+            
+            try:
+                # The saved market panel is current while the files are unchanged
+                saved = load_saved_panel(storage, fingerprint)
+                if saved is not None:
+                    valid_data = MarketUniverse.from_panel(saved)
+                    panel = saved.select(fields=['Close', 'Volume'])
+                else:
+                    data_dict, _ = load_market_data(storage, exclude_prefixes=('test_',))
+                    valid_data = {ticker: data for ticker, data in data_dict.items()
+                                  if 'Close' in data.columns}
+                    panel = MarketPanel.from_data_dict(valid_data, fields=['Close', 'Volume'])
+                self.data_dict = valid_data
+                self.returns = ReturnsCache.from_panel(panel, fingerprint)
+                self.market_stats = compute_market_stats(panel)
+                self.fingerprint = fingerprint
+                self.version += 1
+                logger.info(f"Market cache version {self.version}: {len(valid_data)} tickers")
+            except Exception as e:
+                logger.error(f"Error loading market cache: {str(e)}")
+        
+        return self.version
+    
+    @property
+    def tickers(self):
+        """Tickers ordered by average volume, most traded first"""
+        if self.market_stats.empty:
+            return sorted(self.data_dict)
+        return self.market_stats.sort_values('Avg_Volume', ascending=False)['Ticker'].tolist()
+
+def _date_slice(index: pd.DatetimeIndex, start: Optional[str], end: Optional[str]) -> slice:
+    """Positional slice of a date index between two 'YYYY-MM-DD' strings"""
+    dates = index.tz_localize(None) if index.tz is not None else index
+    lo = dates.searchsorted(pd.Timestamp(start)) if start else 0
+    hi = dates.searchsorted(pd.Timestamp(end) + pd.Timedelta(days=1)) if end else len(dates)
+    return slice(lo, hi)
+
+class MarketViews:
+    """
+    Figure builders for the dashboard tabs, memoized with bounded LRU caches
+    
+    Every builder takes the cache version as its first argument, so
+    entries built from older data are never returned and age out of the
+    LRU on their own.
+    """
+    
+    def __init__(self, cache: MarketCache, cache_size: int = 256):
+        self.cache = cache
+        self.price_figure = lru_cache(maxsize=cache_size)(self._price_figure)
+        self.volume_figure = lru_cache(maxsize=cache_size)(self._volume_figure)
+        self.correlation_figure = lru_cache(maxsize=cache_size)(self._correlation_figure)
+        self.overview_table = lru_cache(maxsize=8)(self._overview_table)
+    
+    def render(self, tab: str, ticker: Optional[str], start: Optional[str],
+               end: Optional[str], tickers: Tuple[str, ...] = ()):
+        """Component for one tab of the dashboard"""
+        version = self.cache.refresh()
+        if tab == 'overview':
+            return self.overview_table(version)
+        if tab == 'correlation':
+            return dcc.Graph(figure=self.correlation_figure(version, tuple(tickers), start, end))
+        if ticker not in self.cache.data_dict:
+            return html.Div("No data for the selected ticker")
+        if tab == 'volume':
+            return dcc.Graph(figure=self.volume_figure(version, ticker, start, end))
+        return dcc.Graph(figure=self.price_figure(version, ticker, start, end))
+    
+    def ticker_options(self, known_version: Optional[int], selected: Optional[str]):
+        """
+        Ticker choices for a page that last saw data version ``known_version``
+        
+        Returns:
+            (version, tickers, selected ticker), or None if the page is
+            already showing the current version
+        """
+        version = self.cache.refresh()
+        if version == known_version:
+            return None
+        tickers = self.cache.tickers
+        if selected not in self.cache.data_dict:
+            selected = tickers[0] if tickers else None
+        return version, tickers, selected
+    
+    def _ticker_data(self, ticker: str, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+        data = self.cache.data_dict[ticker]
+        return data.iloc[_date_slice(data.index, start, end)]
+    
+    def _price_figure(self, version: int, ticker: str, start: Optional[str],
+                      end: Optional[str]) -> go.Figure:
+        data = self._ticker_data(ticker, start, end)
+        fig = go.Figure(go.Scattergl(x=data.index, y=data['Close'], mode='lines',
+                                     name=f"{ticker} Price", line=dict(color='blue')))
+        fig.update_layout(title=f"{ticker} - Price", xaxis_title="Date",
+                          yaxis_title="Price (TL)", height=550)
+        return fig
+    
+    def _volume_figure(self, version: int, ticker: str, start: Optional[str],
+                       end: Optional[str]) -> go.Figure:
+        data = self._ticker_data(ticker, start, end)
+        fig = go.Figure(go.Bar(x=data.index, y=data['Volume'], name=f"{ticker} Volume",
+                               marker_color='lightblue'))
+        fig.update_layout(title=f"{ticker} - Trading Volume", xaxis_title="Date",
+                          yaxis_title="Volume", height=550)
+        return fig
+    
+    def _correlation_figure(self, version: int, tickers: Tuple[str, ...],
+                            start: Optional[str], end: Optional[str]) -> go.Figure:
+        returns = self.cache.returns.simple
+        tickers = [ticker for ticker in tickers if ticker in self.cache.returns]
+        if not tickers:
+            tickers = self.cache.tickers[:DASHBOARD_SETTINGS["correlation_tickers"]]
+        window = returns.iloc[_date_slice(returns.index, start, end)][tickers]
+        
+        corr = pairwise_correlation(window.to_numpy(), out=np.empty((len(tickers),) * 2))
+        order = cluster_order(corr)
+        corr = corr[np.ix_(order, order)]
+        labels = [tickers[i] for i in order]
+        
+        fig = go.Figure(go.Heatmap(z=corr, x=labels, y=labels, zmin=-1, zmax=1,
+                                   colorscale='RdBu_r'))
+        fig.update_layout(title="Returns Correlation Matrix (Clustered)", height=750)
+        return fig
+    
+    def _overview_table(self, version: int):
+        stats = self.cache.market_stats.round(2)
+        return dash_table.DataTable(
+            data=stats.to_dict('records'),
+            columns=[{'name': col, 'id': col} for col in stats.columns],
+            sort_action='native', filter_action='native', page_size=25,
+        )
+
+def create_app(data_dir: str = "data", cache_size: int = DASHBOARD_SETTINGS["cache_size"],
+               check_interval: float = DASHBOARD_SETTINGS["check_interval"]) -> Dash:
+    """
+    Build the Dash application
+    
+    Args:
+        data_dir: Directory holding the ticker data files
+        cache_size: Maximum number of memoized figures per view
+        check_interval: Seconds between checks for changed data files
+    
+    Returns:
+        Dash app; the shared cache and views are available as
+        ``app.market_cache`` and ``app.market_views``
+    """
+    cache = MarketCache(data_dir, check_interval)
+    cache.refresh(force=True)
+    views = MarketViews(cache, cache_size)
+    
+    app = Dash(__name__, title="BIST Trading System")
+    app.layout = html.Div([
+        html.H2("BIST Trading System - Market Dashboard"),
+        html.Div([
+            dcc.Dropdown(id='ticker', options=[], clearable=False, style={'width': '220px'}),
+            dcc.DatePickerRange(id='dates', display_format='YYYY-MM-DD'),
+        ], style={'display': 'flex', 'gap': '12px', 'alignItems': 'center'}),
+        dcc.Dropdown(id='correlation-tickers', options=[], multi=True,
+                     placeholder="Correlation tickers (defaults to the most traded)"),
+        dcc.Tabs(id='tab', value='price', children=[
+            dcc.Tab(label='Price', value='price'),
+            dcc.Tab(label='Volume', value='volume'),
+            dcc.Tab(label='Correlation', value='correlation'),
+            dcc.Tab(label='Market Overview', value='overview'),
+        ]),
+        html.Div(id='view'),
+        # Ticker lists are filled on page load and whenever the data version changes
+        dcc.Store(id='data-version'),
+        dcc.Interval(id='data-check', interval=max(check_interval, 1) * 1000),
+    ], style={'margin': '16px'})
+    
+    @app.callback(
+        Output('ticker', 'options'),
+        Output('ticker', 'value'),
+        Output('correlation-tickers', 'options'),
+        Output('data-version', 'data'),
+        Input('data-check', 'n_intervals'),
+        State('data-version', 'data'),
+        State('ticker', 'value'),
+    )
+    def update_ticker_options(n_intervals, known_version, selected):
+        choices = views.ticker_options(known_version, selected)
+        if choices is None:
+            raise PreventUpdate
+        version, tickers, selected = choices
+        return tickers, selected, tickers, version
+    
+    @app.callback(
+        Output('view', 'children'),
+        Input('tab', 'value'),
+        Input('ticker', 'value'),
+        Input('dates', 'start_date'),
+        Input('dates', 'end_date'),
+        Input('correlation-tickers', 'value'),
+    )
+    def update_view(tab, ticker, start, end, correlation_tickers):
+        return views.render(tab, ticker, start, end, tuple(correlation_tickers or ()))
+    
+    app.market_cache = cache
+    app.market_views = views
+    return app
+
+def main():
+    """Serve the dashboard: python dash_app.py [data_dir]"""
+    logging.basicConfig(level=logging.INFO)
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    app = create_app(data_dir)
+    app.run(host=DASHBOARD_SETTINGS["host"], port=DASHBOARD_SETTINGS["port"], debug=False)
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,207 +1,839 @@
-"""
-BIST Trading System - Data Downloader Module
-Downloads historical data for BIST tickers using yfinance
-"""
-
-import yfinance as yf
-import pandas as pd
-import os
-import logging
-from datetime import datetime
-from typing import List, Dict, Optional
-import time
-
-# Setup logging
-def setup_logging():
-    """Setup logging with proper error handling"""
-    try:
-        os.makedirs('logs', exist_ok=True)
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('logs/download.log'),
-                logging.StreamHandler()
-            ]
-        )
-    except Exception:
-        # Fallback to console-only logging if file logging fails
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[logging.StreamHandler()]
-        )
-
-setup_logging()
-logger = logging.getLogger(__name__)
-
-class BISTDataDownloader:
-    """Downloads and manages BIST ticker data"""
-    
-    def __init__(self, data_dir: str = "data"):
-        self.data_dir = data_dir
-        self._ensure_directories()
-    
-    def _ensure_directories(self):
-        """Create necessary directories if they don't exist"""
-        os.makedirs(self.data_dir, exist_ok=True)
-        os.makedirs("logs", exist_ok=True)
-        os.makedirs("output", exist_ok=True)
-    
-    def download_ticker_data(self, ticker: str, period: str = "1y", 
-                           interval: str = "1d") -> Optional[pd.DataFrame]:
-        """
-        Download data for a single ticker
-        
-        Args:
-            ticker: Ticker symbol (e.g., 'THYAO.IS')
-            period: Data period (e.g., '1y', '6mo', '1mo')
-            interval: Data interval (e.g., '1d', '1h', '5m')
-        
-        Returns:
-            DataFrame with ticker data or None if failed
-        """
-        try:
-            logger.info(f"Downloading data for {ticker}")
-            
-            # Create ticker object
-            tick = yf.Ticker(ticker)
-            
-            # Download data
-            data = tick.history(period=period, interval=interval)
-            
-            if data.empty:
-                logger.warning(f"No data received for {ticker}")
-                return None
-            
-            # Add ticker symbol column
-            data['Ticker'] = ticker
-            
-            # Save to file
-            filename = f"{ticker.replace('.IS', '')}_{period}_{interval}.csv"
-            filepath = os.path.join(self.data_dir, filename)
-            data.to_csv(filepath)
-            
-            logger.info(f"Successfully downloaded {len(data)} records for {ticker}")
-            logger.info(f"Data saved to {filepath}")
-            
-            return data
-            
-        except Exception as e:
-            logger.error(f"Error downloading data for {ticker}: {str(e)}")
-            return None
-    
-    def download_multiple_tickers(self, tickers: List[str], 
-                                period: str = "1y", 
-                                interval: str = "1d",
-                                delay: float = 1.0) -> Dict[str, pd.DataFrame]:
-        """
-        Download data for multiple tickers with delay between requests
-        
-        Args:
-            tickers: List of ticker symbols
-            period: Data period
-            interval: Data interval
-            delay: Delay between requests in seconds
-        
-        Returns:
-            Dictionary mapping ticker symbols to their data
-        """
-        results = {}
-        
-        for i, ticker in enumerate(tickers):
-            logger.info(f"Processing ticker {i+1}/{len(tickers)}: {ticker}")
-            
-            data = self.download_ticker_data(ticker, period, interval)
-            if data is not None:
-                results[ticker] = data
-            
-            # Add delay between requests to avoid rate limiting
-            if i < len(tickers) - 1:  # Don't delay after the last request
-                time.sleep(delay)
-        
-        return results
-    
-    def get_ticker_info(self, ticker: str) -> Optional[Dict]:
-        """Get basic information about a ticker"""
-        try:
-            tick = yf.Ticker(ticker)
-            info = tick.info
-            
-            # Extract relevant information
-            ticker_info = {
-                'symbol': ticker,
-                'name': info.get('longName', 'N/A'),
-                'sector': info.get('sector', 'N/A'),
-                'industry': info.get('industry', 'N/A'),
-                'market_cap': info.get('marketCap', 'N/A'),
-                'currency': info.get('currency', 'N/A')
-            }
-            
-            return ticker_info
-            
-        except Exception as e:
-            logger.error(f"Error getting info for {ticker}: {str(e)}")
-            return None
-    
-    def validate_data(self, data: pd.DataFrame, ticker: str) -> bool:
-        """
-        Validate downloaded data quality
-        
-        Args:
-            data: Downloaded data DataFrame
-            ticker: Ticker symbol for logging
-        
-        Returns:
-            True if data is valid, False otherwise
-        """
-        if data.empty:
-            logger.warning(f"Data for {ticker} is empty")
-            return False
-        
-        # Check for required columns
-        required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-        missing_columns = [col for col in required_columns if col not in data.columns]
-        
-        if missing_columns:
-            logger.warning(f"Missing columns for {ticker}: {missing_columns}")
-            return False
-        
-        # Check for reasonable data ranges
-        if (data['Close'] <= 0).any():
-            logger.warning(f"Invalid close prices found for {ticker}")
-            return False
-        
-        # Check for missing values
-        missing_count = data.isnull().sum().sum()
-        if missing_count > 0:
-            logger.warning(f"Found {missing_count} missing values for {ticker}")
-        
-        logger.info(f"Data validation passed for {ticker}")
-        return True
-    
-    def generate_summary_report(self, results: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        """Generate a summary report of downloaded data"""
-        summary_data = []
-        
-        for ticker, data in results.items():
-            if data is not None and not data.empty:
-                summary_data.append({
-                    'Ticker': ticker,
-                    'Records': len(data),
-                    'Start_Date': data.index.min().strftime('%Y-%m-%d'),
-                    'End_Date': data.index.max().strftime('%Y-%m-%d'),
-                    'Min_Close': data['Close'].min(),
-                    'Max_Close': data['Close'].max(),
-                    'Avg_Volume': data['Volume'].mean(),
-                    'Data_Quality': 'Valid' if self.validate_data(data, ticker) else 'Issues'
-                })
-        
-        summary_df = pd.DataFrame(summary_data)
-        
-        # Save summary report
-        summary_file = os.path.join("output", f"download_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-        summary_df.to_csv(summary_file, index=False)
-        logger.info(f"Summary report saved to {summary_file}")
-        
-        return summary_df
+"""
+BIST Trading System - Data Downloader Module
+Downloads historical data for BIST tickers using yfinance
+"""
+
+import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError, YFRateLimitError, YFTzMissingError
+import pandas as pd
+import os
+import logging
+from datetime import datetime
+from typing import Callable, List, Dict, Optional, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import random
+import time
+
+from config import API_SETTINGS, INTRADAY_SETTINGS
+from adjusted_store import AdjustedPriceStore
+from data_storage import DataStorage, get_storage, load_market_data, storage_fingerprint
+from data_validator import summarize_issues, validate_universe
+from download_manifest import DownloadManifest
+from intraday_storage import PartitionedStorage
+from market_panel import ACTION_FIELDS, PANEL_FIELDS, MarketPanel
+from indicators import invalidate_indicator_cache
+from returns_cache import invalidate_returns_cache
+
+# Setup logging
+def setup_logging():
+    """Setup logging with proper error handling"""
+    try:
+        os.makedirs('logs', exist_ok=True)
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler('logs/download.log'),
+                logging.StreamHandler()
+            ]
+        )
+    except Exception:
+        # Fallback to console-only logging if file logging fails
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[logging.StreamHandler()]
+        )
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Column layout of yf.Ticker.history(), which defines the per-ticker CSV schema
+HISTORY_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """
+    HTTP session shared by every Yahoo Finance request
+    
+    Reusing one session keeps connections (and the Yahoo cookie/crumb)
+    pooled across tickers and worker threads. A curl_cffi session is used
+    when available, as recent yfinance versions require it.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            try:
+                from curl_cffi import requests as curl_requests
+                _session = curl_requests.Session(impersonate="chrome")
+            except ImportError:
+                import requests
+                _session = requests.Session()
+        return _session
+
+def yfinance_history(ticker: str, period: str, interval: str,
+                     start: Optional[str] = None) -> pd.DataFrame:
+    """Fetch price history for a single ticker from Yahoo Finance"""
+    dates = {'start': start} if start is not None else {'period': period}
+    try:
+        return yf.Ticker(ticker, session=get_session()).history(
+            interval=interval, timeout=API_SETTINGS["timeout"], raise_errors=True, **dates)
+    except (YFPricesMissingError, YFTzMissingError):
+        # Delisted or unknown symbols: nothing to fetch, not worth retrying
+        return pd.DataFrame()
+
+def yfinance_raw_history(ticker: str, period: str, interval: str,
+                         start: Optional[str] = None) -> pd.DataFrame:
+    """Fetch price history without dividend adjustment, with the split and dividend events"""
+    dates = {'start': start} if start is not None else {'period': period}
+    try:
+        return yf.Ticker(ticker, session=get_session()).history(
+            interval=interval, auto_adjust=False, actions=True,
+            timeout=API_SETTINGS["timeout"], raise_errors=True, **dates)
+    except (YFPricesMissingError, YFTzMissingError):
+        return pd.DataFrame()
+
+def yfinance_download(tickers: List[str], period: str, interval: str) -> pd.DataFrame:
+    """Fetch price history for several tickers in one Yahoo Finance request"""
+    return yf.download(tickers, period=period, interval=interval,
+                       group_by='ticker', auto_adjust=True, actions=True,
+                       ignore_tz=False, threads=False, progress=False,
+                       timeout=API_SETTINGS["timeout"], session=get_session())
+
+def yfinance_info(ticker: str) -> Dict:
+    """Fetch a ticker's name, sector, industry, market cap and currency from Yahoo Finance"""
+    info = yf.Ticker(ticker, session=get_session()).info or {}
+    return {
+        'symbol': ticker,
+        'name': info.get('longName', 'N/A'),
+        'sector': info.get('sector', 'N/A'),
+        'industry': info.get('industry', 'N/A'),
+        'market_cap': info.get('marketCap', 'N/A'),
+        'currency': info.get('currency', 'N/A')
+    }
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed request is worth retrying (rate limits, 5xx, timeouts, dropped connections)"""
+    if isinstance(error, YFRateLimitError):
+        return True
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is not None:
+        return status in RETRY_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # requests and curl_cffi define their own Timeout/ConnectionError hierarchies
+    return any(cls.__name__ in ('Timeout', 'ConnectionError') for cls in type(error).__mro__)
+
+def backoff_delay(attempt: int, base: float = API_SETTINGS["backoff_base"],
+                  cap: float = API_SETTINGS["backoff_max"]) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def call_with_retry(func: Callable, *args, attempts: int = API_SETTINGS["retry_attempts"],
+                    base: float = API_SETTINGS["backoff_base"],
+                    cap: float = API_SETTINGS["backoff_max"],
+                    limiter: Optional['TokenBucket'] = None, **kwargs):
+    """
+    Call ``func`` and retry transient failures with exponential backoff
+    
+    Args:
+        func: Request function
+        *args, **kwargs: Arguments passed to ``func``
+        attempts: Maximum number of calls (at least one is made)
+        base: Upper bound of the first backoff in seconds (doubles per retry)
+        cap: Upper bound of any single backoff
+        limiter: Shared rate limiter; every attempt, retries included, takes a token
+    
+    Returns:
+        The result of the first successful call; the last error is raised
+        when every attempt failed or the error is not retryable
+    """
+    attempts = max(attempts, 1)
+    for attempt in range(attempts):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            wait = backoff_delay(attempt, base, cap)
+            logger.warning(f"Request failed ({str(e)}), retrying in {wait:.1f}s "
+                           f"(attempt {attempt + 2}/{attempts})")
+            time.sleep(wait)
+
+def chunk_tickers(tickers: List[str], chunk_size: int) -> List[List[str]]:
+    """Split a ticker list into consecutive chunks of at most ``chunk_size``"""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    return [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+def unpack_batch(batch: pd.DataFrame, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Split a wide multi-ticker download into per-ticker history frames
+    
+    Args:
+        batch: Result of a grouped multi-symbol download, with (ticker, field)
+            or (field, ticker) column levels
+        tickers: Tickers requested in the batch
+    
+    Returns:
+        Dictionary mapping each ticker that returned data to a frame with the
+        same columns and dtypes as ``yf.Ticker.history``
+    """
+    if batch is None or batch.empty:
+        return {}
+    
+    if not isinstance(batch.columns, pd.MultiIndex):
+        # A single-symbol download comes back with flat field columns
+        batch = pd.concat({tickers[0]: batch}, axis=1)
+    elif not set(batch.columns.get_level_values(0)) & set(tickers):
+        batch = batch.swaplevel(axis=1)
+    
+    available = set(batch.columns.get_level_values(0))
+    frames = {}
+    
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        
+        data = batch[ticker]
+        price_columns = [col for col in PRICE_COLUMNS if col in data.columns]
+        
+        # The wide frame is the union of all dates; drop rows this symbol did not trade
+        data = data.dropna(how='all', subset=price_columns)
+        if data.empty:
+            continue
+        
+        for col in ('Dividends', 'Stock Splits'):
+            data[col] = data[col].fillna(0.0) if col in data.columns else 0.0
+        data = data[[col for col in HISTORY_COLUMNS if col in data.columns]]
+        if 'Volume' in data.columns:
+            data['Volume'] = data['Volume'].fillna(0).astype('int64')
+        
+        data.columns.name = None
+        frames[ticker] = data
+    
+    return frames
+
+def has_corporate_action(data: pd.DataFrame) -> bool:
+    """Whether any bar carries a dividend or split (yfinance adds these columns with actions=True)"""
+    return any(column in data.columns and bool((data[column].fillna(0) > 0).any())
+               for column in ('Dividends', 'Stock Splits'))
+
+def _align_timezone(index: pd.DatetimeIndex, reference: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Convert ``index`` to the timezone (or naivety) of ``reference``"""
+    if reference.tz is None:
+        return index.tz_localize(None) if index.tz is not None else index
+    if index.tz is None:
+        return index.tz_localize(reference.tz)
+    return index.tz_convert(reference.tz)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter shared by download workers
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each request consumes one token and blocks until one is available.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until ``tokens`` tokens are available, then consume them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                
+                wait = (tokens - self._tokens) / self.rate
+            
+            time.sleep(wait)
+
+class BISTDataDownloader:
+    """Downloads and manages BIST ticker data"""
+    
+    def __init__(self, data_dir: str = "data",
+                 fetcher: Optional[Callable[[str, str, str], pd.DataFrame]] = None,
+                 batch_fetcher: Optional[Callable[[List[str], str, str], pd.DataFrame]] = None,
+                 storage: Union[str, DataStorage] = "csv",
+                 retry_attempts: int = API_SETTINGS["retry_attempts"],
+                 backoff_base: float = API_SETTINGS["backoff_base"],
+                 backoff_max: float = API_SETTINGS["backoff_max"],
+                 manifest: Optional[DownloadManifest] = None,
+                 raw_fetcher: Optional[Callable[[str, str, str], pd.DataFrame]] = None,
+                 metadata=None):
+        """
+        Args:
+            data_dir: Directory where ticker CSV files are written
+            fetcher: Callable ``(ticker, period, interval) -> DataFrame`` used to
+                fetch price history (defaults to Yahoo Finance); incremental
+                refreshes also pass a ``start`` date keyword
+            batch_fetcher: Callable ``(tickers, period, interval) -> DataFrame``
+                returning a grouped multi-symbol download (defaults to Yahoo Finance)
+            storage: Storage backend name ('csv', 'parquet', 'feather') or instance
+            retry_attempts: Attempts per request on transient failures
+            backoff_base: Upper bound of the first retry wait in seconds
+            backoff_max: Upper bound of any retry wait in seconds
+            manifest: Job manifest recording every ticker's download status
+            raw_fetcher: Like ``fetcher`` but returning split-adjusted prices
+                without dividend adjustment plus the 'Dividends' and 'Stock
+                Splits' columns, used for the adjusted price store
+            metadata: MetadataService answering ``get_ticker_info`` (defaults
+                to the shared cached service)
+        """
+        self.data_dir = data_dir
+        self.storage = get_storage(storage, data_dir) if isinstance(storage, str) else storage
+        self.fetcher = fetcher or yfinance_history
+        self.batch_fetcher = batch_fetcher or yfinance_download
+        self.raw_fetcher = raw_fetcher or yfinance_raw_history
+        self.retry_attempts = retry_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.manifest = manifest
+        self._metadata = metadata
+        # Rate limiter of the running concurrent download, applied to every request attempt
+        self._limiter = None
+        # Tickers whose requests kept failing transiently, retried at the end of a run
+        self.failed_tickers = set()
+        self._failed_lock = threading.Lock()
+        self._ensure_directories()
+    
+    def _ensure_directories(self):
+        """Create necessary directories if they don't exist"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs("logs", exist_ok=True)
+        os.makedirs("output", exist_ok=True)
+    
+    def _fetch(self, fetcher: Callable, *args, **kwargs):
+        """Call a fetcher with retries and backoff on transient failures, under the active rate limit"""
+        return call_with_retry(fetcher, *args, attempts=self.retry_attempts,
+                               base=self.backoff_base, cap=self.backoff_max,
+                               limiter=self._limiter, **kwargs)
+    
+    def _record_failure(self, ticker: str, error: Exception) -> None:
+        """Record a failed ticker and queue it for the end-of-run retry when the failure was transient"""
+        if self.manifest is not None:
+            self.manifest.record_failure(ticker, str(error))
+        if is_retryable(error):
+            with self._failed_lock:
+                self.failed_tickers.add(ticker)
+    
+    def download_ticker_data(self, ticker: str, period: str = "1y", 
+                           interval: str = "1d") -> Optional[pd.DataFrame]:
+        """
+        Download data for a single ticker
+        
+        Args:
+            ticker: Ticker symbol (e.g., 'THYAO.IS')
+            period: Data period (e.g., '1y', '6mo', '1mo')
+            interval: Data interval (e.g., '1d', '1h', '5m')
+        
+        Returns:
+            DataFrame with ticker data or None if failed
+        """
+        try:
+            logger.info(f"Downloading data for {ticker}")
+            if self.manifest is not None:
+                self.manifest.start(ticker)
+            
+            # Download data
+            data = self._fetch(self.fetcher, ticker, period, interval)
+            
+            if data is None or data.empty:
+                logger.warning(f"No data received for {ticker}")
+                if self.manifest is not None:
+                    self.manifest.record_empty(ticker)
+                return None
+            
+            data = self._save_ticker_data(ticker, data, period, interval)
+            
+            logger.info(f"Successfully downloaded {len(data)} records for {ticker}")
+            
+            return data
+            
+        except Exception as e:
+            logger.error(f"Error downloading data for {ticker}: {str(e)}")
+            self._record_failure(ticker, e)
+            return None
+    
+    def _save_ticker_data(self, ticker: str, data: pd.DataFrame,
+                          period: str, interval: str) -> pd.DataFrame:
+        """Add the ticker column and write the data through the storage backend"""
+        # Add ticker symbol column
+        data['Ticker'] = ticker
+        
+        # Save to file
+        filepath = self.storage.save(ticker, data, period, interval)
+        invalidate_returns_cache(self.data_dir)
+        invalidate_indicator_cache(self.data_dir)
+        if self.manifest is not None:
+            self.manifest.record_success(ticker, filepath, data)
+        
+        logger.info(f"Data saved to {filepath}")
+        
+        return data
+    
+    def refresh_ticker_data(self, ticker: str, period: str = "1y",
+                            interval: str = "1d") -> Optional[pd.DataFrame]:
+        """
+        Incrementally update a ticker's stored data with the missing bars
+        
+        Only bars from the last stored date onwards are fetched. The last
+        stored bar is fetched again because it may have been written while
+        the session was still open. Overlapping rows are replaced and the
+        new rows are appended; CSV files only have their tail rewritten.
+        Tickers without a stored file, and tickers with a split or dividend
+        in the new bars (which re-adjusts the stored history), are
+        downloaded in full.
+        
+        Args:
+            ticker: Ticker symbol (e.g., 'THYAO.IS')
+            period: Data period used in the stored file name
+            interval: Data interval
+        
+        Returns:
+            DataFrame with the merged ticker data or None if failed
+        """
+        filepath = self.storage.path_for(ticker, period, interval)
+        if not os.path.exists(filepath):
+            return self.download_ticker_data(ticker, period, interval)
+        
+        try:
+            existing = self.storage.load(filepath)
+            if existing.empty or not existing.index.is_monotonic_increasing:
+                return self.download_ticker_data(ticker, period, interval)
+            
+            last_date = existing.index.max()
+            logger.info(f"Refreshing data for {ticker} from {last_date.strftime('%Y-%m-%d')}")
+            if self.manifest is not None:
+                self.manifest.start(ticker)
+            
+            new_data = self._fetch(self.fetcher, ticker, period, interval,
+                                   start=last_date.strftime('%Y-%m-%d'))
+            if new_data is None or new_data.empty:
+                logger.info(f"No new data for {ticker}")
+                if self.manifest is not None:
+                    self.manifest.record_success(ticker, filepath, existing)
+                return existing
+            
+            new_data = new_data.copy()
+            new_data.index = _align_timezone(new_data.index, existing.index)
+            new_data = new_data[new_data.index >= last_date.normalize()]
+            new_data = new_data[~new_data.index.duplicated(keep='last')].sort_index()
+            
+            # Yahoo adjusts all earlier bars for a new split or dividend, so the stored
+            # history no longer lines up with the new bars and is downloaded again
+            if has_corporate_action(new_data[new_data.index > last_date]):
+                logger.info(f"Corporate action for {ticker} after "
+                            f"{last_date.strftime('%Y-%m-%d')}, downloading full history")
+                return self.download_ticker_data(ticker, period, interval)
+            
+            new_data['Ticker'] = ticker
+            new_data = new_data.reindex(columns=existing.columns)
+            
+            # Everything from the first fetched bar onwards is replaced
+            replaced = int((existing.index >= new_data.index.min()).sum())
+            self.storage.replace_tail(filepath, existing, new_data, replaced)
+            invalidate_returns_cache(self.data_dir)
+            invalidate_indicator_cache(self.data_dir)
+            
+            merged = pd.concat([existing.iloc[:len(existing) - replaced], new_data])
+            if self.manifest is not None:
+                self.manifest.record_success(ticker, filepath, merged)
+            
+            logger.info(f"Appended {len(new_data) - replaced} new records for {ticker} "
+                        f"(replaced {replaced})")
+            
+            return merged
+            
+        except Exception as e:
+            logger.error(f"Error refreshing data for {ticker}: {str(e)}")
+            self._record_failure(ticker, e)
+            return None
+    
+    def update_adjusted_store(self, ticker: str, store: AdjustedPriceStore,
+                              period: str = "max") -> Optional[pd.DataFrame]:
+        """
+        Bring a ticker's raw bars and corporate actions in the adjusted store up to date
+        
+        Only bars from the last stored raw date onwards are fetched. A split
+        inside the fetched window is undone in the new bars and recorded, so
+        just that ticker's adjustment factors are recomputed; the stored
+        history is never downloaded again.
+        
+        Args:
+            ticker: Ticker symbol (e.g., 'THYAO.IS')
+            store: Adjusted price store to update
+            period: Period fetched for tickers without raw data
+        
+        Returns:
+            DataFrame with the merged raw bars or None if failed
+        """
+        try:
+            existing = store.raw(ticker)
+            if existing.empty:
+                logger.info(f"Downloading raw history for {ticker} ({period})")
+                data = self._fetch(self.raw_fetcher, ticker, period, "1d")
+            else:
+                last_date = existing.index.max().strftime('%Y-%m-%d')
+                logger.info(f"Refreshing raw history for {ticker} from {last_date}")
+                data = self._fetch(self.raw_fetcher, ticker, period, "1d", start=last_date)
+            
+            if data is None or data.empty:
+                logger.warning(f"No raw data received for {ticker}")
+                return None if existing.empty else existing
+            
+            return store.write_raw(ticker, data, adjusted="split")
+        
+        except Exception as e:
+            # The daily files are untouched, so the daily manifest and retry queue are too
+            logger.error(f"Error updating adjusted store for {ticker}: {str(e)}")
+            return None
+    
+    def download_intraday_data(self, ticker: str, interval: str = "5m",
+                               storage: Optional[PartitionedStorage] = None) -> Optional[pd.DataFrame]:
+        """
+        Download intraday bars and append them to the partitioned intraday store
+        
+        The first download fetches the longest period Yahoo serves for the
+        interval; later ones fetch from the last stored trading day, which is
+        merged again because it may have been written mid-session.
+        
+        Args:
+            ticker: Ticker symbol (e.g., 'THYAO.IS')
+            interval: Bar interval ('1m', '5m', '15m', '1h')
+            storage: Intraday store (defaults to INTRADAY_SETTINGS['data_dir'])
+        
+        Returns:
+            DataFrame with the fetched bars or None if failed
+        """
+        storage = storage or PartitionedStorage(interval=interval)
+        try:
+            period = INTRADAY_SETTINGS["max_period"].get(interval, "60d")
+            last_date = storage.last_date(ticker)
+            logger.info(f"Downloading {interval} bars for {ticker}"
+                        + (f" from {last_date}" if last_date else f" ({period})"))
+            
+            if last_date:
+                data = self._fetch(self.fetcher, ticker, period, interval, start=last_date)
+            else:
+                data = self._fetch(self.fetcher, ticker, period, interval)
+            
+            if data is None or data.empty:
+                logger.warning(f"No {interval} data received for {ticker}")
+                return None
+            
+            written = storage.append(ticker, data)
+            logger.info(f"Stored {len(data)} {interval} bars for {ticker} in {len(written)} partitions")
+            
+            return data
+        
+        except Exception as e:
+            # The manifest and retry queue track the daily files, which this does not touch
+            logger.error(f"Error downloading {interval} data for {ticker}: {str(e)}")
+            return None
+    
+    def download_multiple_tickers(self, tickers: List[str], 
+                                period: str = "1y", 
+                                interval: str = "1d",
+                                delay: float = 1.0,
+                                max_workers: int = 1,
+                                requests_per_second: Optional[float] = None,
+                                incremental: bool = False,
+                                retry_failed: bool = True,
+                                failed_retry_delay: float = API_SETTINGS["failed_retry_delay"]) -> Dict[str, pd.DataFrame]:
+        """
+        Download data for multiple tickers with delay between requests
+        
+        With ``max_workers > 1`` the tickers are fetched by a bounded thread
+        pool sharing a token-bucket rate limiter instead of sleeping between
+        requests.
+        
+        With ``incremental=True`` tickers that already have a stored file are
+        only topped up with missing bars (see ``refresh_ticker_data``).
+        
+        Every request is retried with backoff on transient failures. Tickers
+        that still failed that way are queued and retried once more, one at
+        a time, after the rest of the run.
+        
+        Args:
+            tickers: List of ticker symbols
+            period: Data period
+            interval: Data interval
+            delay: Delay between requests in seconds
+            max_workers: Number of concurrent download workers
+            requests_per_second: Shared request rate limit for concurrent mode
+                (defaults to ``1 / delay``)
+            incremental: Only fetch bars missing from existing files
+            retry_failed: Retry the failed-ticker queue at the end of the run
+            failed_retry_delay: Seconds to wait before retrying the queue
+        
+        Returns:
+            Dictionary mapping ticker symbols to their data
+        """
+        download = self.refresh_ticker_data if incremental else self.download_ticker_data
+        self.failed_tickers = set()
+        
+        if max_workers > 1:
+            if requests_per_second is None:
+                requests_per_second = 1.0 / delay if delay > 0 else float(max_workers)
+            results = self._download_concurrent(tickers, period, interval,
+                                                max_workers, requests_per_second, download)
+        else:
+            results = self._download_sequential(tickers, period, interval, delay, download)
+        
+        queued = [ticker for ticker in tickers if ticker in self.failed_tickers]
+        if retry_failed and queued:
+            logger.info(f"Retrying {len(queued)} failed tickers in {failed_retry_delay:.0f}s")
+            time.sleep(failed_retry_delay)
+            self.failed_tickers = set()
+            retried = self._download_sequential(queued, period, interval, delay, download)
+            results.update(retried)
+            logger.info(f"Recovered {len(retried)}/{len(queued)} failed tickers")
+            results = {ticker: results[ticker] for ticker in tickers if ticker in results}
+        
+        return results
+    
+    def _download_sequential(self, tickers: List[str], period: str, interval: str, delay: float,
+                             download: Callable[[str, str, str], Optional[pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+        """Download tickers one at a time with a fixed delay between requests"""
+        results = {}
+        
+        for i, ticker in enumerate(tickers):
+            logger.info(f"Processing ticker {i+1}/{len(tickers)}: {ticker}")
+            
+            data = download(ticker, period, interval)
+            if data is not None:
+                results[ticker] = data
+            
+            # Add delay between requests to avoid rate limiting
+            if i < len(tickers) - 1:  # Don't delay after the last request
+                time.sleep(delay)
+        
+        return results
+    
+    def _download_concurrent(self, tickers: List[str], period: str, interval: str,
+                             max_workers: int, requests_per_second: float,
+                             download: Callable[[str, str, str], Optional[pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+        """Download tickers on a thread pool throttled by a shared token bucket"""
+        downloaded = {}
+        
+        logger.info(f"Downloading {len(tickers)} tickers with {max_workers} workers "
+                    f"at {requests_per_second:.2f} requests/second")
+        
+        # Every request attempt of the workers (backoff retries included) takes a token
+        self._limiter = TokenBucket(requests_per_second)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(download, ticker, period, interval): ticker
+                           for ticker in tickers}
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    ticker = futures[future]
+                    data = future.result()
+                    if data is not None:
+                        downloaded[ticker] = data
+                    logger.info(f"Processed ticker {completed}/{len(tickers)}: {ticker}")
+        finally:
+            self._limiter = None
+        
+        # Preserve the input ordering of the sequential path
+        return {ticker: downloaded[ticker] for ticker in tickers if ticker in downloaded}
+    
+    def download_batched(self, tickers: List[str],
+                         period: str = "1y",
+                         interval: str = "1d",
+                         chunk_size: int = 50,
+                         delay: float = 1.0) -> Dict[str, pd.DataFrame]:
+        """
+        Download data for many tickers using one multi-symbol request per chunk
+        
+        Each chunk is fetched with the batch fetcher and unpacked into
+        per-ticker frames that are saved exactly like ``download_ticker_data``.
+        Tickers missing from a batch response are left out of the result so the
+        caller can retry them individually.
+        
+        Args:
+            tickers: List of ticker symbols
+            period: Data period
+            interval: Data interval
+            chunk_size: Maximum number of tickers per request
+            delay: Delay between chunk requests in seconds
+        
+        Returns:
+            Dictionary mapping ticker symbols to their data
+        """
+        results = {}
+        chunks = chunk_tickers(tickers, chunk_size)
+        
+        for i, chunk in enumerate(chunks):
+            logger.info(f"Processing batch {i+1}/{len(chunks)}: {len(chunk)} tickers")
+            
+            try:
+                batch = self._fetch(self.batch_fetcher, chunk, period, interval)
+                frames = unpack_batch(batch, chunk)
+            except Exception as e:
+                logger.error(f"Error downloading batch {i+1}: {str(e)}")
+                frames = {}
+            
+            for ticker, data in frames.items():
+                try:
+                    results[ticker] = self._save_ticker_data(ticker, data, period, interval)
+                except Exception as e:
+                    logger.error(f"Error saving data for {ticker}: {str(e)}")
+            
+            missing = [ticker for ticker in chunk if ticker not in frames]
+            if missing:
+                logger.warning(f"No batch data for {len(missing)} tickers: {', '.join(missing)}")
+            
+            if i < len(chunks) - 1:
+                time.sleep(delay)
+        
+        return {ticker: results[ticker] for ticker in tickers if ticker in results}
+    
+    def update_panel(self, data_dict: Optional[Dict[str, pd.DataFrame]] = None) -> Optional[str]:
+        """
+        Rebuild the consolidated market panel in the data directory
+        
+        A panel built from the stored files (every file with Close and Volume,
+        except 'test_' files) records their storage fingerprint, so the
+        analysis scripts open it instead of parsing the files again while they
+        are unchanged.
+        
+        Args:
+            data_dict: Ticker data to consolidate (defaults to every stored file)
+        
+        Returns:
+            Path of the panel values file or None if failed
+        """
+        try:
+            metadata = {}
+            if data_dict is None:
+                # Taken before reading, so files rewritten meanwhile leave the panel stale
+                metadata['fingerprint'] = storage_fingerprint(self.storage)
+                data_dict, _ = load_market_data(self.storage, exclude_prefixes=('test_',))
+            
+            panel = MarketPanel.from_data_dict(data_dict, fields=PANEL_FIELDS + ACTION_FIELDS)
+            panel.metadata = metadata
+            return panel.save(self.data_dir)
+            
+        except Exception as e:
+            logger.error(f"Error updating market panel: {str(e)}")
+            return None
+    
+    @property
+    def metadata(self):
+        """Ticker metadata service (the shared cached one unless another was given)"""
+        if self._metadata is None:
+            from metadata_service import get_metadata_service
+            self._metadata = get_metadata_service()
+        return self._metadata
+    
+    def get_ticker_info(self, ticker: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        Get basic information about a ticker
+        
+        Served from the metadata cache; Yahoo Finance is only asked when the
+        cached row is missing or older than the TTL (or ``refresh`` is set).
+        """
+        try:
+            return self.metadata.get(ticker, refresh=refresh)
+            
+        except Exception as e:
+            logger.error(f"Error getting info for {ticker}: {str(e)}")
+            return None
+    
+    def get_universe_info(self, tickers: List[str], refresh: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Get basic information about many tickers, fetching stale ones concurrently
+        
+        Returns:
+            DataFrame indexed by ticker (see ``MetadataService.get_many``) or None if failed
+        """
+        try:
+            return self.metadata.get_many(tickers, refresh=refresh)
+            
+        except Exception as e:
+            logger.error(f"Error getting ticker info: {str(e)}")
+            return None
+    
+    def validate_data(self, data: pd.DataFrame, ticker: str) -> bool:
+        """
+        Validate downloaded data quality
+        
+        Args:
+            data: Downloaded data DataFrame
+            ticker: Ticker symbol for logging
+        
+        Returns:
+            True if data has no error-level issues, False otherwise
+        """
+        issues = validate_universe({ticker: data})
+        errors = issues[issues['Severity'] == 'error']
+        if not errors.empty:
+            logger.warning(f"Data validation failed for {ticker}: {', '.join(errors['Check'])}")
+            return False
+        
+        logger.info(f"Data validation passed for {ticker}")
+        return True
+    
+    def generate_summary_report(self, results: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Generate a summary report of downloaded data
+        
+        All tickers are validated in one pass; the per-check issues table is
+        saved next to the summary when any check failed.
+        """
+        results = {ticker: data for ticker, data in results.items()
+                   if data is not None and not data.empty}
+        issues = validate_universe(results)
+        quality = summarize_issues(issues, list(results))
+        summary_data = []
+        
+        for ticker, data in results.items():
+            summary_data.append({
+                'Ticker': ticker,
+                'Records': len(data),
+                'Start_Date': data.index.min().strftime('%Y-%m-%d'),
+                'End_Date': data.index.max().strftime('%Y-%m-%d'),
+                'Min_Close': data['Close'].min(),
+                'Max_Close': data['Close'].max(),
+                'Avg_Volume': data['Volume'].mean() if 'Volume' in data.columns else 0,
+                'Data_Quality': quality.at[ticker, 'Data_Quality'],
+                'Issues': quality.at[ticker, 'Checks']
+            })
+        
+        summary_df = pd.DataFrame(summary_data)
+        
+        # Save summary report
+        summary_file = os.path.join("output", f"download_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        summary_df.to_csv(summary_file, index=False)
+        logger.info(f"Summary report saved to {summary_file}")
+        
+        if not issues.empty:
+            issues_file = summary_file.replace("download_summary_", "validation_issues_")
+            issues.to_csv(issues_file, index=False)
+            logger.info(f"Saved {len(issues)} data quality issues "
+                        f"({(quality['Errors'] > 0).sum()} tickers with errors) to {issues_file}")
+        
+        return summary_df
@@ -0,0 +1,381 @@
+"""
+BIST Trading System - Data Storage Module
+Pluggable storage backends for per-ticker price data files
+"""
+
+import os
+import sys
+import time
+import hashlib
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Typed columnar schema: prices as float32, volume as int64
+FLOAT_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Dividends', 'Stock Splits']
+INT_COLUMNS = ['Volume']
+
+# Explicit CSV parsing schema, so pandas does not have to infer types per file
+CSV_DTYPES = {col: 'float64' for col in FLOAT_COLUMNS}
+CSV_DTYPES.update({col: 'int64' for col in INT_COLUMNS})
+CSV_DTYPES['Ticker'] = 'str'
+CSV_DATE_FORMAT = '%Y-%m-%d %H:%M:%S%z'
+
+def ticker_from_filename(filename: str) -> str:
+    """Extract the ticker symbol from a data file name (e.g. 'THYAO_1y_1d.csv' -> 'THYAO.IS')"""
+    return filename.split('_')[0] + '.IS'
+
+def to_typed_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Cast a ticker frame to the compact columnar schema"""
+    data = data.copy()
+    for col in FLOAT_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].astype('float32')
+    for col in INT_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].fillna(0).astype('int64')
+    if 'Ticker' in data.columns:
+        data['Ticker'] = data['Ticker'].astype('category')
+    data.index.name = 'Date'
+    return data
+
+def _parse_csv_dates(index: pd.Index) -> pd.DatetimeIndex:
+    """Parse a CSV date index with the fixed format written by DataFrame.to_csv"""
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(index, format=CSV_DATE_FORMAT))
+    except (ValueError, TypeError):
+        # Plain dates or naive timestamps from older files
+        return pd.DatetimeIndex(pd.to_datetime(index, format='ISO8601'))
+
+def _csv_tail_offset(filepath: str, n_rows: int, block_size: int = 65536) -> int:
+    """Byte offset where the last ``n_rows`` lines of a CSV file start, found without reading all of it"""
+    with open(filepath, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        if n_rows <= 0:
+            return pos
+        tail = b''
+        
+        # Read backwards until the tail holds the trailing newline plus n_rows line starts
+        while pos > 0 and tail.count(b'\n') <= n_rows:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+        
+        cut = len(tail)
+        for _ in range(n_rows + 1):
+            cut = tail.rindex(b'\n', 0, cut)
+        
+        return pos + cut + 1
+
+class DataStorage:
+    """Base class for per-ticker file storage in a data directory"""
+    
+    name = ""
+    extension = ""
+    
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = data_dir
+    
+    def path_for(self, ticker: str, period: str, interval: str) -> str:
+        """Path of the file holding a ticker's data"""
+        filename = f"{ticker.replace('.IS', '')}_{period}_{interval}{self.extension}"
+        return os.path.join(self.data_dir, filename)
+    
+    def list_files(self) -> List[str]:
+        """File names in the data directory handled by this backend"""
+        if not os.path.exists(self.data_dir):
+            return []
+        return sorted(f for f in os.listdir(self.data_dir) if f.endswith(self.extension))
+    
+    def save(self, ticker: str, data: pd.DataFrame, period: str, interval: str) -> str:
+        """Write a ticker's full data set and return the file path"""
+        filepath = self.path_for(ticker, period, interval)
+        self._write(data, filepath)
+        return filepath
+    
+    def load(self, filepath: str) -> pd.DataFrame:
+        """Read one data file into a DataFrame indexed by date"""
+        raise NotImplementedError
+    
+    def load_all(self, max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """Read every data file, keyed by ticker symbol"""
+        data_dict, _ = load_market_data(self, max_workers=max_workers, required_columns=())
+        return data_dict
+    
+    def replace_tail(self, filepath: str, existing: pd.DataFrame,
+                     new_data: pd.DataFrame, replaced: int) -> None:
+        """Replace the last ``replaced`` rows of a stored file with ``new_data``"""
+        merged = pd.concat([existing.iloc[:len(existing) - replaced], new_data])
+        self._write(merged, filepath)
+    
+    def _write(self, data: pd.DataFrame, filepath: str) -> None:
+        raise NotImplementedError
+
+class CSVStorage(DataStorage):
+    """Stores each ticker as a CSV file (the original data/ layout)"""
+    
+    name = "csv"
+    extension = ".csv"
+    
+    def load(self, filepath: str) -> pd.DataFrame:
+        try:
+            data = pd.read_csv(filepath, index_col=0, dtype=CSV_DTYPES)
+        except ValueError:
+            # Values that do not fit the explicit schema (e.g. missing volume)
+            data = pd.read_csv(filepath, index_col=0)
+        data.index = _parse_csv_dates(data.index)
+        return data
+    
+    def replace_tail(self, filepath: str, existing: pd.DataFrame,
+                     new_data: pd.DataFrame, replaced: int, block_size: int = 1 << 20) -> None:
+        # The kept rows are copied byte for byte, so only the new tail is formatted;
+        # the copy replaces the file in one rename, so a crash leaves either version
+        remaining = _csv_tail_offset(filepath, replaced)
+        tmp_path = filepath + '.tmp'
+        with open(filepath, 'rb') as src, open(tmp_path, 'wb') as dst:
+            while remaining > 0:
+                block = src.read(min(block_size, remaining))
+                if not block:
+                    break
+                dst.write(block)
+                remaining -= len(block)
+        new_data.to_csv(tmp_path, mode='a', header=False)
+        os.replace(tmp_path, filepath)
+    
+    def _write(self, data: pd.DataFrame, filepath: str) -> None:
+        data.to_csv(filepath)
+
+class ParquetStorage(DataStorage):
+    """Stores each ticker as a typed Parquet file (float32 prices, int64 volume)"""
+    
+    name = "parquet"
+    extension = ".parquet"
+    
+    def __init__(self, data_dir: str = "data"):
+        super().__init__(data_dir)
+        _require_pyarrow(self.name)
+    
+    def load(self, filepath: str) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+        
+        # Per-file thread pools cost more than they save on these small files, and
+        # ParquetFile skips the dataset discovery read_table does for every path
+        return pq.ParquetFile(filepath).read(use_threads=False).to_pandas(use_threads=False)
+    
+    def _write(self, data: pd.DataFrame, filepath: str) -> None:
+        to_typed_frame(data).to_parquet(filepath)
+
+class FeatherStorage(ParquetStorage):
+    """Stores each ticker as a typed Feather (Arrow IPC) file"""
+    
+    name = "feather"
+    extension = ".feather"
+    
+    def load(self, filepath: str) -> pd.DataFrame:
+        import pyarrow.feather as feather
+        
+        table = feather.read_table(filepath, use_threads=False)
+        return table.to_pandas(use_threads=False).set_index('Date')
+    
+    def _write(self, data: pd.DataFrame, filepath: str) -> None:
+        # Feather only stores a default RangeIndex
+        to_typed_frame(data).reset_index().to_feather(filepath)
+
+STORAGE_BACKENDS = {
+    backend.name: backend for backend in (CSVStorage, ParquetStorage, FeatherStorage)
+}
+
+def _require_pyarrow(backend: str) -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"The {backend} storage backend requires pyarrow "
+                          f"(pip install pyarrow)")
+
+def get_storage(storage: str = "csv", data_dir: str = "data") -> DataStorage:
+    """Create a storage backend by name ('csv', 'parquet' or 'feather')"""
+    if storage not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend '{storage}'. "
+                         f"Choose from: {', '.join(STORAGE_BACKENDS)}")
+    return STORAGE_BACKENDS[storage](data_dir)
+
+def detect_storage(data_dir: str = "data") -> DataStorage:
+    """
+    Pick the storage backend matching the files present in ``data_dir``
+    
+    Columnar formats are preferred over CSV when both are present (e.g. after
+    a migration that kept the original CSV files).
+    """
+    files = os.listdir(data_dir) if os.path.exists(data_dir) else []
+    for name in ("parquet", "feather"):
+        extension = STORAGE_BACKENDS[name].extension
+        if any(f.endswith(extension) for f in files):
+            return get_storage(name, data_dir)
+    return CSVStorage(data_dir)
+
+def iter_market_data(storage: DataStorage, max_workers: int = 8,
+                     required_columns: Sequence[str] = ('Close', 'Volume'),
+                     exclude_prefixes: Tuple[str, ...] = (),
+                     report: Optional[Dict] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Yield (ticker, DataFrame) for every valid data file as it is read
+    
+    Files are read on a thread pool with at most two files per worker in
+    flight, so a consumer that keeps only what it needs from each frame
+    never holds the whole market as DataFrames.
+    
+    Args:
+        storage: Storage backend to read from
+        max_workers: Number of parallel reader threads
+        required_columns: Columns a frame needs to be kept; other files are skipped
+        exclude_prefixes: File name prefixes to ignore (e.g. 'test_')
+        report: Dictionary filled with the load report once every file was read
+    """
+    start = time.perf_counter()
+    files = [f for f in storage.list_files() if not f.startswith(exclude_prefixes)]
+    
+    def load(file: str):
+        try:
+            return file, storage.load(os.path.join(storage.data_dir, file)), None
+        except Exception as e:
+            return file, None, str(e)
+    
+    def read_all():
+        if max_workers <= 1 or len(files) <= 1:
+            yield from (load(file) for file in files)
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for file in files:
+                pending.append(executor.submit(load, file))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    loaded = 0
+    skipped = []
+    failed = []
+    
+    for file, data, error in read_all():
+        if error is not None:
+            failed.append((file, error))
+        elif data.empty or any(col not in data.columns for col in required_columns):
+            skipped.append(file)
+        else:
+            loaded += 1
+            yield ticker_from_filename(file), data
+    
+    summary = {
+        'storage': storage.name,
+        'files': len(files),
+        'loaded': loaded,
+        'skipped': skipped,
+        'failed': failed,
+        'elapsed': time.perf_counter() - start,
+        'workers': max_workers,
+    }
+    if report is not None:
+        report.update(summary)
+    
+    for file, error in failed:
+        logger.error(f"Error loading {file}: {error}")
+    logger.info(format_load_report(summary))
+
+def load_market_data(storage: DataStorage, max_workers: int = 8,
+                     required_columns: Sequence[str] = ('Close', 'Volume'),
+                     exclude_prefixes: Tuple[str, ...] = ()) -> Tuple[Dict[str, pd.DataFrame], Dict]:
+    """
+    Load every data file of a storage backend on a thread pool
+    
+    Args:
+        storage: Storage backend to read from
+        max_workers: Number of parallel reader threads
+        required_columns: Columns a frame needs to be kept; other files are skipped
+        exclude_prefixes: File name prefixes to ignore (e.g. 'test_')
+    
+    Returns:
+        Tuple of (ticker -> DataFrame dictionary, load report). The report
+        holds file/loaded counts, skipped and failed files and the elapsed time.
+    """
+    report = {}
+    data_dict = dict(iter_market_data(storage, max_workers, required_columns,
+                                      exclude_prefixes, report))
+    return data_dict, report
+
+def storage_fingerprint(storage: DataStorage) -> str:
+    """
+    Cheap fingerprint of a storage backend's data files
+    
+    Hashes every file name with its modification time and size, so any
+    download, refresh or migration that rewrites a file changes the result
+    without the files having to be read.
+    """
+    digest = hashlib.sha1(storage.name.encode())
+    for file in storage.list_files():
+        stat = os.stat(os.path.join(storage.data_dir, file))
+        digest.update(f"{file}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()
+
+def format_load_report(report: Dict) -> str:
+    """One-line summary of a load_market_data report"""
+    summary = (f"Loaded {report['loaded']}/{report['files']} {report['storage'].upper()} files "
+               f"in {report['elapsed']:.2f}s with {report['workers']} workers")
+    if report['skipped']:
+        summary += f", skipped {len(report['skipped'])} invalid"
+    if report['failed']:
+        summary += f", {len(report['failed'])} failed"
+    return summary
+
+def migrate_csv_storage(data_dir: str = "data", target: str = "parquet",
+                        remove_csv: bool = False) -> List[str]:
+    """
+    One-shot migration of the CSV files in ``data_dir`` to a columnar backend
+    
+    Args:
+        data_dir: Directory holding the ticker CSV files
+        target: Target backend name ('parquet' or 'feather')
+        remove_csv: Delete each CSV file once it has been converted
+    
+    Returns:
+        List of written file paths
+    """
+    source = CSVStorage(data_dir)
+    destination = get_storage(target, data_dir)
+    written = []
+    
+    for file in source.list_files():
+        csv_path = os.path.join(data_dir, file)
+        try:
+            data = source.load(csv_path)
+            target_path = os.path.splitext(csv_path)[0] + destination.extension
+            destination._write(data, target_path)
+            written.append(target_path)
+            
+            if remove_csv:
+                os.remove(csv_path)
+        except Exception as e:
+            logger.error(f"Error migrating {file}: {str(e)}")
+    
+    logger.info(f"Migrated {len(written)} files in {data_dir} to {target}")
+    return written
+
+def main():
+    """Migrate the data directory: python data_storage.py [parquet|feather] [--remove-csv]"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    target = args[0] if args else "parquet"
+    
+    written = migrate_csv_storage("data", target, remove_csv='--remove-csv' in sys.argv)
+    print(f"Migrated {len(written)} files to {target}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
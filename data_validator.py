@@ -0,0 +1,303 @@
+"""
+BIST Trading System - Data Validator Module
+Vectorized data-quality checks for the whole universe, reported as a per-ticker issues table
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import BIST_HOLIDAYS, VALIDATION_SETTINGS
+from market_panel import _utc_index
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+ISSUE_COLUMNS = ['Ticker', 'Check', 'Severity', 'Count', 'First_Date', 'Last_Date', 'Detail']
+
+# Checks that make a ticker's data unusable; the others are reported as warnings
+ERROR_CHECKS = ('empty', 'missing_columns', 'nonpositive_price', 'ohlc_inconsistent',
+                'duplicate_timestamp')
+
+NS_PER_DAY = 86_400 * 10**9
+
+def bist_trading_days(start, end, holidays: Sequence[str] = BIST_HOLIDAYS) -> pd.DatetimeIndex:
+    """Weekdays between two dates (inclusive) on which Borsa Istanbul is open"""
+    days = pd.bdate_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+    return days[~days.isin(pd.DatetimeIndex(holidays))]
+
+def run_lengths(flag: np.ndarray, starts_group: np.ndarray) -> np.ndarray:
+    """
+    Length of the run of consecutive flagged rows each row belongs to (0 for unflagged rows)
+    
+    Runs never continue across group boundaries (``starts_group`` marks the
+    first row of every ticker).
+    """
+    previous = np.concatenate([[False], flag[:-1]])
+    run_start = flag & (starts_group | ~previous)
+    run_id = np.cumsum(run_start)
+    sizes = np.bincount(run_id[flag], minlength=run_id[-1] + 1 if len(run_id) else 1)
+    return np.where(flag, sizes[run_id], 0)
+
+class _StackedBars:
+    """Every ticker's bars in one set of long arrays, sorted by ticker and time"""
+    
+    def __init__(self, data_dict: Dict[str, pd.DataFrame], timezone: str):
+        self.tickers = list(data_dict)
+        frames = [data_dict[ticker] for ticker in self.tickers]
+        lengths = np.array([len(data) for data in frames], dtype=np.int64)
+        codes = np.repeat(np.arange(len(frames)), lengths)
+        times = np.concatenate([_utc_index(data.index).as_unit('ns').asi8 for data in frames]
+                               or [np.empty(0, dtype=np.int64)])
+        
+        order = np.lexsort((times, codes))
+        self.codes = codes[order]
+        self.times = times[order]
+        self.fields = {}
+        for field in REQUIRED_COLUMNS:
+            column = np.concatenate([
+                data[field].to_numpy(dtype=np.float64) if field in data.columns
+                else np.full(len(data), np.nan) for data in frames
+            ] or [np.empty(0)])
+            self.fields[field] = column[order]
+        # Bars whose frame lacks a column are reported once as missing_columns, not per bar
+        has_column = np.array([[field in data.columns for field in REQUIRED_COLUMNS]
+                               for data in frames], dtype=bool).reshape(-1, len(REQUIRED_COLUMNS))
+        self.has_column = has_column[self.codes].T
+        
+        self.new_group = np.concatenate([[True], self.codes[1:] != self.codes[:-1]]) \
+            if len(self.codes) else np.empty(0, dtype=bool)
+        local = pd.to_datetime(self.times, unit='ns', utc=True).tz_convert(timezone)
+        # Local calendar day of every bar as an integer day number
+        self.days = local.tz_localize(None).as_unit('ns').asi8 // NS_PER_DAY
+        self.timezone = timezone
+    
+    def previous(self, values: np.ndarray) -> np.ndarray:
+        """Value of the previous bar of the same ticker (NaN on each ticker's first bar)"""
+        shifted = np.concatenate([[np.nan], values[:-1]])
+        shifted[self.new_group] = np.nan
+        return shifted
+    
+    def timestamp(self, position: int) -> pd.Timestamp:
+        return pd.Timestamp(int(self.times[position]), unit='ns', tz='UTC').tz_convert(self.timezone)
+
+class DataValidator:
+    """
+    Data-quality checks run on the whole universe at once
+    
+    All tickers are stacked into long arrays sorted by ticker and time, so
+    each check is a handful of array operations however many tickers and
+    bars there are, which keeps it fast on intraday data too. The result is
+    an issues table with one row per ticker and failed check instead of a
+    log line per ticker.
+    """
+    
+    def __init__(self, zero_volume_bars: int = VALIDATION_SETTINGS["zero_volume_bars"],
+                 stale_price_bars: int = VALIDATION_SETTINGS["stale_price_bars"],
+                 split_threshold: float = VALIDATION_SETTINGS["split_threshold"],
+                 price_tolerance: float = VALIDATION_SETTINGS["price_tolerance"],
+                 timezone: str = VALIDATION_SETTINGS["timezone"],
+                 holidays: Sequence[str] = BIST_HOLIDAYS):
+        """
+        Args:
+            zero_volume_bars: Minimum length of a reported zero-volume streak
+            stale_price_bars: Minimum number of consecutive unchanged closes reported
+            split_threshold: Absolute bar-to-bar return above which a move is split-like
+            price_tolerance: Relative slack allowed in the OHLC consistency checks
+            timezone: Exchange timezone used to assign bars to trading days
+            holidays: Exchange closures for the calendar-gap check
+        """
+        self.zero_volume_bars = zero_volume_bars
+        self.stale_price_bars = stale_price_bars
+        self.split_threshold = split_threshold
+        self.price_tolerance = price_tolerance
+        self.timezone = timezone
+        self.holidays = list(holidays)
+        # The calendar check only knows the closures of the years the holiday table covers
+        self.calendar_years = sorted({pd.Timestamp(day).year for day in self.holidays})
+    
+    def validate(self, data_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Check every ticker's bars
+        
+        Args:
+            data_dict: Dictionary of ticker data (daily or intraday bars)
+        
+        Returns:
+            Issues table with the ISSUE_COLUMNS columns, one row per ticker and
+            failed check; ``Count`` is the number of affected bars, streaks or
+            missing sessions depending on the check
+        """
+        issues = []
+        frames = {}
+        for ticker, data in data_dict.items():
+            if data is None or data.empty:
+                issues.append(self._issue(ticker, 'empty', 1))
+                continue
+            missing = [col for col in REQUIRED_COLUMNS if col not in data.columns]
+            if missing:
+                issues.append(self._issue(ticker, 'missing_columns', len(missing),
+                                          detail=', '.join(missing)))
+            if 'Close' in data.columns:
+                frames[ticker] = data
+        
+        if frames:
+            bars = _StackedBars(frames, self.timezone)
+            issues.extend(self._row_checks(bars))
+            issues.extend(self._streak_checks(bars))
+            issues.extend(self._calendar_check(bars))
+        
+        table = pd.DataFrame(issues, columns=ISSUE_COLUMNS)
+        order = {ticker: i for i, ticker in enumerate(data_dict)}
+        table = table.iloc[np.argsort(table['Ticker'].map(order).to_numpy(), kind='stable')]
+        return table.reset_index(drop=True)
+    
+    def _issue(self, ticker: str, check: str, count: int, first=None, last=None,
+               detail: str = '') -> Dict:
+        return {'Ticker': ticker, 'Check': check,
+                'Severity': 'error' if check in ERROR_CHECKS else 'warning',
+                'Count': int(count), 'First_Date': first, 'Last_Date': last, 'Detail': detail}
+    
+    def _flagged(self, bars: _StackedBars, check: str, flag: np.ndarray,
+                 counted: Optional[np.ndarray] = None,
+                 detail: Optional[np.ndarray] = None, detail_format: str = '') -> List[Dict]:
+        """
+        Issue rows of a per-bar check
+        
+        Args:
+            bars: Stacked bars
+            check: Check name
+            flag: Bars failing the check
+            counted: Bars that are counted (e.g. the first bar of each streak);
+                defaults to ``flag``
+            detail: Per-bar value whose per-ticker maximum is shown in Detail
+            detail_format: Format string for the detail value
+        """
+        counted = flag if counted is None else counted
+        if not flag.any():
+            return []
+        positions = np.flatnonzero(flag)
+        codes = bars.codes[positions]
+        tickers, first = np.unique(codes, return_index=True)
+        last = len(codes) - 1 - np.unique(codes[::-1], return_index=True)[1]
+        counts = np.bincount(bars.codes[counted], minlength=len(bars.tickers))
+        if detail is not None:
+            worst = np.full(len(bars.tickers), -np.inf)
+            np.maximum.at(worst, codes, detail[positions])
+        
+        return [self._issue(bars.tickers[code], check, counts[code],
+                            bars.timestamp(positions[f]), bars.timestamp(positions[l]),
+                            detail_format.format(worst[code]) if detail is not None else '')
+                for code, f, l in zip(tickers, first, last)]
+    
+    def _row_checks(self, bars: _StackedBars) -> List[Dict]:
+        open_, high, low, close = (bars.fields[f] for f in ('Open', 'High', 'Low', 'Close'))
+        prices = np.stack([open_, high, low, close])
+        slack = self.price_tolerance * np.abs(close)
+        previous_close = bars.previous(close)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            nonpositive = (prices <= 0).any(axis=0)
+            inconsistent = ((high < low - slack) | (close > high + slack) | (close < low - slack)
+                            | (open_ > high + slack) | (open_ < low - slack))
+            move = np.abs(close / previous_close - 1)
+        duplicate = ~bars.new_group & (bars.times == np.concatenate([[0], bars.times[:-1]]))
+        missing = (np.isnan(np.stack(list(bars.fields.values()))) & bars.has_column).any(axis=0)
+        jump = np.nan_to_num(move, nan=0.0, posinf=0.0) > self.split_threshold
+        
+        return (self._flagged(bars, 'nonpositive_price', nonpositive)
+                + self._flagged(bars, 'ohlc_inconsistent', inconsistent)
+                + self._flagged(bars, 'duplicate_timestamp', duplicate)
+                + self._flagged(bars, 'missing_values', missing)
+                + self._flagged(bars, 'split_jump', jump, detail=move * 100,
+                                detail_format="largest move {:.1f}%"))
+    
+    def _streak_checks(self, bars: _StackedBars) -> List[Dict]:
+        issues = []
+        close = bars.fields['Close']
+        checks = [
+            ('zero_volume', bars.fields['Volume'] == 0, self.zero_volume_bars),
+            ('stale_price', ~bars.new_group & (close == bars.previous(close)), self.stale_price_bars),
+        ]
+        for check, flag, min_length in checks:
+            lengths = run_lengths(flag, bars.new_group)
+            streak = lengths >= min_length
+            previous = np.concatenate([[False], streak[:-1]])
+            starts = streak & (bars.new_group | ~previous)
+            issues.extend(self._flagged(bars, check, streak, counted=starts,
+                                        detail=lengths.astype(np.float64),
+                                        detail_format="longest {:.0f} bars"))
+        return issues
+    
+    def _calendar_check(self, bars: _StackedBars) -> List[Dict]:
+        """
+        Bars on closed days and trading sessions missing between each ticker's first and last bar
+        
+        Only bars in the years covered by the holiday table are checked;
+        elsewhere every unlisted holiday would show up as a missing session.
+        """
+        years = bars.days.astype('datetime64[D]').astype('datetime64[Y]').astype(np.int64) + 1970
+        covered = np.isin(years, self.calendar_years)
+        if not covered.all():
+            skipped = np.unique(years[~covered])
+            logger.info(f"Calendar check skipped for {int((~covered).sum())} bars in "
+                        f"{', '.join(map(str, skipped))} (no holidays listed for those years)")
+        if not covered.any():
+            return []
+        
+        days = np.unique(bars.codes[covered] * (1 << 32) + bars.days[covered])
+        codes, day_numbers = days >> 32, days & ((1 << 32) - 1)
+        calendar = bist_trading_days(pd.Timestamp(day_numbers.min() * NS_PER_DAY),
+                                     pd.Timestamp(day_numbers.max() * NS_PER_DAY), self.holidays)
+        calendar = calendar[calendar.year.isin(self.calendar_years)]
+        calendar_days = calendar.as_unit('ns').asi8 // NS_PER_DAY
+        issues = self._flagged(bars, 'off_calendar', covered & ~np.isin(bars.days, calendar_days))
+        if not len(calendar_days):
+            return issues
+        
+        # Sessions x tickers grid of traded days inside each ticker's listed range
+        positions = np.searchsorted(calendar_days, day_numbers)
+        on_calendar = (positions < len(calendar_days)) & \
+            (calendar_days[np.minimum(positions, len(calendar_days) - 1)] == day_numbers)
+        traded = np.zeros((len(calendar_days), len(bars.tickers)), dtype=bool)
+        traded[positions[on_calendar], codes[on_calendar]] = True
+        
+        n_tickers = len(bars.tickers)
+        first = np.full(n_tickers, len(calendar_days))
+        last = np.full(n_tickers, -1)
+        np.minimum.at(first, codes, positions)
+        np.maximum.at(last, codes, np.searchsorted(calendar_days, day_numbers, side='right') - 1)
+        rows = np.arange(len(calendar_days))[:, None]
+        missing = (rows >= first) & (rows <= last) & ~traded
+        
+        for code in np.flatnonzero(missing.any(axis=0)):
+            sessions = calendar[missing[:, code]]
+            issues.append(self._issue(bars.tickers[code], 'calendar_gap', len(sessions),
+                                      sessions[0].tz_localize(self.timezone),
+                                      sessions[-1].tz_localize(self.timezone)))
+        return issues
+
+def validate_universe(data_dict: Dict[str, pd.DataFrame], **settings) -> pd.DataFrame:
+    """Issues table of a data dictionary with the default (or overridden) settings"""
+    return DataValidator(**settings).validate(data_dict)
+
+def summarize_issues(issues: pd.DataFrame, tickers: Sequence[str]) -> pd.DataFrame:
+    """
+    Per-ticker overview of an issues table
+    
+    Returns:
+        DataFrame indexed by ticker with the number of errors and warnings,
+        the failed checks and a 'Data_Quality' column ('Valid' or 'Issues')
+    """
+    summary = pd.DataFrame(index=pd.Index(list(tickers), name='Ticker'))
+    counts = issues.groupby(['Ticker', 'Severity']).size().unstack(fill_value=0)
+    for severity in ('error', 'warning'):
+        column = counts[severity] if severity in counts.columns else pd.Series(dtype=int)
+        summary[severity.capitalize() + 's'] = column.reindex(summary.index, fill_value=0).astype(int)
+    checks = issues.groupby('Ticker')['Check'].agg(', '.join)
+    summary['Checks'] = checks.reindex(summary.index, fill_value='')
+    summary['Data_Quality'] = np.where(summary['Errors'] > 0, 'Issues', 'Valid')
+    return summary
@@ -1,250 +1,428 @@
-"""
-BIST Trading System - Data Visualization Module
-Creates charts and visualizations for downloaded BIST data
-"""
-
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend for Windows
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
-import os
-from typing import Dict, List
-import logging
-
-logger = logging.getLogger(__name__)
-
-class BISTDataVisualizer:
-    """Creates visualizations for BIST ticker data"""
-    
-    def __init__(self, output_dir: str = "output"):
-        self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Set style for matplotlib
-        try:
-            plt.style.use('seaborn-v0_8')
-        except:
-            plt.style.use('default')
-        sns.set_palette("husl")
-    
-    def plot_price_comparison(self, data_dict: Dict[str, pd.DataFrame], 
-                            save_path: str = None) -> None:
-        """
-        Create a price comparison chart for multiple tickers
-        
-        Args:
-            data_dict: Dictionary of ticker data
-            save_path: Path to save the plot (optional)
-        """
-        try:
-            plt.figure(figsize=(15, 8))
-            
-            for ticker, data in data_dict.items():
-                if data is not None and not data.empty:
-                    # Normalize prices to start at 100 for comparison
-                    normalized_prices = (data['Close'] / data['Close'].iloc[0]) * 100
-                    plt.plot(data.index, normalized_prices, label=ticker, linewidth=2)
-            
-            plt.title('BIST Tickers - Normalized Price Comparison (Base=100)', 
-                     fontsize=16, fontweight='bold')
-            plt.xlabel('Date', fontsize=12)
-            plt.ylabel('Normalized Price (Base=100)', fontsize=12)
-            plt.legend(fontsize=10)
-            plt.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            if save_path:
-                plt.savefig(save_path, dpi=300, bbox_inches='tight')
-                logger.info(f"Price comparison chart saved to {save_path}")
-            
-            # Don't show plots in non-interactive mode
-            plt.close()
-            
-        except Exception as e:
-            logger.error(f"Error creating price comparison chart: {str(e)}")
-    
-    def plot_volume_analysis(self, data_dict: Dict[str, pd.DataFrame], 
-                           save_path: str = None) -> None:
-        """
-        Create volume analysis charts for all tickers
-        
-        Args:
-            data_dict: Dictionary of ticker data
-            save_path: Path to save the plot (optional)
-        """
-        try:
-            num_tickers = len(data_dict)
-            fig, axes = plt.subplots(num_tickers, 1, figsize=(15, 4*num_tickers))
-            
-            if num_tickers == 1:
-                axes = [axes]
-            
-            for i, (ticker, data) in enumerate(data_dict.items()):
-                if data is not None and not data.empty:
-                    ax = axes[i]
-                    
-                    # Plot volume bars
-                    ax.bar(data.index, data['Volume'], alpha=0.7, color='skyblue')
-                    ax.set_title(f'{ticker} - Trading Volume', fontweight='bold')
-                    ax.set_ylabel('Volume')
-                    ax.grid(True, alpha=0.3)
-                    ax.tick_params(axis='x', rotation=45)
-            
-            plt.tight_layout()
-            
-            if save_path:
-                plt.savefig(save_path, dpi=300, bbox_inches='tight')
-                logger.info(f"Volume analysis chart saved to {save_path}")
-            
-            # Don't show plots in non-interactive mode
-            plt.close()
-            
-        except Exception as e:
-            logger.error(f"Error creating volume analysis chart: {str(e)}")
-    
-    def create_interactive_dashboard(self, data_dict: Dict[str, pd.DataFrame], 
-                                   save_path: str = None) -> None:
-        """
-        Create an interactive Plotly dashboard
-        
-        Args:
-            data_dict: Dictionary of ticker data
-            save_path: Path to save the HTML file (optional)
-        """
-        try:
-            # Create subplots
-            fig = make_subplots(
-                rows=len(data_dict), cols=2,
-                subplot_titles=[f"{ticker} - Price & Volume" for ticker in data_dict.keys()],
-                specs=[[{"secondary_y": True}] * 2] * len(data_dict)
-            )
-            
-            row = 1
-            for ticker, data in data_dict.items():
-                if data is not None and not data.empty:
-                    # Price chart (left subplot)
-                    fig.add_trace(
-                        go.Scatter(
-                            x=data.index,
-                            y=data['Close'],
-                            name=f"{ticker} Price",
-                            line=dict(color='blue')
-                        ),
-                        row=row, col=1
-                    )
-                    
-                    # Volume chart (right subplot)
-                    fig.add_trace(
-                        go.Bar(
-                            x=data.index,
-                            y=data['Volume'],
-                            name=f"{ticker} Volume",
-                            marker_color='lightblue'
-                        ),
-                        row=row, col=2
-                    )
-                    
-                    row += 1
-            
-            # Update layout
-            fig.update_layout(
-                title="BIST Trading System - Interactive Dashboard",
-                height=300 * len(data_dict),
-                showlegend=True
-            )
-            
-            # Update axes labels
-            fig.update_xaxes(title_text="Date")
-            fig.update_yaxes(title_text="Price (TL)", secondary_y=False)
-            fig.update_yaxes(title_text="Volume", secondary_y=True)
-            
-            if save_path:
-                fig.write_html(save_path)
-                logger.info(f"Interactive dashboard saved to {save_path}")
-            
-            # Don't show plots in non-interactive mode
-            # fig.show()
-            
-        except Exception as e:
-            logger.error(f"Error creating interactive dashboard: {str(e)}")
-    
-    def plot_correlation_matrix(self, data_dict: Dict[str, pd.DataFrame], 
-                              save_path: str = None) -> None:
-        """
-        Create a correlation matrix heatmap for ticker returns
-        
-        Args:
-            data_dict: Dictionary of ticker data
-            save_path: Path to save the plot (optional)
-        """
-        try:
-            # Calculate returns for each ticker
-            returns_data = {}
-            for ticker, data in data_dict.items():
-                if data is not None and not data.empty:
-                    returns_data[ticker] = data['Close'].pct_change().dropna()
-            
-            # Create returns DataFrame
-            returns_df = pd.DataFrame(returns_data)
-            
-            # Calculate correlation matrix
-            correlation_matrix = returns_df.corr()
-            
-            # Create heatmap
-            plt.figure(figsize=(10, 8))
-            sns.heatmap(correlation_matrix, 
-                       annot=True, 
-                       cmap='coolwarm', 
-                       center=0,
-                       square=True,
-                       fmt='.3f')
-            
-            plt.title('BIST Tickers - Returns Correlation Matrix', 
-                     fontsize=16, fontweight='bold')
-            plt.tight_layout()
-            
-            if save_path:
-                plt.savefig(save_path, dpi=300, bbox_inches='tight')
-                logger.info(f"Correlation matrix saved to {save_path}")
-            
-            # Don't show plots in non-interactive mode
-            plt.close()
-            
-        except Exception as e:
-            logger.error(f"Error creating correlation matrix: {str(e)}")
-    
-    def generate_all_visualizations(self, data_dict: Dict[str, pd.DataFrame]) -> None:
-        """
-        Generate all available visualizations for the data
-        
-        Args:
-            data_dict: Dictionary of ticker data
-        """
-        try:
-            timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
-            
-            # Price comparison chart
-            price_chart_path = os.path.join(self.output_dir, f"price_comparison_{timestamp}.png")
-            self.plot_price_comparison(data_dict, price_chart_path)
-            
-            # Volume analysis
-            volume_chart_path = os.path.join(self.output_dir, f"volume_analysis_{timestamp}.png")
-            self.plot_volume_analysis(data_dict, volume_chart_path)
-            
-            # Interactive dashboard
-            dashboard_path = os.path.join(self.output_dir, f"interactive_dashboard_{timestamp}.html")
-            self.create_interactive_dashboard(data_dict, dashboard_path)
-            
-            # Correlation matrix
-            correlation_path = os.path.join(self.output_dir, f"correlation_matrix_{timestamp}.png")
-            self.plot_correlation_matrix(data_dict, correlation_path)
-            
-            logger.info("All visualizations generated successfully")
-            
-        except Exception as e:
-            logger.error(f"Error generating visualizations: {str(e)}")
+"""
+BIST Trading System - Data Visualization Module
+Creates charts and visualizations for downloaded BIST data
+"""
+
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend for Windows
+import matplotlib.pyplot as plt
+import seaborn as sns
+import plotly.graph_objects as go
+import plotly.express as px
+from plotly.subplots import make_subplots
+import pandas as pd
+import numpy as np
+import os
+from typing import Dict, List, Mapping, Optional, Tuple
+import logging
+
+from correlation import cluster_order, pairwise_correlation
+from decimation import aggregate_volume, decimate_series
+from lightweight_dashboard import write_lightweight_dashboard
+from market_stats import aligned_returns
+from market_universe import MarketUniverse
+from render_pipeline import render_job_spec, run_render_jobs
+
+logger = logging.getLogger(__name__)
+
+class BISTDataVisualizer:
+    """Creates visualizations for BIST ticker data"""
+    
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Set style for matplotlib
+        try:
+            plt.style.use('seaborn-v0_8')
+        except:
+            plt.style.use('default')
+        sns.set_palette("husl")
+    
+    def plot_price_comparison(self, data_dict: Mapping[str, pd.DataFrame], 
+                            save_path: str = None) -> None:
+        """
+        Create a price comparison chart for multiple tickers
+        
+        Args:
+            data_dict: Dictionary of ticker data or MarketUniverse
+            save_path: Path to save the plot (optional)
+        """
+        try:
+            plt.figure(figsize=(15, 8))
+            
+            for ticker, data in data_dict.items():
+                if data is not None and not data.empty:
+                    # Normalize prices to start at 100 for comparison
+                    normalized_prices = (data['Close'] / data['Close'].iloc[0]) * 100
+                    plt.plot(data.index, normalized_prices, label=ticker, linewidth=2)
+            
+            plt.title('BIST Tickers - Normalized Price Comparison (Base=100)', 
+                     fontsize=16, fontweight='bold')
+            plt.xlabel('Date', fontsize=12)
+            plt.ylabel('Normalized Price (Base=100)', fontsize=12)
+            plt.legend(fontsize=10)
+            plt.grid(True, alpha=0.3)
+            plt.xticks(rotation=45)
+            plt.tight_layout()
+            
+            if save_path:
+                plt.savefig(save_path, dpi=300, bbox_inches='tight')
+                logger.info(f"Price comparison chart saved to {save_path}")
+            
+            # Don't show plots in non-interactive mode
+            plt.close()
+            
+        except Exception as e:
+            logger.error(f"Error creating price comparison chart: {str(e)}")
+    
+    def plot_volume_analysis(self, data_dict: Mapping[str, pd.DataFrame], 
+                           save_path: str = None, tickers_per_page: int = 12,
+                           aggregate: Optional[str] = None,
+                           max_bars: Optional[int] = None) -> List[str]:
+        """
+        Create volume analysis charts for all tickers
+        
+        Up to ``tickers_per_page`` tickers are drawn in one figure, one row per
+        ticker. Larger universes are split into pages of small multiples, saved
+        as ``<name>_p01.png``, ``<name>_p02.png``..., and every page figure is
+        closed before the next one is drawn, so memory use does not grow with
+        the number of tickers.
+        
+        Args:
+            data_dict: Dictionary of ticker data or MarketUniverse
+            save_path: Path to save the plot (optional)
+            tickers_per_page: Maximum number of tickers per figure
+            aggregate: Sum volume into calendar bins first ('W' weekly, 'M' monthly)
+            max_bars: Downsample each ticker to at most this many bars with LTTB
+        
+        Returns:
+            List of saved file paths
+        """
+        saved = []
+        try:
+            items = [(ticker, data) for ticker, data in data_dict.items()
+                     if data is not None and not data.empty]
+            pages = [items[i:i + tickers_per_page] for i in range(0, len(items), tickers_per_page)]
+            
+            for page_number, page in enumerate(pages, start=1):
+                if len(pages) == 1:
+                    page_path = save_path
+                    fig, axes = plt.subplots(len(page), 1, figsize=(15, 4 * len(page)), squeeze=False)
+                else:
+                    page_path = self._page_path(save_path, page_number)
+                    columns = 3
+                    rows = -(-tickers_per_page // columns)
+                    fig, axes = plt.subplots(rows, columns, figsize=(18, 3 * rows), squeeze=False)
+                axes = axes.ravel()
+                
+                for ax, (ticker, data) in zip(axes, page):
+                    volume = data['Volume']
+                    if aggregate:
+                        volume = aggregate_volume(volume, aggregate)
+                    if max_bars:
+                        volume = decimate_series(volume, max_bars)
+                    
+                    # Bar width follows the (possibly aggregated) spacing of the bars
+                    width = 0.8
+                    if aggregate and len(volume) > 1:
+                        width = 0.8 * pd.Series(volume.index).diff().median() / pd.Timedelta(days=1)
+                    
+                    # Plot volume bars
+                    ax.bar(volume.index, volume.to_numpy(), width=width, alpha=0.7, color='skyblue')
+                    ax.set_title(f'{ticker} - Trading Volume', fontweight='bold')
+                    ax.set_ylabel('Volume')
+                    ax.grid(True, alpha=0.3)
+                    ax.tick_params(axis='x', rotation=45)
+                
+                for ax in axes[len(page):]:
+                    ax.set_visible(False)
+                
+                plt.tight_layout()
+                
+                if page_path:
+                    plt.savefig(page_path, dpi=300, bbox_inches='tight')
+                    saved.append(page_path)
+                    logger.info(f"Volume analysis chart saved to {page_path}")
+                
+                # Don't show plots in non-interactive mode
+                plt.close(fig)
+            
+        except Exception as e:
+            logger.error(f"Error creating volume analysis chart: {str(e)}")
+            plt.close('all')
+        
+        return saved
+    
+    @staticmethod
+    def _page_path(save_path: Optional[str], page_number: int) -> Optional[str]:
+        """Path of one page of a multi-page chart ('volume.png' -> 'volume_p02.png')"""
+        if not save_path:
+            return None
+        root, extension = os.path.splitext(save_path)
+        return f"{root}_p{page_number:02d}{extension}"
+    
+    def create_interactive_dashboard(self, data_dict: Mapping[str, pd.DataFrame], 
+                                   save_path: str = None) -> None:
+        """
+        Create an interactive Plotly dashboard
+        
+        Args:
+            data_dict: Dictionary of ticker data or MarketUniverse
+            save_path: Path to save the HTML file (optional)
+        """
+        try:
+            # Create subplots
+            fig = make_subplots(
+                rows=len(data_dict), cols=2,
+                subplot_titles=[f"{ticker} - Price & Volume" for ticker in data_dict.keys()],
+                specs=[[{"secondary_y": True}] * 2] * len(data_dict)
+            )
+            
+            row = 1
+            for ticker, data in data_dict.items():
+                if data is not None and not data.empty:
+                    # Price chart (left subplot)
+                    fig.add_trace(
+                        go.Scatter(
+                            x=data.index,
+                            y=data['Close'],
+                            name=f"{ticker} Price",
+                            line=dict(color='blue')
+                        ),
+                        row=row, col=1
+                    )
+                    
+                    # Volume chart (right subplot)
+                    fig.add_trace(
+                        go.Bar(
+                            x=data.index,
+                            y=data['Volume'],
+                            name=f"{ticker} Volume",
+                            marker_color='lightblue'
+                        ),
+                        row=row, col=2
+                    )
+                    
+                    row += 1
+            
+            # Update layout
+            fig.update_layout(
+                title="BIST Trading System - Interactive Dashboard",
+                height=300 * len(data_dict),
+                showlegend=True
+            )
+            
+            # Update axes labels
+            fig.update_xaxes(title_text="Date")
+            fig.update_yaxes(title_text="Price (TL)", secondary_y=False)
+            fig.update_yaxes(title_text="Volume", secondary_y=True)
+            
+            if save_path:
+                fig.write_html(save_path)
+                logger.info(f"Interactive dashboard saved to {save_path}")
+            
+            # Don't show plots in non-interactive mode
+            # fig.show()
+            
+        except Exception as e:
+            logger.error(f"Error creating interactive dashboard: {str(e)}")
+    
+    def create_lightweight_dashboard(self, data_dict: Mapping[str, pd.DataFrame],
+                                     save_path: str = None, max_points: int = 2000) -> None:
+        """
+        Create an interactive WebGL dashboard for any number of tickers
+        
+        Unlike ``create_interactive_dashboard`` the HTML file does not inline
+        the data: a ticker selector loads each ticker's decimated series from
+        a side-car file on demand, so the page stays small and opens fast.
+        
+        Args:
+            data_dict: Dictionary of ticker data or MarketUniverse
+            save_path: Path to save the HTML file (optional)
+            max_points: Approximate number of bars to keep per ticker
+        """
+        try:
+            if save_path:
+                write_lightweight_dashboard(data_dict, save_path, max_points)
+            
+        except Exception as e:
+            logger.error(f"Error creating lightweight dashboard: {str(e)}")
+    
+    def plot_correlation_matrix(self, data_dict: Mapping[str, pd.DataFrame], 
+                              save_path: str = None, returns_cache=None,
+                              max_tickers: Optional[int] = None, cluster: bool = False) -> None:
+        """
+        Create a correlation matrix heatmap for ticker returns
+        
+        Args:
+            data_dict: Dictionary of ticker data or MarketUniverse
+            save_path: Path to save the plot (optional)
+            returns_cache: ReturnsCache with precomputed aligned returns (optional)
+            max_tickers: Only render the first ``max_tickers`` tickers (optional)
+            cluster: Reorder the tickers so correlated groups form blocks
+        """
+        try:
+            tickers = [ticker for ticker, data in data_dict.items()
+                       if data is not None and not data.empty][:max_tickers]
+            
+            if returns_cache is not None and all(ticker in returns_cache for ticker in tickers):
+                # Reuse the cached aligned returns instead of recomputing them
+                returns_df = returns_cache.simple[tickers]
+            elif isinstance(data_dict, MarketUniverse):
+                # Aligned returns straight from the universe's close array
+                universe = data_dict.subset(tickers)
+                close = universe.field('Close')
+                returns_df = pd.DataFrame(aligned_returns(close.to_numpy(dtype=np.float64),
+                                                          universe.present),
+                                          index=close.index, columns=close.columns)
+            else:
+                # Calculate returns for each ticker
+                returns_data = {}
+                for ticker in tickers:
+                    returns_data[ticker] = data_dict[ticker]['Close'].pct_change().dropna()
+                
+                # Create returns DataFrame
+                returns_df = pd.DataFrame(returns_data)
+            
+            # Calculate pairwise-complete correlation matrix blockwise
+            values = pairwise_correlation(returns_df.to_numpy(), out=np.empty((len(tickers),) * 2))
+            correlation_matrix = pd.DataFrame(values, index=returns_df.columns,
+                                              columns=returns_df.columns)
+            
+            self.plot_correlation_heatmap(correlation_matrix, save_path, cluster=cluster)
+            
+        except Exception as e:
+            logger.error(f"Error creating correlation matrix: {str(e)}")
+    
+    def plot_correlation_heatmap(self, correlation_matrix: pd.DataFrame,
+                                 save_path: str = None, cluster: bool = False) -> None:
+        """
+        Render a correlation matrix (e.g. a subset of a stored CorrelationMatrix) as a heatmap
+        
+        Values are annotated only while the matrix is small enough to read.
+        
+        Args:
+            correlation_matrix: Tickers x tickers correlation frame
+            save_path: Path to save the plot (optional)
+            cluster: Reorder the tickers so correlated groups form blocks
+        """
+        try:
+            if cluster:
+                order = cluster_order(correlation_matrix.to_numpy())
+                correlation_matrix = correlation_matrix.iloc[order, order]
+            
+            n_tickers = len(correlation_matrix)
+            annotate = n_tickers <= 20
+            size = max(10, n_tickers * 0.25)
+            
+            # Create heatmap
+            plt.figure(figsize=(size, size * 0.8))
+            sns.heatmap(correlation_matrix, 
+                       annot=annotate, 
+                       cmap='coolwarm', 
+                       center=0,
+                       square=True,
+                       fmt='.3f',
+                       xticklabels=True,
+                       yticklabels=True)
+            
+            title = 'BIST Tickers - Returns Correlation Matrix'
+            if cluster:
+                title += ' (Clustered)'
+            plt.title(title, fontsize=16, fontweight='bold')
+            plt.tight_layout()
+            
+            if save_path:
+                plt.savefig(save_path, dpi=300, bbox_inches='tight')
+                logger.info(f"Correlation matrix saved to {save_path}")
+            
+            # Don't show plots in non-interactive mode
+            plt.close()
+            
+        except Exception as e:
+            logger.error(f"Error creating correlation heatmap: {str(e)}")
+    
+    def plot_rolling_correlation(self, rolling: Dict[int, object],
+                                 pair: Optional[Tuple[str, str]] = None,
+                                 save_path: str = None) -> None:
+        """
+        Plot rolling correlations over time for several window lengths
+        
+        Args:
+            rolling: Dictionary mapping window length to RollingCorrelation
+            pair: Ticker pair to plot; the average correlation over all
+                tracked pairs is plotted when omitted
+            save_path: Path to save the plot (optional)
+        """
+        try:
+            plt.figure(figsize=(15, 6))
+            
+            for window, result in sorted(rolling.items()):
+                series = result.pair(*pair) if pair else result.average()
+                plt.plot(series.index, series.to_numpy(), label=f'{window}-day', linewidth=1.5)
+            
+            subject = f'{pair[0]} / {pair[1]}' if pair else 'Average Pairwise'
+            plt.title(f'BIST Tickers - {subject} Rolling Correlation', 
+                     fontsize=16, fontweight='bold')
+            plt.xlabel('Date', fontsize=12)
+            plt.ylabel('Correlation', fontsize=12)
+            plt.axhline(0, color='grey', linewidth=0.8)
+            plt.legend(fontsize=10)
+            plt.grid(True, alpha=0.3)
+            plt.xticks(rotation=45)
+            plt.tight_layout()
+            
+            if save_path:
+                plt.savefig(save_path, dpi=300, bbox_inches='tight')
+                logger.info(f"Rolling correlation chart saved to {save_path}")
+            
+            # Don't show plots in non-interactive mode
+            plt.close()
+            
+        except Exception as e:
+            logger.error(f"Error creating rolling correlation chart: {str(e)}")
+    
+    def generate_all_visualizations(self, data_dict: Mapping[str, pd.DataFrame],
+                                    max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Generate all available visualizations for the data
+        
+        The charts are independent and rendered in parallel worker processes.
+        
+        Args:
+            data_dict: Dictionary of ticker data or MarketUniverse
+            max_workers: Number of render processes (defaults to the CPU count)
+        
+        Returns:
+            Render results with the output path and timing of every chart
+        """
+        try:
+            timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+            
+            def path(prefix: str, extension: str = "png") -> str:
+                return os.path.join(self.output_dir, f"{prefix}_{timestamp}.{extension}")
+            
+            jobs = [
+                # Price comparison chart
+                render_job_spec("price_comparison", "plot_price_comparison",
+                                path("price_comparison"), data_dict),
+                # Volume analysis
+                render_job_spec("volume_analysis", "plot_volume_analysis",
+                                path("volume_analysis"), data_dict),
+                # Interactive dashboard
+                render_job_spec("interactive_dashboard", "create_interactive_dashboard",
+                                path("interactive_dashboard", "html"), data_dict),
+                # Correlation matrix
+                render_job_spec("correlation_matrix", "plot_correlation_matrix",
+                                path("correlation_matrix"), data_dict),
+            ]
+            
+            results = run_render_jobs(jobs, self.output_dir, max_workers)
+            
+            logger.info("All visualizations generated successfully")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error generating visualizations: {str(e)}")
+            return []
@@ -0,0 +1,74 @@
+"""
+BIST Trading System - Decimation Module
+Downsampling helpers that keep long price/volume histories cheap to plot
+"""
+
+import numpy as np
+import pandas as pd
+
+# Pandas resample rules accepted for aggregated bar charts
+AGGREGATION_RULES = {'W': 'W-FRI', 'M': 'ME'}
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling
+    
+    Keeps the first and last points and, from each of ``n_out - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. Peaks and
+    troughs survive, unlike with plain striding.
+    
+    Args:
+        x: Monotonic x values (e.g. dates as integers)
+        y: Values to downsample; NaN is treated as zero
+        n_out: Number of points to keep
+    
+    Returns:
+        Sorted integer indexes of the kept points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        next_start = edges[b + 1]
+        next_end = edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous]) -
+                      (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        kept[b + 1] = previous
+    
+    return kept
+
+def decimate_series(series: pd.Series, max_points: int) -> pd.Series:
+    """Downsample a date-indexed series to at most ``max_points`` points with LTTB"""
+    if len(series) <= max_points:
+        return series
+    x = series.index.as_unit('ns').asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+    return series.iloc[lttb_indices(x, series.to_numpy(), max_points)]
+
+def aggregate_volume(volume: pd.Series, rule: str = 'W') -> pd.Series:
+    """
+    Sum volume into calendar bins
+    
+    Args:
+        volume: Date-indexed volume series
+        rule: 'W' for weekly bins ending Friday, 'M' for month-end bins or
+            any pandas resample rule
+    
+    Returns:
+        Volume per bin, labelled with the bin's end date
+    """
+    return volume.resample(AGGREGATION_RULES.get(rule, rule)).sum(min_count=1).dropna()
@@ -0,0 +1,224 @@
+"""
+BIST Trading System - Download Manifest Module
+JSON-lines checkpoint of per-ticker download status, used to resume interrupted jobs
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from data_storage import DataStorage, ticker_from_filename
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "download_manifest.jsonl"
+
+# A ticker is finished when its file was written ('done') or Yahoo had no data for it ('empty')
+FINISHED_STATUSES = ('done', 'empty')
+
+def file_sha256(filepath: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class DownloadManifest:
+    """
+    Per-ticker record of a download job, one JSON object per line
+    
+    Each record holds the ticker's status ('running', 'done', 'empty' or
+    'failed'), the number of attempts, the stored row count, last date,
+    file name, size and SHA-256, the last error and the update time. Every
+    update appends the ticker's new record as one fsynced line, and the
+    latest line of a ticker wins when the file is read. The file is
+    compacted to one line per ticker (rewritten to a temporary name and
+    renamed into place) when it is loaded, closed, or has grown by
+    ``compact_every`` superseded lines, so a crash never loses more than
+    the line being written.
+    
+    A ``read_only`` manifest never writes or compacts the file, so it can
+    be opened while a download job is appending to it.
+    """
+    
+    def __init__(self, data_dir: str = "data", name: str = MANIFEST_NAME,
+                 compact_every: int = 1000, read_only: bool = False):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, name)
+        self.compact_every = compact_every
+        self.read_only = read_only
+        self.records: Dict[str, Dict] = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+        self.load()
+    
+    def load(self) -> Dict[str, Dict]:
+        """Read the manifest from disk (later lines win for repeated tickers) and compact it"""
+        self.records = {}
+        lines = 0
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        self.records[record['ticker']] = record
+                    except (ValueError, KeyError):
+                        # Typically the last line of a run that was killed mid-write
+                        logger.warning(f"Skipping malformed manifest line in {self.path}")
+        self._lines = lines
+        if lines > len(self.records) and not self.read_only:
+            self.save()
+        return self.records
+    
+    def save(self) -> None:
+        """Atomically rewrite the manifest with one line per ticker"""
+        if self.read_only:
+            raise ValueError(f"Manifest {self.path} was opened read-only")
+        os.makedirs(self.data_dir, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for record in self.records.values():
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = len(self.records)
+    
+    def close(self) -> None:
+        """Compact the manifest at the end of a job"""
+        with self._lock:
+            if self._lines > len(self.records) and not self.read_only:
+                self.save()
+    
+    def _update(self, ticker: str, **fields) -> Dict:
+        if self.read_only:
+            raise ValueError(f"Manifest {self.path} was opened read-only")
+        with self._lock:
+            record = self.records.get(ticker, {'ticker': ticker, 'status': 'pending', 'attempts': 0})
+            record.update(fields, updated=datetime.now().isoformat(timespec='seconds'))
+            self.records[ticker] = record
+            
+            if self._lines - len(self.records) >= self.compact_every:
+                self.save()
+                return dict(record)
+            
+            os.makedirs(self.data_dir, exist_ok=True)
+            f = open(self.path, 'a')
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            f.flush()
+            self._lines += 1
+        
+        # Only the appended line has to reach the disk; other workers need not wait for it
+        try:
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        return dict(record)
+    
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Record of a ticker, or None if it was never attempted"""
+        record = self.records.get(ticker)
+        return dict(record) if record else None
+    
+    def start(self, ticker: str) -> Dict:
+        """Mark a ticker as being downloaded and count the attempt"""
+        attempts = self.records.get(ticker, {}).get('attempts', 0) + 1
+        return self._update(ticker, status='running', attempts=attempts)
+    
+    def record_success(self, ticker: str, filepath: str, data: pd.DataFrame) -> Dict:
+        """Record a written file with its row count, last date and checksum"""
+        return self._update(
+            ticker, status='done', file=os.path.basename(filepath),
+            rows=int(len(data)),
+            last_date=data.index.max().strftime('%Y-%m-%d') if len(data) else None,
+            bytes=os.path.getsize(filepath), sha256=file_sha256(filepath), error=None,
+        )
+    
+    def record_empty(self, ticker: str) -> Dict:
+        """Record that the source returned no data for a ticker"""
+        return self._update(ticker, status='empty', rows=0, error=None)
+    
+    def record_failure(self, ticker: str, error: str) -> Dict:
+        """Record a failed attempt"""
+        return self._update(ticker, status='failed', error=error)
+    
+    def is_complete(self, ticker: str, verify: bool = True) -> bool:
+        """
+        Whether a ticker needs no further download
+        
+        With ``verify=True`` a 'done' record only counts when its file still
+        exists with the recorded checksum, so files that were truncated,
+        edited or deleted after the record was written are fetched again.
+        """
+        record = self.records.get(ticker)
+        if record is None or record['status'] not in FINISHED_STATUSES:
+            return False
+        if record['status'] == 'empty' or not verify:
+            return True
+        filepath = os.path.join(self.data_dir, record.get('file') or '')
+        return (os.path.isfile(filepath) and os.path.getsize(filepath) == record.get('bytes')
+                and file_sha256(filepath) == record.get('sha256'))
+    
+    def pending(self, tickers: Iterable[str], verify: bool = True) -> List[str]:
+        """Tickers (in the given order) that still have to be downloaded"""
+        return [ticker for ticker in tickers if not self.is_complete(ticker, verify)]
+    
+    def adopt(self, storage: DataStorage, tickers: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Record files written before the manifest existed
+        
+        Files of tickers without a record are loaded; only those that parse
+        into a non-empty frame are recorded as 'done', so half-written files
+        are downloaded again.
+        
+        Args:
+            storage: Storage backend of the data directory
+            tickers: Tickers to consider (defaults to every stored file)
+        
+        Returns:
+            Tickers that were adopted
+        """
+        wanted = set(tickers) if tickers is not None else None
+        adopted = []
+        for file in storage.list_files():
+            ticker = ticker_from_filename(file)
+            if ticker in self.records or (wanted is not None and ticker not in wanted):
+                continue
+            filepath = os.path.join(storage.data_dir, file)
+            try:
+                data = storage.load(filepath)
+            except Exception as e:
+                logger.warning(f"Not adopting unreadable file {file}: {str(e)}")
+                continue
+            if data.empty or 'Close' not in data.columns:
+                continue
+            self.record_success(ticker, filepath, data)
+            adopted.append(ticker)
+        
+        if adopted:
+            logger.info(f"Adopted {len(adopted)} existing files into {self.path}")
+        return adopted
+    
+    def summary(self, tickers: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Count of tickers per status ('missing' for tickers without a record)"""
+        tickers = list(tickers) if tickers is not None else list(self.records)
+        counts = {'done': 0, 'empty': 0, 'failed': 0, 'running': 0, 'missing': 0}
+        for ticker in tickers:
+            status = self.records.get(ticker, {}).get('status', 'missing')
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+    
+    def to_frame(self) -> pd.DataFrame:
+        """All records as a DataFrame, one row per ticker"""
+        return pd.DataFrame(list(self.records.values()))
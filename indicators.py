@@ -0,0 +1,230 @@
+"""
+BIST Trading System - Technical Indicators Module
+Vectorized SMA/EMA/RSI/MACD/Bollinger/ATR/OBV over the aligned dates x tickers universe
+"""
+
+import os
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_storage import DataStorage, detect_storage, storage_fingerprint
+from market_panel import MarketPanel, panel_exists
+
+logger = logging.getLogger(__name__)
+
+INDICATORS_NAME = "indicators"
+
+DEFAULT_PARAMETERS = {
+    'sma': 20,
+    'ema': 20,
+    'rsi': 14,
+    'macd': (12, 26, 9),
+    'bollinger': (20, 2.0),
+    'atr': 14,
+}
+
+# Every indicator is computed on each ticker's own bars, as if run on the per-ticker
+# frames the downloader writes. Columns are "packed" so a ticker's bars are contiguous
+# from row 0, the indicators run as plain array ops, and results are unpacked again.
+
+def pack(present: np.ndarray) -> np.ndarray:
+    """
+    Row order per column that moves each ticker's bars to the top
+    
+    Args:
+        present: Boolean dates x tickers mask of rows where a ticker has a bar
+    
+    Returns:
+        Integer dates x tickers array for ``np.take_along_axis``
+    """
+    return np.argsort(~present, axis=0, kind='stable')
+
+def packed(values: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Reorder every column so the ticker's bars come first"""
+    return np.take_along_axis(np.asarray(values, dtype=np.float64), order, axis=0)
+
+def unpacked(values: np.ndarray, order: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Put packed results back on the aligned dates, NaN where a ticker has no bar"""
+    out = np.empty(values.shape, dtype=np.float64)
+    np.put_along_axis(out, order, values, axis=0)
+    out[~present] = np.nan
+    return out
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the last ``window`` rows, NaN for the first ``window - 1`` rows"""
+    out = np.full(x.shape, np.nan)
+    if window > x.shape[0]:
+        return out
+    total = np.cumsum(x, axis=0)
+    out[window - 1] = total[window - 1]
+    out[window:] = total[window:] - total[:-window]
+    return out
+
+def sma(x: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average of packed columns"""
+    # Shifting by the first value keeps the cumulative sums small and accurate
+    base = x[:1]
+    return rolling_sum(x - base, window) / window + base
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample standard deviation (ddof=1) of packed columns"""
+    centered = x - x[:1]
+    mean = rolling_sum(centered, window) / window
+    var = (rolling_sum(centered * centered, window) - window * mean * mean) / (window - 1)
+    return np.sqrt(np.clip(var, 0.0, None))
+
+def ewm(x: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    Exponentially weighted mean of packed columns (pandas ``adjust=False``)
+    
+    The recursion starts at each column's first non-NaN value; rows before
+    ``min_periods`` observations are NaN.
+    """
+    out = np.empty(x.shape)
+    state = np.full(x.shape[1:], np.nan)
+    for row in range(x.shape[0]):
+        value = x[row]
+        valid = ~np.isnan(value)
+        state = np.where(np.isnan(state), value,
+                         np.where(valid, (1 - alpha) * state + alpha * value, state))
+        out[row] = state
+    if min_periods > 1:
+        out[np.cumsum(~np.isnan(x), axis=0) < min_periods] = np.nan
+    return out
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average with pandas ``ewm(span=span, adjust=False)`` weights"""
+    return ewm(x, 2.0 / (span + 1))
+
+def previous(x: np.ndarray) -> np.ndarray:
+    """Previous row of packed columns (NaN on the first row)"""
+    out = np.full(x.shape, np.nan)
+    out[1:] = x[:-1]
+    return out
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Relative strength index with Wilder smoothing"""
+    delta = close - previous(close)
+    gain = ewm(np.where(np.isnan(delta), np.nan, np.clip(delta, 0.0, None)), 1.0 / window, window)
+    loss = ewm(np.where(np.isnan(delta), np.nan, np.clip(-delta, 0.0, None)), 1.0 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """High-low range extended to the previous close (high - low on the first bar)"""
+    prev_close = previous(close)
+    ranges = np.stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.fmax.reduce(ranges, axis=0)
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-balance volume starting at 0 on each ticker's first bar"""
+    direction = np.sign(np.nan_to_num(close - previous(close)))
+    return np.cumsum(direction * np.nan_to_num(volume), axis=0)
+
+def compute_indicators(panel: MarketPanel,
+                       parameters: Optional[Dict] = None) -> MarketPanel:
+    """
+    Compute every indicator for the whole universe in one pass
+    
+    Args:
+        panel: Market panel with Open/High/Low/Close/Volume fields
+        parameters: Overrides for DEFAULT_PARAMETERS (windows, spans, band width)
+    
+    Returns:
+        MarketPanel on the same dates and tickers whose fields are the
+        indicator names (e.g. 'SMA_20', 'RSI_14', 'MACD', 'BB_Upper', 'OBV')
+    """
+    params = dict(DEFAULT_PARAMETERS, **(parameters or {}))
+    close = np.asarray(panel.values[panel.fields.index('Close')], dtype=np.float64)
+    present = ~np.isnan(close)
+    order = pack(present)
+    
+    def field(name: str) -> np.ndarray:
+        if name in panel.fields:
+            return packed(panel.values[panel.fields.index(name)], order)
+        return packed(close, order)
+    
+    c = packed(close, order)
+    high, low, volume = field('High'), field('Low'), field('Volume')
+    
+    fast, slow, signal = params['macd']
+    macd = ema(c, fast) - ema(c, slow)
+    macd_signal = ema(macd, signal)
+    band_window, band_width = params['bollinger']
+    middle = sma(c, band_window)
+    width = band_width * rolling_std(c, band_window)
+    
+    results = {
+        f"SMA_{params['sma']}": sma(c, params['sma']),
+        f"EMA_{params['ema']}": ema(c, params['ema']),
+        f"RSI_{params['rsi']}": rsi(c, params['rsi']),
+        'MACD': macd,
+        'MACD_Signal': macd_signal,
+        'MACD_Hist': macd - macd_signal,
+        'BB_Upper': middle + width,
+        'BB_Middle': middle,
+        'BB_Lower': middle - width,
+        f"ATR_{params['atr']}": ewm(true_range(high, low, c), 1.0 / params['atr'], params['atr']),
+        'OBV': obv(c, volume),
+    }
+    
+    values = np.stack([unpacked(result, order, present) for result in results.values()])
+    return MarketPanel(values, panel.dates, panel.tickers, list(results))
+
+def invalidate_indicator_cache(data_dir: str = "data", name: str = INDICATORS_NAME) -> None:
+    """Remove cached indicators so the next analysis run recomputes them"""
+    for extension in ('.npy', '.json'):
+        path = os.path.join(data_dir, f"{name}{extension}")
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"Indicator cache {path} invalidated")
+
+def load_indicators(data_dict: Optional[Dict[str, pd.DataFrame]] = None,
+                    storage: Optional[DataStorage] = None,
+                    data_dir: str = "data",
+                    parameters: Optional[Dict] = None) -> Optional[MarketPanel]:
+    """
+    Return the indicators cached next to the data files, recomputing them if stale
+    
+    The cache is keyed by the storage fingerprint and the indicator
+    parameters, and is opened memory-mapped when still valid.
+    
+    Args:
+        data_dict: Already loaded ticker data used for a rebuild (defaults to
+            loading every stored file)
+        storage: Storage backend holding the data files (detected from
+            ``data_dir`` when omitted)
+        data_dir: Data directory holding the files and the cache
+        parameters: Overrides for DEFAULT_PARAMETERS
+    
+    Returns:
+        Indicator MarketPanel or None if failed
+    """
+    try:
+        storage = storage or detect_storage(data_dir)
+        key = {'fingerprint': storage_fingerprint(storage),
+               'parameters': repr(sorted(dict(DEFAULT_PARAMETERS, **(parameters or {})).items()))}
+        
+        if panel_exists(storage.data_dir, INDICATORS_NAME):
+            try:
+                cached = MarketPanel.open(storage.data_dir, INDICATORS_NAME)
+                if cached.metadata == key:
+                    logger.info(f"Using cached indicators for {len(cached)} tickers")
+                    return cached
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable indicator cache: {str(e)}")
+        
+        if data_dict is None:
+            data_dict = storage.load_all()
+        
+        indicators = compute_indicators(MarketPanel.from_data_dict(data_dict), parameters)
+        indicators.metadata = key
+        indicators.save(storage.data_dir, INDICATORS_NAME)
+        return indicators
+    
+    except Exception as e:
+        logger.error(f"Error loading indicators: {str(e)}")
+        return None
@@ -0,0 +1,286 @@
+"""
+BIST Trading System - Intraday Storage Module
+Intraday bars partitioned by ticker and trading day in Parquet, with range reads and streaming aggregation
+"""
+
+import os
+import re
+import math
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import INTRADAY_SETTINGS
+from data_storage import _require_pyarrow, to_typed_frame
+from market_stats import MARKET_STATS_COLUMNS, TRADING_DAYS_PER_YEAR
+
+logger = logging.getLogger(__name__)
+
+OHLCV_AGGREGATION = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def interval_minutes(interval: str) -> Optional[int]:
+    """Bar length in minutes of a Yahoo interval ('5m', '1h', ...), None for daily or longer bars"""
+    match = re.fullmatch(r'(\d+)(m|h)', interval)
+    if match is None:
+        return None
+    return int(match.group(1)) * (60 if match.group(2) == 'h' else 1)
+
+def periods_per_year(interval: str,
+                     session_minutes: int = INTRADAY_SETTINGS["session_minutes"]) -> int:
+    """Bars per year of an interval, used to annualize volatility"""
+    minutes = interval_minutes(interval)
+    if minutes is None:
+        return TRADING_DAYS_PER_YEAR
+    return math.ceil(session_minutes / minutes) * TRADING_DAYS_PER_YEAR
+
+def resample_bars(data: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars to a coarser bar size, dropping empty bins"""
+    aggregation = {col: how for col, how in OHLCV_AGGREGATION.items() if col in data.columns}
+    bars = data.resample(rule).agg(aggregation)
+    return bars.dropna(subset=['Close']) if 'Close' in bars.columns else bars
+
+class PartitionedStorage:
+    """
+    Intraday bars stored as ``{data_dir}/{interval}/{TICKER}/{YYYY-MM-DD}.parquet``
+    
+    Each file holds one ticker's bars for one local trading day. Writes
+    only touch the days present in the new data (normally just the latest
+    one), so history is never rewritten, and reads only open the
+    partitions inside the requested date range.
+    """
+    
+    extension = ".parquet"
+    
+    def __init__(self, data_dir: str = INTRADAY_SETTINGS["data_dir"], interval: str = "5m",
+                 timezone: str = INTRADAY_SETTINGS["timezone"]):
+        _require_pyarrow("intraday")
+        self.data_dir = data_dir
+        self.interval = interval
+        self.timezone = timezone
+        self.root = os.path.join(data_dir, interval)
+    
+    def ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker)
+    
+    def partition_path(self, ticker: str, date: str) -> str:
+        return os.path.join(self.ticker_dir(ticker), f"{date}{self.extension}")
+    
+    def tickers(self) -> List[str]:
+        """Tickers with at least one stored partition"""
+        if not os.path.exists(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+    
+    def dates(self, ticker: str, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Stored trading days of a ticker ('YYYY-MM-DD'), optionally limited to [start, end]"""
+        directory = self.ticker_dir(ticker)
+        if not os.path.exists(directory):
+            return []
+        dates = sorted(f[:-len(self.extension)] for f in os.listdir(directory)
+                       if f.endswith(self.extension))
+        return [date for date in dates
+                if (start is None or date >= start[:10]) and (end is None or date <= end[:10])]
+    
+    def last_date(self, ticker: str) -> Optional[str]:
+        """Latest stored trading day of a ticker"""
+        dates = self.dates(ticker)
+        return dates[-1] if dates else None
+    
+    def _localize(self, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            return index.tz_localize(self.timezone)
+        return index.tz_convert(self.timezone)
+    
+    def append(self, ticker: str, data: pd.DataFrame) -> List[str]:
+        """
+        Add bars to a ticker's partitions
+        
+        Bars are grouped by local trading day. A day that already has a
+        partition is merged with it (new bars replace bars with the same
+        timestamp); every written file goes to a temporary name first and is
+        renamed into place.
+        
+        Returns:
+            Paths of the partitions written
+        """
+        if data is None or data.empty:
+            return []
+        
+        data = data.copy()
+        data.index = self._localize(data.index)
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        os.makedirs(self.ticker_dir(ticker), exist_ok=True)
+        
+        written = []
+        for day, bars in data.groupby(data.index.strftime('%Y-%m-%d'), sort=True):
+            path = self.partition_path(ticker, day)
+            if os.path.exists(path):
+                existing = self._read_partition(path)
+                bars = pd.concat([existing[~existing.index.isin(bars.index)], bars]).sort_index()
+            to_typed_frame(bars).to_parquet(path + '.tmp')
+            os.replace(path + '.tmp', path)
+            written.append(path)
+        
+        logger.info(f"Wrote {len(written)} {self.interval} partitions for {ticker}")
+        return written
+    
+    def _read_partition(self, path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+        
+        table = pq.read_table(path, columns=list(columns) if columns else None,
+                              use_threads=False, use_pandas_metadata=True)
+        return table.to_pandas(use_threads=False)
+    
+    def iter_days(self, ticker: str, start: Optional[str] = None, end: Optional[str] = None,
+                  columns: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield (date, bars) one partition at a time, so long ranges stream in constant memory"""
+        for date in self.dates(ticker, start, end):
+            yield date, self._read_partition(self.partition_path(ticker, date), columns)
+    
+    def read(self, ticker: str, start: Optional[str] = None, end: Optional[str] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Bars of one ticker between two dates (inclusive), reading only those partitions"""
+        frames = [bars for _, bars in self.iter_days(ticker, start, end, columns)]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames)
+    
+    def read_range(self, tickers: Optional[Sequence[str]] = None, start: Optional[str] = None,
+                   end: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+                   max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """
+        Bars of many tickers between two dates, read on a thread pool
+        
+        Args:
+            tickers: Tickers to read (defaults to every stored ticker)
+            start: First trading day ('YYYY-MM-DD'), inclusive
+            end: Last trading day, inclusive
+            columns: Columns to read (defaults to all)
+            max_workers: Number of parallel reader threads
+        
+        Returns:
+            Dictionary mapping tickers with bars in the range to their data
+        """
+        tickers = list(tickers) if tickers is not None else self.tickers()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            frames = executor.map(lambda ticker: self.read(ticker, start, end, columns), tickers)
+            return {ticker: data for ticker, data in zip(tickers, frames) if not data.empty}
+    
+    def resampled(self, ticker: str, rule: str = "1D", start: Optional[str] = None,
+                  end: Optional[str] = None) -> pd.DataFrame:
+        """
+        A ticker's bars aggregated to ``rule`` (at most one day), one partition at a time
+        
+        Only the aggregated bars are kept in memory, so months of minute bars
+        can be turned into daily or hourly bars for the stats and charts.
+        """
+        # Partitions hold whole local days, so each one resamples independently
+        frames = [resample_bars(bars, rule) for _, bars in
+                  self.iter_days(ticker, start, end, list(OHLCV_AGGREGATION))]
+        data = pd.concat(frames) if frames else pd.DataFrame()
+        if not data.empty:
+            data.index.name = 'Date'
+        return data
+    
+    def load_data_dict(self, tickers: Optional[Sequence[str]] = None, rule: str = "1D",
+                       start: Optional[str] = None, end: Optional[str] = None,
+                       max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """
+        Per-ticker frames aggregated to ``rule``, ready for the visualizer and MarketPanel
+        
+        Returns:
+            Dictionary of ticker data like ``load_market_data`` returns
+        """
+        tickers = list(tickers) if tickers is not None else self.tickers()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            frames = executor.map(lambda ticker: self.resampled(ticker, rule, start, end), tickers)
+            return {ticker: data for ticker, data in zip(tickers, frames) if not data.empty}
+
+def streaming_ticker_stats(days: Iterator[Tuple[str, pd.DataFrame]],
+                           periods: int) -> Optional[Dict]:
+    """
+    Market overview statistics of one ticker, accumulated one partition at a time
+    
+    Matches ``compute_market_stats`` on the full bar history: returns are
+    taken bar to bar, including the overnight return from the previous
+    day's last close.
+    """
+    records, volume_sum, volume_count = 0, 0.0, 0
+    n, returns_sum, returns_sumsq = 0, 0.0, 0.0
+    first_close = last_close = prev_close = np.nan
+    min_close, max_close = np.inf, -np.inf
+    first_date = last_date = None
+    
+    for date, bars in days:
+        if bars.empty:
+            continue
+        close = bars['Close'].to_numpy(dtype=np.float64)
+        records += len(bars)
+        first_date = first_date or date
+        last_date = date
+        
+        if 'Volume' in bars.columns:
+            volume = bars['Volume'].to_numpy(dtype=np.float64)
+            volume_sum += np.nansum(volume)
+            volume_count += int(np.count_nonzero(~np.isnan(volume)))
+        
+        valid = close[~np.isnan(close)]
+        if valid.size:
+            min_close = min(min_close, valid.min())
+            max_close = max(max_close, valid.max())
+        if np.isnan(first_close):
+            first_close = close[0]
+        last_close = close[-1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = close / np.concatenate([[prev_close], close[:-1]]) - 1
+        returns = returns[~np.isnan(returns)]
+        n += returns.size
+        returns_sum += returns.sum()
+        returns_sumsq += (returns * returns).sum()
+        prev_close = close[-1]
+    
+    if records == 0 or np.isinf(min_close):
+        return None
+    
+    variance = (returns_sumsq - returns_sum * returns_sum / n) / (n - 1) if n > 1 else np.nan
+    return {
+        'Records': records,
+        'Start_Date': first_date,
+        'End_Date': last_date,
+        'Min_Close': min_close,
+        'Max_Close': max_close,
+        'Last_Close': last_close,
+        'Total_Return': (last_close / first_close - 1) * 100,
+        'Avg_Volume': volume_sum / volume_count if volume_count else 0,
+        'Volatility': np.sqrt(max(variance, 0.0)) * np.sqrt(periods) * 100,
+    }
+
+def intraday_market_stats(storage: PartitionedStorage, tickers: Optional[Sequence[str]] = None,
+                          start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """
+    Market overview statistics of intraday bars without loading whole histories
+    
+    Args:
+        storage: Partitioned intraday storage
+        tickers: Tickers to include (defaults to every stored ticker)
+        start: First trading day, inclusive
+        end: Last trading day, inclusive
+    
+    Returns:
+        DataFrame with the MARKET_STATS_COLUMNS columns, volatility annualized
+        for the storage interval
+    """
+    periods = periods_per_year(storage.interval)
+    rows = []
+    for ticker in (tickers if tickers is not None else storage.tickers()):
+        stats = streaming_ticker_stats(storage.iter_days(ticker, start, end, ['Close', 'Volume']),
+                                       periods)
+        if stats is not None:
+            rows.append(dict(stats, Ticker=ticker))
+    return pd.DataFrame(rows, columns=MARKET_STATS_COLUMNS)
@@ -0,0 +1,153 @@
+"""
+BIST Trading System - Lightweight Dashboard Module
+WebGL dashboard for the whole universe that loads each ticker's data on demand
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+from decimation import lttb_indices
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_DIV_ID = "bist-dashboard"
+
+# Runs after the empty figure is created: adds the ticker selector and loads
+# side-car scripts on demand. Script tags (rather than fetch) also work when
+# the dashboard is opened straight from disk.
+SELECTOR_SCRIPT = """
+(function() {
+    var tickers = %(tickers)s;
+    var dataDir = %(data_dir)s;
+    var plot = document.getElementById('%(div_id)s');
+    window.BIST_DASHBOARD_DATA = window.BIST_DASHBOARD_DATA || {};
+    
+    var select = document.createElement('select');
+    select.style.margin = '8px';
+    select.style.fontSize = '14px';
+    tickers.forEach(function(ticker) {
+        var option = document.createElement('option');
+        option.value = option.text = ticker;
+        select.appendChild(option);
+    });
+    plot.parentNode.insertBefore(select, plot);
+    
+    function show(ticker) {
+        var data = window.BIST_DASHBOARD_DATA[ticker];
+        Plotly.update(plot,
+            {x: [data.dates, data.dates], y: [data.close, data.volume]},
+            {title: {text: ticker + ' - Price & Volume (' + data.points + ' of ' + data.rows + ' bars)'}});
+    }
+    
+    function load(ticker) {
+        if (window.BIST_DASHBOARD_DATA[ticker]) { show(ticker); return; }
+        var script = document.createElement('script');
+        script.src = dataDir + '/' + encodeURIComponent(ticker) + '.js';
+        script.onload = function() { show(ticker); };
+        document.head.appendChild(script);
+    }
+    
+    select.addEventListener('change', function() { load(select.value); });
+    if (tickers.length) { load(tickers[0]); }
+})();
+"""
+
+def dashboard_series(data: pd.DataFrame, max_points: int = 2000) -> Dict:
+    """
+    Decimated price and volume series of one ticker for the dashboard
+    
+    Points kept by LTTB on either the close or the volume series are
+    included, so price swings and volume spikes both stay visible.
+    
+    Args:
+        data: Ticker data with Close and Volume columns
+        max_points: Approximate number of bars to keep per series
+    
+    Returns:
+        JSON-serializable dictionary with dates, close, volume and counts
+    """
+    data = data.dropna(subset=['Close'])
+    x = np.arange(len(data))
+    kept = lttb_indices(x, data['Close'].to_numpy(), max_points)
+    if 'Volume' in data.columns:
+        kept = np.union1d(kept, lttb_indices(x, data['Volume'].to_numpy(), max_points))
+    data = data.iloc[kept]
+    
+    index = data.index
+    intraday = bool(((index - index.normalize()) != pd.Timedelta(0)).any())
+    dates = index.strftime('%Y-%m-%d %H:%M' if intraday else '%Y-%m-%d').tolist()
+    volume = data['Volume'].fillna(0).astype('int64').tolist() if 'Volume' in data.columns else []
+    
+    return {
+        'dates': dates,
+        'close': [round(float(value), 4) for value in data['Close']],
+        'volume': volume,
+        'points': len(data),
+        'rows': int(len(x)),
+    }
+
+def write_lightweight_dashboard(data_dict: Dict[str, pd.DataFrame], save_path: str,
+                                max_points: int = 2000) -> List[str]:
+    """
+    Write the dashboard HTML plus one side-car data script per ticker
+    
+    The HTML only holds an empty WebGL figure, the ticker list and the
+    loader; plotly.js is written once next to it. Each ticker's decimated
+    data lives in ``<name>_data/<ticker>.js`` and is loaded when selected.
+    
+    Args:
+        data_dict: Dictionary of ticker data
+        save_path: Path of the HTML file
+        max_points: Approximate number of bars to keep per ticker
+    
+    Returns:
+        List of written side-car files
+    """
+    output_dir = os.path.dirname(save_path) or "."
+    data_dir_name = f"{os.path.splitext(os.path.basename(save_path))[0]}_data"
+    data_dir = os.path.join(output_dir, data_dir_name)
+    os.makedirs(data_dir, exist_ok=True)
+    
+    tickers = []
+    written = []
+    for ticker, data in data_dict.items():
+        if data is None or data.empty or 'Close' not in data.columns:
+            continue
+        series = dashboard_series(data, max_points)
+        path = os.path.join(data_dir, f"{ticker}.js")
+        with open(path, 'w') as f:
+            f.write(f"window.BIST_DASHBOARD_DATA[{json.dumps(ticker)}] = ")
+            json.dump(series, f, separators=(',', ':'))
+            f.write(";\n")
+        tickers.append(ticker)
+        written.append(path)
+    
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3],
+                        vertical_spacing=0.05)
+    fig.add_trace(go.Scattergl(x=[], y=[], mode='lines', name='Price',
+                               line=dict(color='blue')), row=1, col=1)
+    fig.add_trace(go.Bar(x=[], y=[], name='Volume', marker_color='lightblue'), row=2, col=1)
+    fig.update_layout(title="BIST Trading System - Interactive Dashboard",
+                      height=700, showlegend=False)
+    fig.update_yaxes(title_text="Price (TL)", row=1, col=1)
+    fig.update_yaxes(title_text="Volume", row=2, col=1)
+    fig.update_xaxes(title_text="Date", row=2, col=1)
+    
+    script = SELECTOR_SCRIPT % {
+        'tickers': json.dumps(tickers),
+        'data_dir': json.dumps(data_dir_name),
+        'div_id': DASHBOARD_DIV_ID,
+    }
+    pio.write_html(fig, save_path, include_plotlyjs='directory', post_script=script,
+                   div_id=DASHBOARD_DIV_ID)
+    
+    logger.info(f"Lightweight dashboard for {len(tickers)} tickers saved to {save_path}")
+    return written
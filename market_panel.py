@@ -0,0 +1,242 @@
+"""
+BIST Trading System - Market Panel Module
+Consolidated dates x tickers x fields array for the whole market, memory-mappable with NumPy
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_storage import DataStorage, storage_fingerprint
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+PANEL_NAME = "market_panel"
+
+# Corporate action columns yfinance adds, saved in the consolidated panel next to PANEL_FIELDS
+ACTION_FIELDS = ['Dividends', 'Stock Splits']
+
+def _utc_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Normalize an index to UTC so frames from different sources can be aligned"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        return index.tz_localize('UTC')
+    return index.tz_convert('UTC')
+
+class MarketPanel:
+    """
+    Aligned market data for many tickers in one contiguous array
+    
+    Values are stored field-major with shape (fields, dates, tickers), so
+    every field is a contiguous dates x tickers block that can be sliced
+    without copying. Days on which a ticker has no bar hold NaN. Derived
+    panels can record what they were built from in ``metadata``, which is
+    saved with the index.
+    """
+    
+    def __init__(self, values: np.ndarray, dates: pd.DatetimeIndex,
+                 tickers: List[str], fields: List[str], metadata: Optional[Dict] = None):
+        if values.shape != (len(fields), len(dates), len(tickers)):
+            raise ValueError(f"Panel values have shape {values.shape}, expected "
+                             f"{(len(fields), len(dates), len(tickers))}")
+        self.values = values
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.fields = list(fields)
+        self.metadata = dict(metadata or {})
+        self._ticker_pos = {ticker: i for i, ticker in enumerate(self.tickers)}
+    
+    @classmethod
+    def from_data_dict(cls, data_dict: Dict[str, pd.DataFrame],
+                       fields: List[str] = PANEL_FIELDS) -> 'MarketPanel':
+        """
+        Build a panel from per-ticker frames
+        
+        Args:
+            data_dict: Dictionary of ticker data
+            fields: Columns to include in the panel
+        
+        Returns:
+            MarketPanel aligned on the union of all dates
+        """
+        frames = {ticker: data for ticker, data in data_dict.items()
+                  if data is not None and not data.empty}
+        tickers = list(frames)
+        
+        indexes = {ticker: _utc_index(data.index) for ticker, data in frames.items()}
+        dates = pd.DatetimeIndex([], tz='UTC')
+        for index in indexes.values():
+            dates = dates.union(index)
+        
+        values = np.full((len(fields), len(dates), len(tickers)), np.nan)
+        
+        for j, ticker in enumerate(tickers):
+            data = frames[ticker]
+            keep = ~indexes[ticker].duplicated(keep='last')
+            positions = dates.get_indexer(indexes[ticker][keep])
+            for f, field in enumerate(fields):
+                if field in data.columns:
+                    values[f, positions, j] = data[field].to_numpy(dtype=np.float64)[keep]
+        
+        # Present dates in the market's own timezone when the frames carry one
+        source_tz = next((data.index.tz for data in frames.values() if data.index.tz is not None), None)
+        if source_tz is not None:
+            dates = dates.tz_convert(source_tz)
+        
+        return cls(values, dates, tickers, fields)
+    
+    def field(self, name: str) -> pd.DataFrame:
+        """Dates x tickers frame for one field, viewing the panel memory"""
+        block = self.values[self.fields.index(name)]
+        return pd.DataFrame(block, index=self.dates, columns=self.tickers, copy=False)
+    
+    def ticker(self, ticker: str) -> pd.DataFrame:
+        """Per-ticker frame (like the stored files) with the days it traded"""
+        j = self._ticker_pos[ticker]
+        data = pd.DataFrame(self.values[:, :, j].T, index=self.dates, columns=self.fields)
+        return data.dropna(how='all')
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._ticker_pos
+    
+    def select(self, tickers: Optional[List[str]] = None,
+               fields: Optional[List[str]] = None) -> 'MarketPanel':
+        """
+        In-memory panel of some tickers and fields, in the given order
+        
+        Unknown tickers are skipped and dates on which none of the selected
+        tickers has a bar are dropped, so the result matches building the
+        panel from just those tickers' frames.
+        """
+        tickers = [ticker for ticker in (tickers if tickers is not None else self.tickers)
+                   if ticker in self._ticker_pos]
+        fields = list(fields) if fields is not None else self.fields
+        columns = [self._ticker_pos[ticker] for ticker in tickers]
+        
+        traded = np.zeros(len(self.dates), dtype=bool)
+        for f in range(len(self.fields)):
+            traded |= ~np.isnan(self.values[f][:, columns]).all(axis=1)
+        rows = np.flatnonzero(traded)
+        values = np.stack([self.values[self.fields.index(field)][rows][:, columns]
+                           for field in fields]) if fields \
+            else np.empty((0, len(rows), len(columns)))
+        return MarketPanel(values, self.dates[rows], tickers, fields)
+    
+    def save(self, data_dir: str = "data", name: str = PANEL_NAME) -> str:
+        """
+        Write the panel as ``{name}.npy`` plus a ``{name}.json`` index
+        
+        Both files are written to temporary names and renamed into place so
+        readers never see a half-written file. The index is replaced last and
+        records the size and modification time of the values file it belongs
+        to, so ``open`` rejects a values file from another save (a crash or
+        a concurrent read between the two renames).
+        
+        Returns:
+            Path of the .npy values file
+        """
+        os.makedirs(data_dir, exist_ok=True)
+        values_path = os.path.join(data_dir, f"{name}.npy")
+        index_path = os.path.join(data_dir, f"{name}.json")
+        
+        index = {
+            'tickers': self.tickers,
+            'fields': self.fields,
+            'dates': _utc_index(self.dates).as_unit('ns').asi8.tolist(),
+            'tz': str(self.dates.tz) if self.dates.tz is not None else None,
+            'shape': list(self.values.shape),
+            'metadata': self.metadata,
+        }
+        
+        with open(values_path + '.tmp', 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.values))
+        os.replace(values_path + '.tmp', values_path)
+        
+        index['values_file'] = _file_stamp(values_path)
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump(index, f)
+        os.replace(index_path + '.tmp', index_path)
+        
+        logger.info(f"Market panel with {len(self.tickers)} tickers and "
+                    f"{len(self.dates)} dates saved to {values_path}")
+        return values_path
+    
+    @classmethod
+    def open(cls, data_dir: str = "data", name: str = PANEL_NAME,
+             mmap_mode: Optional[str] = 'r') -> 'MarketPanel':
+        """
+        Open a saved panel, memory-mapped by default so nothing is read until sliced
+        
+        Args:
+            data_dir: Directory holding the panel files
+            name: Panel base file name
+            mmap_mode: NumPy memory-map mode ('r', 'r+', 'c') or None to load into RAM
+        
+        Raises:
+            ValueError: The values file does not belong to the index (another
+                save replaced it, or one was interrupted)
+        """
+        with open(os.path.join(data_dir, f"{name}.json")) as f:
+            index = json.load(f)
+        
+        values_path = os.path.join(data_dir, f"{name}.npy")
+        before = _file_stamp(values_path)
+        values = np.load(values_path, mmap_mode=mmap_mode)
+        # Panels saved before the stamp was recorded are trusted as they are
+        expected = index.get('values_file', before)
+        if before != expected or _file_stamp(values_path) != expected:
+            raise ValueError(f"Panel values {values_path} do not match the saved index")
+        dates = pd.DatetimeIndex(np.asarray(index['dates'], dtype='datetime64[ns]'), tz='UTC')
+        if index['tz'] is not None:
+            dates = dates.tz_convert(index['tz'])
+        else:
+            dates = dates.tz_localize(None)
+        
+        return cls(values, dates, index['tickers'], index['fields'], index.get('metadata'))
+
+def _file_stamp(path: str) -> Dict[str, int]:
+    """Size and modification time identifying one version of a file"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def panel_exists(data_dir: str = "data", name: str = PANEL_NAME) -> bool:
+    """Check whether a consolidated panel has been written to ``data_dir``"""
+    return (os.path.exists(os.path.join(data_dir, f"{name}.npy")) and
+            os.path.exists(os.path.join(data_dir, f"{name}.json")))
+
+def load_saved_panel(storage: DataStorage, fingerprint: Optional[str] = None,
+                     name: str = PANEL_NAME) -> Optional[MarketPanel]:
+    """
+    Open the consolidated panel of a data directory if it is still current
+    
+    ``BISTDataDownloader.update_panel`` records the storage fingerprint of
+    the files a panel was built from; the panel is only returned while the
+    files are unchanged.
+    
+    Args:
+        storage: Storage backend of the data directory
+        fingerprint: Current storage fingerprint (computed when omitted)
+        name: Panel base file name
+    
+    Returns:
+        Memory-mapped MarketPanel, or None if there is no current panel
+    """
+    if not panel_exists(storage.data_dir, name):
+        return None
+    try:
+        panel = MarketPanel.open(storage.data_dir, name)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable market panel: {str(e)}")
+        return None
+    if panel.metadata.get('fingerprint') != (fingerprint or storage_fingerprint(storage)):
+        return None
+    logger.info(f"Using the saved market panel for {len(panel)} tickers")
+    return panel
@@ -0,0 +1,125 @@
+"""
+BIST Trading System - Market Statistics Engine
+Vectorized per-ticker statistics over aligned close/volume matrices
+"""
+
+import warnings
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from market_panel import MarketPanel
+
+TRADING_DAYS_PER_YEAR = 252
+
+MARKET_STATS_COLUMNS = ['Ticker', 'Records', 'Start_Date', 'End_Date', 'Min_Close',
+                        'Max_Close', 'Last_Close', 'Total_Return', 'Avg_Volume', 'Volatility']
+
+def previous_row_index(present: np.ndarray) -> np.ndarray:
+    """
+    For every (date, ticker) cell, the row index of the ticker's previous bar
+    
+    Args:
+        present: Boolean dates x tickers mask of rows where a ticker has a bar
+    
+    Returns:
+        Integer array of the same shape, -1 where there is no earlier bar
+    """
+    rows = np.arange(present.shape[0])[:, None]
+    last_seen = np.maximum.accumulate(np.where(present, rows, -1), axis=0)
+    previous = np.full(present.shape, -1, dtype=np.int64)
+    previous[1:] = last_seen[:-1]
+    return previous
+
+def aligned_returns(close: np.ndarray, present: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Simple returns of an aligned dates x tickers close matrix
+    
+    Each ticker's return is taken against its own previous bar, skipping
+    dates on which it did not trade. This matches ``pct_change()`` on the
+    per-ticker frame, so late listings and suspensions do not produce
+    spurious NaNs or multi-day returns.
+    
+    Args:
+        close: Dates x tickers close prices, NaN where missing
+        present: Mask of rows where each ticker has a bar (defaults to non-NaN close)
+    
+    Returns:
+        Dates x tickers array of returns, NaN where undefined
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if present is None:
+        present = ~np.isnan(close)
+    
+    previous = previous_row_index(present)
+    cols = np.broadcast_to(np.arange(close.shape[1]), close.shape)
+    previous_close = np.where(previous >= 0, close[np.maximum(previous, 0), cols], np.nan)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = close / previous_close - 1
+    returns[~present] = np.nan
+    return returns
+
+def compute_market_stats(panel: MarketPanel,
+                         periods_per_year: int = TRADING_DAYS_PER_YEAR,
+                         returns: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Compute the market overview statistics for every ticker in one pass
+    
+    Args:
+        panel: Market panel holding at least the 'Close' field
+        periods_per_year: Bars per year used to annualize volatility
+            (252 for daily bars, more for intraday)
+        returns: Precomputed dates x tickers returns aligned with the panel
+            (e.g. from the returns cache); computed from Close when omitted
+    
+    Returns:
+        DataFrame with one row per ticker and the MARKET_STATS_COLUMNS columns
+    """
+    close = np.asarray(panel.values[panel.fields.index('Close')], dtype=np.float64)
+    present = ~np.all(np.isnan(panel.values), axis=0)
+    
+    if 'Volume' in panel.fields:
+        volume = np.asarray(panel.values[panel.fields.index('Volume')], dtype=np.float64)
+    else:
+        volume = np.full(close.shape, np.nan)
+    
+    # Tickers need at least one bar and one close price
+    valid = present.any(axis=0) & ~np.all(np.isnan(close), axis=0)
+    close, volume, present = close[:, valid], volume[:, valid], present[:, valid]
+    if returns is not None:
+        returns = np.asarray(returns, dtype=np.float64)[:, valid]
+    tickers = [ticker for ticker, keep in zip(panel.tickers, valid) if keep]
+    
+    n_rows = close.shape[0]
+    first = np.argmax(present, axis=0)
+    last = n_rows - 1 - np.argmax(present[::-1], axis=0)
+    cols = np.arange(close.shape[1])
+    
+    first_close = close[first, cols]
+    last_close = close[last, cols]
+    if returns is None:
+        returns = aligned_returns(close, present)
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        min_close = np.nanmin(close, axis=0)
+        max_close = np.nanmax(close, axis=0)
+        avg_volume = np.nanmean(volume, axis=0)
+        volatility = np.nanstd(returns, axis=0, ddof=1) * np.sqrt(periods_per_year) * 100
+    
+    avg_volume = np.where(np.all(np.isnan(volume), axis=0), 0, avg_volume)
+    
+    return pd.DataFrame({
+        'Ticker': tickers,
+        'Records': present.sum(axis=0),
+        'Start_Date': panel.dates[first].strftime('%Y-%m-%d'),
+        'End_Date': panel.dates[last].strftime('%Y-%m-%d'),
+        'Min_Close': min_close,
+        'Max_Close': max_close,
+        'Last_Close': last_close,
+        'Total_Return': (last_close / first_close - 1) * 100,
+        'Avg_Volume': avg_volume,
+        'Volatility': volatility,
+    }, columns=MARKET_STATS_COLUMNS)
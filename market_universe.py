@@ -0,0 +1,303 @@
+"""
+BIST Trading System - Market Universe Module
+Compact array-backed container for the whole market that reads like the ticker data dictionary
+"""
+
+import logging
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_storage import DataStorage, iter_market_data
+from market_panel import ACTION_FIELDS, MarketPanel, _utc_index
+
+logger = logging.getLogger(__name__)
+
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close']
+
+class MarketUniverse(Mapping):
+    """
+    Every ticker's bars in a few contiguous arrays sharing one date index
+    
+    Prices are float32 arrays of shape (fields, dates, tickers) holding NaN
+    where a ticker has no bar, volume is one int64 dates x tickers array and
+    ``present`` marks the bars each ticker actually has. float32 keeps about
+    seven significant digits (the precision the Parquet backend stores), so
+    prices and the statistics computed from them match the float64 frames to
+    a relative tolerance of about 1e-6, not exactly. Dividends and splits are
+    kept as sparse events and the per-row ``Ticker`` column is rebuilt on
+    access; other columns are not kept.
+    
+    The universe is a read-only mapping of ticker to DataFrame, so code
+    written for the ``Dict[str, pd.DataFrame]`` returned by
+    ``load_market_data`` keeps working: ``universe[ticker]`` builds that
+    ticker's frame on demand and nothing per ticker is kept alive.
+    Whole-market (cross-sectional) work uses ``field`` and ``to_panel``
+    instead.
+    """
+    
+    __slots__ = ('dates', 'tickers', 'price_fields', 'prices', 'volume', 'present',
+                 'actions', 'ticker_column', '_columns')
+    
+    def __init__(self, dates: pd.DatetimeIndex, tickers: Sequence[str], prices: np.ndarray,
+                 volume: np.ndarray, present: np.ndarray,
+                 price_fields: Sequence[str] = PRICE_FIELDS,
+                 actions: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+                 ticker_column: bool = False):
+        shape = (len(dates), len(tickers))
+        if prices.shape != (len(price_fields),) + shape or volume.shape != shape \
+                or present.shape != shape:
+            raise ValueError(f"Universe arrays do not match {len(price_fields)} fields, "
+                             f"{len(dates)} dates and {len(tickers)} tickers")
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.price_fields = list(price_fields)
+        self.prices = prices
+        self.volume = volume
+        self.present = present
+        # {field: (flat dates x tickers positions, values)} of the non-zero actions
+        self.actions = dict(actions or {})
+        self.ticker_column = ticker_column
+        self._columns = {ticker: j for j, ticker in enumerate(self.tickers)}
+    
+    @classmethod
+    def from_frames(cls, frames: Iterable[Tuple[str, pd.DataFrame]],
+                    price_fields: Sequence[str] = PRICE_FIELDS) -> 'MarketUniverse':
+        """
+        Pack (ticker, frame) pairs into one universe aligned on the union of dates
+        
+        Each frame is reduced to its compact arrays as it arrives, so with a
+        streaming source (``iter_market_data``) the per-ticker DataFrames are
+        never all in memory at once.
+        
+        Args:
+            frames: Iterable of (ticker, DataFrame) pairs
+            price_fields: Price columns to keep (missing ones hold NaN)
+        
+        Returns:
+            MarketUniverse of every non-empty frame
+        """
+        parts = []
+        source_tz = None
+        unit = None
+        ticker_column = False
+        
+        for ticker, data in frames:
+            if data is None or data.empty:
+                continue
+            if source_tz is None:
+                source_tz = data.index.tz
+            index = _utc_index(data.index)
+            unit = unit or index.unit
+            keep = ~index.duplicated(keep='last')
+            prices = np.full((len(price_fields), int(keep.sum())), np.nan, dtype=np.float32)
+            for f, field in enumerate(price_fields):
+                if field in data.columns:
+                    prices[f] = data[field].to_numpy(dtype=np.float32)[keep]
+            volume = (data['Volume'].fillna(0).to_numpy(dtype=np.int64)[keep]
+                      if 'Volume' in data.columns else np.zeros(len(prices[0]), dtype=np.int64))
+            actions = {}
+            for field in ACTION_FIELDS:
+                if field in data.columns:
+                    values = data[field].fillna(0).to_numpy(dtype=np.float64)[keep]
+                    rows = np.flatnonzero(values)
+                    actions[field] = (rows, values[rows])
+            ticker_column = ticker_column or 'Ticker' in data.columns
+            parts.append((ticker, index[keep].as_unit('ns').asi8, prices, volume, actions))
+        
+        stamps = np.unique(np.concatenate([part[1] for part in parts])) if parts \
+            else np.empty(0, dtype=np.int64)
+        dates = pd.DatetimeIndex(stamps.view('datetime64[ns]')).tz_localize('UTC')
+        tickers = [part[0] for part in parts]
+        
+        prices = np.full((len(price_fields), len(dates), len(tickers)), np.nan, dtype=np.float32)
+        volume = np.zeros((len(dates), len(tickers)), dtype=np.int64)
+        present = np.zeros((len(dates), len(tickers)), dtype=bool)
+        events = {}
+        
+        for j in range(len(parts)):
+            _, ticker_stamps, ticker_prices, ticker_volume, ticker_actions = parts[j]
+            parts[j] = None
+            rows = np.searchsorted(stamps, ticker_stamps)
+            present[rows, j] = True
+            prices[:, rows, j] = ticker_prices
+            volume[rows, j] = ticker_volume
+            for field, (action_rows, values) in ticker_actions.items():
+                events.setdefault(field, []).append((rows[action_rows] * len(tickers) + j, values))
+        
+        actions = {}
+        for field, chunks in events.items():
+            positions = np.concatenate([chunk[0] for chunk in chunks])
+            order = np.argsort(positions, kind='stable')
+            actions[field] = (positions[order], np.concatenate([chunk[1] for chunk in chunks])[order])
+        
+        if unit is not None:
+            dates = dates.as_unit(unit)
+        if source_tz is not None:
+            dates = dates.tz_convert(source_tz)
+        
+        return cls(dates, tickers, prices, volume, present, price_fields, actions, ticker_column)
+    
+    @classmethod
+    def from_data_dict(cls, data_dict: Dict[str, pd.DataFrame],
+                       price_fields: Sequence[str] = PRICE_FIELDS) -> 'MarketUniverse':
+        """
+        Pack per-ticker frames into one universe aligned on the union of dates
+        
+        Args:
+            data_dict: Dictionary of ticker data
+            price_fields: Price columns to keep (missing ones hold NaN)
+        
+        Returns:
+            MarketUniverse of every non-empty frame
+        """
+        return cls.from_frames(data_dict.items(), price_fields)
+    
+    @classmethod
+    def from_panel(cls, panel: MarketPanel) -> 'MarketUniverse':
+        """Compact copy of a MarketPanel (bars are present where any field is set)"""
+        price_fields = [field for field in panel.fields if field not in ['Volume'] + ACTION_FIELDS]
+        values = np.asarray(panel.values)
+        prices = np.stack([values[panel.fields.index(field)] for field in price_fields]) \
+            .astype(np.float32) if price_fields else np.empty((0,) + values.shape[1:], np.float32)
+        present = ~np.all(np.isnan(values), axis=0)
+        if 'Volume' in panel.fields:
+            volume = np.nan_to_num(values[panel.fields.index('Volume')]).astype(np.int64)
+        else:
+            volume = np.zeros(values.shape[1:], dtype=np.int64)
+        actions = {}
+        for field in ACTION_FIELDS:
+            if field in panel.fields:
+                flat = np.nan_to_num(values[panel.fields.index(field)]).ravel()
+                positions = np.flatnonzero(flat)
+                actions[field] = (positions, flat[positions])
+        return cls(panel.dates, panel.tickers, prices, volume, present, price_fields, actions)
+    
+    def __getitem__(self, ticker: str) -> pd.DataFrame:
+        """The ticker's bars as a frame like the stored files (prices, Volume, actions, Ticker)"""
+        j = self._columns[ticker]
+        rows = np.flatnonzero(self.present[:, j])
+        columns = {field: self.prices[f, rows, j] for f, field in enumerate(self.price_fields)}
+        columns['Volume'] = self.volume[rows, j]
+        for field in self.actions:
+            columns[field] = self._action_column(field, rows, j)
+        data = pd.DataFrame(columns, index=self.dates[rows])
+        if self.ticker_column:
+            data['Ticker'] = ticker
+        data.index.name = 'Date'
+        return data
+    
+    def _action_column(self, field: str, rows: np.ndarray, j: int) -> np.ndarray:
+        """One ticker's values of an action field on some of its dates (zero without an event)"""
+        positions, values = self.actions[field]
+        mine = positions % len(self.tickers) == j
+        column = np.zeros(len(rows))
+        # Events only exist on dates the ticker has a bar
+        column[np.searchsorted(rows, positions[mine] // len(self.tickers))] = values[mine]
+        return column
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tickers)
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+    
+    def __contains__(self, ticker) -> bool:
+        return ticker in self._columns
+    
+    def __repr__(self) -> str:
+        return (f"MarketUniverse({len(self.tickers)} tickers x {len(self.dates)} dates, "
+                f"{self.nbytes / 1024 ** 2:.1f} MB)")
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays"""
+        return (self.prices.nbytes + self.volume.nbytes + self.present.nbytes
+                + self.dates.asi8.nbytes
+                + sum(positions.nbytes + values.nbytes for positions, values in self.actions.values()))
+    
+    def field(self, name: str) -> pd.DataFrame:
+        """
+        Dates x tickers frame of one field
+        
+        Prices view the float32 array; volume and the action fields are
+        returned as float64 with NaN where a ticker has no bar, like the
+        MarketPanel fields.
+        """
+        if name == 'Volume':
+            values = np.where(self.present, self.volume, np.nan)
+        elif name in self.actions:
+            positions, events = self.actions[name]
+            values = np.where(self.present, 0.0, np.nan)
+            values.ravel()[positions] = events
+        else:
+            values = self.prices[self.price_fields.index(name)]
+        return pd.DataFrame(values, index=self.dates, columns=self.tickers, copy=False)
+    
+    def cross_section(self, name: str, date) -> pd.Series:
+        """One field across every ticker on one date (NaN for tickers without a bar)"""
+        row = self.dates.get_loc(pd.Timestamp(date))
+        return self.field(name).iloc[row]
+    
+    def subset(self, tickers: Sequence[str]) -> 'MarketUniverse':
+        """
+        Universe of some tickers (unknown ones are skipped), in the given order
+        
+        Dates on which none of the selected tickers traded are dropped.
+        """
+        tickers = [ticker for ticker in tickers if ticker in self._columns]
+        columns = [self._columns[ticker] for ticker in tickers]
+        present = self.present[:, columns]
+        rows = np.flatnonzero(present.any(axis=1))
+        
+        # Renumber the action events into the subset's dates x tickers layout
+        new_column = np.full(len(self.tickers), -1)
+        new_column[columns] = np.arange(len(columns))
+        actions = {}
+        for field, (positions, values) in self.actions.items():
+            old_rows, old_columns = np.divmod(positions, len(self.tickers))
+            keep = new_column[old_columns] >= 0
+            subset_positions = (np.searchsorted(rows, old_rows[keep]) * len(columns)
+                                + new_column[old_columns[keep]])
+            order = np.argsort(subset_positions, kind='stable')
+            actions[field] = (subset_positions[order], values[keep][order])
+        
+        return MarketUniverse(self.dates[rows], tickers, self.prices[:, rows][:, :, columns],
+                              self.volume[rows][:, columns], present[rows], self.price_fields,
+                              actions, self.ticker_column)
+    
+    def to_panel(self, fields: Optional[List[str]] = None) -> MarketPanel:
+        """
+        Float64 MarketPanel of some fields for the vectorized analytics
+        
+        Args:
+            fields: Fields to include (defaults to the prices and Volume)
+        """
+        fields = fields or self.price_fields + ['Volume']
+        values = np.stack([self.field(field).to_numpy(dtype=np.float64) for field in fields])
+        return MarketPanel(values, self.dates, self.tickers, fields)
+
+def select_tickers(data_dict: Mapping, tickers: Sequence[str]) -> Mapping:
+    """Some tickers of a data dictionary or universe, keeping a universe compact"""
+    if isinstance(data_dict, MarketUniverse):
+        return data_dict.subset(tickers)
+    return {ticker: data_dict[ticker] for ticker in tickers if ticker in data_dict}
+
+def load_universe(storage: DataStorage, required_columns: Sequence[str] = ('Close', 'Volume'),
+                  exclude_prefixes: Tuple[str, ...] = (),
+                  max_workers: int = 8) -> Tuple[MarketUniverse, Dict]:
+    """
+    Read every data file straight into a MarketUniverse
+    
+    Files are packed as they are read, so peak memory is the universe plus
+    a few files in flight rather than a DataFrame for every ticker.
+    
+    Returns:
+        Tuple of (universe, load report as returned by ``load_market_data``)
+    """
+    report = {}
+    universe = MarketUniverse.from_frames(iter_market_data(storage, max_workers, required_columns,
+                                                           exclude_prefixes, report))
+    return universe, report
@@ -0,0 +1,189 @@
+"""
+BIST Trading System - Metadata Service Module
+Ticker name, sector, industry, market cap and currency, fetched concurrently and cached with a TTL
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from config import API_SETTINGS, METADATA_SETTINGS
+from data_downloader import TokenBucket, call_with_retry, yfinance_info
+
+logger = logging.getLogger(__name__)
+
+METADATA_COLUMNS = ['Ticker', 'Name', 'Sector', 'Industry', 'Market_Cap', 'Currency', 'Fetched']
+
+# get_ticker_info keys of each table column
+INFO_KEYS = {'Name': 'name', 'Sector': 'sector', 'Industry': 'industry',
+             'Market_Cap': 'market_cap', 'Currency': 'currency'}
+
+class MetadataService:
+    """
+    Ticker metadata table persisted as CSV and served from memory
+    
+    The table is read once; afterwards every lookup is a dictionary access.
+    Rows older than the TTL (and tickers never seen) are fetched again, many
+    at a time on a thread pool throttled by a shared token bucket, and the
+    table is rewritten once per batch. Failed lookups are not stored, so a
+    stale row keeps being served until a fetch succeeds.
+    """
+    
+    def __init__(self, path: str = METADATA_SETTINGS["table_path"],
+                 ttl_days: float = METADATA_SETTINGS["ttl_days"],
+                 fetcher: Optional[Callable[[str], Dict]] = None,
+                 max_workers: int = METADATA_SETTINGS["max_workers"],
+                 requests_per_second: float = METADATA_SETTINGS["requests_per_second"],
+                 retry_attempts: int = API_SETTINGS["retry_attempts"]):
+        """
+        Args:
+            path: CSV file holding the table
+            ttl_days: Age in days after which a row is fetched again
+            fetcher: Callable ``ticker -> dict`` in the ``get_ticker_info``
+                format (defaults to Yahoo Finance)
+            max_workers: Concurrent fetches
+            requests_per_second: Shared rate limit of the fetches
+            retry_attempts: Attempts per ticker on transient failures
+        """
+        self.path = path
+        self.ttl = timedelta(days=ttl_days)
+        self.fetcher = fetcher or yfinance_info
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self.retry_attempts = retry_attempts
+        self._rows = None
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Rows by ticker, reading the table file on first use"""
+        if self._rows is None:
+            rows = {}
+            if os.path.exists(self.path):
+                table = pd.read_csv(self.path, dtype={'Ticker': 'str'})
+                table = table.astype(object).where(table.notna(), None)
+                rows = {row['Ticker']: row for row in table.to_dict('records')}
+            self._rows = rows
+        return self._rows
+    
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        table = pd.DataFrame(list(self._rows.values()), columns=METADATA_COLUMNS)
+        table.to_csv(self.path + '.tmp', index=False)
+        os.replace(self.path + '.tmp', self.path)
+    
+    def is_fresh(self, ticker: str) -> bool:
+        """Whether the cached row of a ticker exists and is younger than the TTL"""
+        row = self._load().get(ticker)
+        return row is not None and datetime.now() - datetime.fromisoformat(row['Fetched']) < self.ttl
+    
+    def _fetch_one(self, ticker: str, limiter: TokenBucket) -> Dict:
+        info = call_with_retry(self.fetcher, ticker, attempts=self.retry_attempts, limiter=limiter)
+        if not info:
+            raise ValueError("no info returned")
+        row = {'Ticker': ticker, 'Fetched': datetime.now().isoformat(timespec='seconds')}
+        for column, key in INFO_KEYS.items():
+            value = info.get(key)
+            row[column] = None if value in ('N/A', '') else value
+        return row
+    
+    def refresh(self, tickers: Iterable[str]) -> List[str]:
+        """
+        Fetch tickers concurrently and store the results
+        
+        Args:
+            tickers: Tickers to fetch regardless of their age
+        
+        Returns:
+            Tickers that could not be fetched
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return []
+        
+        limiter = TokenBucket(self.requests_per_second)
+        fetched, failed = {}, []
+        logger.info(f"Fetching metadata for {len(tickers)} tickers with {self.max_workers} workers")
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(tickers)))) as executor:
+            futures = {executor.submit(self._fetch_one, ticker, limiter): ticker for ticker in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    fetched[ticker] = future.result()
+                except Exception as e:
+                    logger.warning(f"Error getting info for {ticker}: {str(e)}")
+                    failed.append(ticker)
+        
+        with self._lock:
+            self._load().update(fetched)
+            if fetched:
+                self._save()
+        
+        if failed:
+            logger.warning(f"Metadata unavailable for {len(failed)} tickers")
+        return failed
+    
+    def get_many(self, tickers: Iterable[str], refresh: bool = False) -> pd.DataFrame:
+        """
+        Metadata of many tickers, fetching only missing and expired rows
+        
+        Args:
+            tickers: Tickers to look up
+            refresh: Fetch every ticker regardless of its age
+        
+        Returns:
+            DataFrame indexed by Ticker with Name, Sector, Industry, Market_Cap,
+            Currency and Fetched; all-NaN rows for tickers never fetched
+        """
+        tickers = list(dict.fromkeys(tickers))
+        stale = tickers if refresh else [ticker for ticker in tickers if not self.is_fresh(ticker)]
+        self.refresh(stale)
+        
+        rows = self._load()
+        table = pd.DataFrame([rows[ticker] for ticker in tickers if ticker in rows],
+                             columns=METADATA_COLUMNS)
+        table = table.set_index('Ticker').reindex(tickers)
+        table.index.name = 'Ticker'
+        table['Market_Cap'] = pd.to_numeric(table['Market_Cap'], errors='coerce')
+        return table
+    
+    def get(self, ticker: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        Metadata of one ticker in the ``get_ticker_info`` format
+        
+        Returns:
+            Dictionary with symbol, name, sector, industry, market_cap and
+            currency ('N/A' when unknown) or None if the ticker was never fetched
+        """
+        if refresh or not self.is_fresh(ticker):
+            self.refresh([ticker])
+        row = self._load().get(ticker)
+        if row is None:
+            return None
+        info = {'symbol': ticker}
+        for column, key in INFO_KEYS.items():
+            info[key] = 'N/A' if row[column] is None else row[column]
+        return info
+    
+    def invalidate(self, tickers: Optional[Iterable[str]] = None) -> None:
+        """Drop cached rows (all of them by default) so they are fetched again"""
+        with self._lock:
+            rows = self._load()
+            for ticker in (list(rows) if tickers is None else tickers):
+                rows.pop(ticker, None)
+            self._save()
+
+_services = {}
+_services_lock = threading.Lock()
+
+def get_metadata_service(path: str = METADATA_SETTINGS["table_path"]) -> MetadataService:
+    """Metadata service shared by every caller in the process, one per table file"""
+    with _services_lock:
+        if path not in _services:
+            _services[path] = MetadataService(path)
+        return _services[path]
@@ -0,0 +1,122 @@
+"""
+BIST Trading System - Render Pipeline Module
+Renders independent chart jobs on a process pool with one matplotlib state per worker
+"""
+
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Visualizer owned by the current worker process, created by the pool initializer
+_worker_visualizer = None
+
+# File systems stamp modification times with a coarse clock, so allow this much slack (seconds)
+MTIME_SLACK = 1.0
+
+def render_job_spec(name: str, method: str, save_path: str, *args, **kwargs) -> Dict:
+    """
+    Describe one chart to render
+    
+    Args:
+        name: Job name used in logs and results
+        method: BISTDataVisualizer method that draws the chart
+        save_path: Output file of the chart
+        *args, **kwargs: Arguments passed to the method before ``save_path``
+    
+    Returns:
+        Job dictionary for ``run_render_jobs``
+    """
+    return {'name': name, 'method': method, 'save_path': save_path,
+            'args': args, 'kwargs': kwargs}
+
+def _init_worker(output_dir: str) -> None:
+    """Give each worker process its own non-interactive matplotlib state and visualizer"""
+    global _worker_visualizer
+    import matplotlib
+    matplotlib.use('Agg')
+    from data_visualizer import BISTDataVisualizer
+    _worker_visualizer = BISTDataVisualizer(output_dir)
+
+def _written_since(path: str, started: float) -> bool:
+    """Whether a file exists and was written after ``started`` (a ``time.time()`` value)"""
+    return os.path.exists(path) and os.path.getmtime(path) >= started - MTIME_SLACK
+
+def _render(job: Dict) -> Dict:
+    """Render one job in the current process and time it"""
+    start = time.perf_counter()
+    started = time.time()
+    kwargs = dict(job['kwargs'], save_path=job['save_path'])
+    returned = getattr(_worker_visualizer, job['method'])(*job['args'], **kwargs)
+    
+    # Multi-page charts return the files they wrote
+    paths = returned if isinstance(returned, list) and returned else [job['save_path']]
+    
+    # Visualizer methods log their own errors; a missing file, or one left over
+    # from an earlier run, means the job failed
+    success = all(_written_since(path, started) for path in paths)
+    return {
+        'name': job['name'],
+        'path': paths[0] if success else None,
+        'paths': paths if success else [],
+        'elapsed': time.perf_counter() - start,
+        'success': success,
+        'pid': os.getpid(),
+    }
+
+def run_render_jobs(jobs: List[Dict], output_dir: str = "output",
+                    max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Render chart jobs in parallel
+    
+    Jobs are independent, so they are sent to a process pool whose workers
+    each set up matplotlib once. With a single worker (or a single job) they
+    run in the current process.
+    
+    Args:
+        jobs: Jobs created with ``render_job_spec``
+        output_dir: Output directory handed to the worker visualizers
+        max_workers: Number of worker processes (defaults to the CPU count)
+    
+    Returns:
+        One result per job, in job order, with the output path (None if the
+        job failed), all written pages, elapsed seconds and worker pid
+    """
+    names = [job['name'] for job in jobs]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Render job names must be unique: {', '.join(duplicated)}")
+    
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs)) if jobs else 1
+    start = time.perf_counter()
+    
+    if max_workers <= 1:
+        _init_worker(output_dir)
+        results = [_render(job) for job in jobs]
+    else:
+        results = [None] * len(jobs)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(output_dir,)) as executor:
+            futures = {executor.submit(_render, job): i for i, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.error(f"Error rendering {jobs[i]['name']}: {str(e)}")
+                    results[i] = {'name': jobs[i]['name'], 'path': None, 'paths': [],
+                                  'elapsed': None, 'success': False, 'pid': None}
+    
+    logger.info(format_render_report(results, time.perf_counter() - start, max_workers))
+    return results
+
+def format_render_report(results: List[Dict], elapsed: float, workers: int) -> str:
+    """One-line summary of a render run"""
+    rendered = sum(result['success'] for result in results)
+    timings = ", ".join(f"{result['name']} {result['elapsed']:.1f}s"
+                        for result in results if result['elapsed'] is not None)
+    return (f"Rendered {rendered}/{len(results)} charts in {elapsed:.1f}s "
+            f"with {workers} workers ({timings})")
@@ -0,0 +1,225 @@
+"""
+BIST Trading System - Returns Cache Module
+Aligned returns and normalized prices for the whole universe, persisted next to the data files
+"""
+
+import os
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_storage import DataStorage, detect_storage, storage_fingerprint, ticker_from_filename
+from market_panel import MarketPanel, load_saved_panel
+from market_stats import aligned_returns
+
+logger = logging.getLogger(__name__)
+
+RETURNS_CACHE_NAME = "returns_cache"
+
+def normalized_prices(close: np.ndarray, base: float = 100.0) -> np.ndarray:
+    """
+    Rebase every column of a dates x tickers close matrix to ``base`` at its first price
+    
+    Args:
+        close: Dates x tickers close prices, NaN where missing
+        base: Value of each ticker on its first day
+    
+    Returns:
+        Array of the same shape with the rebased prices
+    """
+    close = np.asarray(close, dtype=np.float64)
+    has_price = ~np.isnan(close)
+    first = np.argmax(has_price, axis=0)
+    first_close = close[first, np.arange(close.shape[1])]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return close / first_close * base
+
+class ReturnsCache:
+    """
+    Simple returns, log returns and base-100 prices aligned on the union of dates
+    
+    Each matrix is a dates x tickers DataFrame holding NaN on days a ticker
+    did not trade, so any subset of tickers can be selected without
+    recomputing anything. ``fingerprint`` identifies the data files the
+    cache was built from.
+    """
+    
+    def __init__(self, close: pd.DataFrame, simple: pd.DataFrame, log: pd.DataFrame,
+                 normalized: pd.DataFrame, fingerprint: Optional[str] = None):
+        self.close = close
+        self.simple = simple
+        self.log = log
+        self.normalized = normalized
+        self.fingerprint = fingerprint
+    
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self.close.index
+    
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.close.columns)
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.close.columns
+    
+    @classmethod
+    def from_data_dict(cls, data_dict: Dict[str, pd.DataFrame],
+                       fingerprint: Optional[str] = None) -> 'ReturnsCache':
+        """
+        Compute the cached matrices from per-ticker frames
+        
+        Args:
+            data_dict: Dictionary of ticker data
+            fingerprint: Fingerprint of the files the data was loaded from
+        
+        Returns:
+            ReturnsCache covering every ticker with a Close column
+        """
+        valid_data = {ticker: data for ticker, data in data_dict.items()
+                      if data is not None and not data.empty and 'Close' in data.columns}
+        return cls.from_panel(MarketPanel.from_data_dict(valid_data, fields=['Close', 'Volume']),
+                              fingerprint)
+    
+    @classmethod
+    def from_panel(cls, panel: MarketPanel, fingerprint: Optional[str] = None) -> 'ReturnsCache':
+        """
+        Compute the cached matrices from a market panel with a Close field
+        
+        Args:
+            panel: Market panel (e.g. the saved consolidated panel)
+            fingerprint: Fingerprint of the files the panel was built from
+        
+        Returns:
+            ReturnsCache covering every ticker of the panel
+        """
+        values = np.asarray(panel.values, dtype=np.float64)
+        close = values[panel.fields.index('Close')]
+        
+        # A ticker has a bar on every row of its frame, even where Close is missing
+        present = ~np.all(np.isnan(values), axis=0)
+        
+        simple = aligned_returns(close, present)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log = np.log1p(simple)
+        normalized = normalized_prices(close)
+        
+        def frame(values: np.ndarray) -> pd.DataFrame:
+            return pd.DataFrame(values, index=panel.dates, columns=panel.tickers)
+        
+        return cls(frame(close), frame(simple), frame(log), frame(normalized), fingerprint)
+    
+    def save(self, data_dir: str = "data", name: str = RETURNS_CACHE_NAME) -> str:
+        """
+        Write the cache as ``{name}.npz``, renamed into place once complete
+        
+        Returns:
+            Path of the cache file
+        """
+        os.makedirs(data_dir, exist_ok=True)
+        path = os.path.join(data_dir, f"{name}.npz")
+        dates = self.dates
+        utc_dates = dates.tz_convert('UTC') if dates.tz is not None else dates
+        
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f,
+                     close=self.close.to_numpy(),
+                     simple=self.simple.to_numpy(),
+                     log=self.log.to_numpy(),
+                     normalized=self.normalized.to_numpy(),
+                     dates=utc_dates.as_unit('ns').asi8,
+                     tz=np.array(str(dates.tz) if dates.tz is not None else ''),
+                     tickers=np.array(self.tickers, dtype=str),
+                     fingerprint=np.array(self.fingerprint or ''))
+        os.replace(path + '.tmp', path)
+        
+        logger.info(f"Returns cache for {len(self.tickers)} tickers saved to {path}")
+        return path
+    
+    @classmethod
+    def open(cls, data_dir: str = "data", name: str = RETURNS_CACHE_NAME) -> 'ReturnsCache':
+        """Read a cache written by ``save``"""
+        with np.load(os.path.join(data_dir, f"{name}.npz")) as cached:
+            tz = str(cached['tz'])
+            dates = pd.DatetimeIndex(cached['dates'].astype('datetime64[ns]'))
+            if tz:
+                dates = dates.tz_localize('UTC').tz_convert(tz)
+            tickers = cached['tickers'].tolist()
+            
+            def frame(key: str) -> pd.DataFrame:
+                return pd.DataFrame(cached[key], index=dates, columns=tickers)
+            
+            return cls(frame('close'), frame('simple'), frame('log'), frame('normalized'),
+                       str(cached['fingerprint']) or None)
+
+def invalidate_returns_cache(data_dir: str = "data", name: str = RETURNS_CACHE_NAME) -> None:
+    """Remove a persisted returns cache so the next analysis run rebuilds it"""
+    path = os.path.join(data_dir, f"{name}.npz")
+    if os.path.exists(path):
+        os.remove(path)
+        logger.info(f"Returns cache {path} invalidated")
+
+def cache_fingerprint(storage: DataStorage, tickers) -> str:
+    """
+    Fingerprint of a cache built from some tickers of a storage backend
+    
+    Combines the storage fingerprint with the sorted ticker set, so a cache
+    built from a subset of the files is never served for another subset.
+    """
+    tickers_digest = hashlib.sha1(";".join(sorted(tickers)).encode()).hexdigest()
+    return f"{storage_fingerprint(storage)}:{tickers_digest}"
+
+def load_returns_cache(data_dict: Optional[Dict[str, pd.DataFrame]] = None,
+                       storage: Optional[DataStorage] = None,
+                       data_dir: str = "data") -> Optional[ReturnsCache]:
+    """
+    Return the persisted returns cache, rebuilding it when the data files changed
+    
+    The cache is only reused when it was built from the same files and the
+    same tickers as requested: those of ``data_dict``, or every stored file
+    when it is omitted. A rebuild for every stored file starts from the
+    saved market panel when that is current and covers the same tickers.
+    
+    Args:
+        data_dict: Already loaded ticker data the cache must cover (defaults
+            to loading every stored file)
+        storage: Storage backend holding the data files (detected from
+            ``data_dir`` when omitted)
+        data_dir: Data directory holding the files and the cache
+    
+    Returns:
+        ReturnsCache or None if failed
+    """
+    try:
+        storage = storage or detect_storage(data_dir)
+        if data_dict is not None:
+            tickers = list(data_dict)
+        else:
+            tickers = [ticker_from_filename(file) for file in storage.list_files()]
+        fingerprint = cache_fingerprint(storage, tickers)
+        
+        if os.path.exists(os.path.join(storage.data_dir, f"{RETURNS_CACHE_NAME}.npz")):
+            try:
+                cache = ReturnsCache.open(storage.data_dir)
+                if cache.fingerprint == fingerprint:
+                    logger.info(f"Using cached returns for {len(cache.tickers)} tickers")
+                    return cache
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable returns cache: {str(e)}")
+        
+        panel = load_saved_panel(storage) if data_dict is None else None
+        if panel is not None and sorted(panel.tickers) == sorted(tickers):
+            cache = ReturnsCache.from_panel(panel.select(fields=['Close', 'Volume']), fingerprint)
+        else:
+            if data_dict is None:
+                data_dict = storage.load_all()
+            cache = ReturnsCache.from_data_dict(data_dict, fingerprint)
+        cache.save(storage.data_dir)
+        return cache
+    
+    except Exception as e:
+        logger.error(f"Error loading returns cache: {str(e)}")
+        return None
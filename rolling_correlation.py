@@ -0,0 +1,263 @@
+"""
+BIST Trading System - Rolling Correlation Module
+Rolling-window correlation and covariance of ticker pairs, updated incrementally as the window slides
+"""
+
+import os
+import json
+import logging
+import warnings
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import ANALYSIS_SETTINGS
+from correlation import correlation_from_sums
+
+logger = logging.getLogger(__name__)
+
+ROLLING_NAME = "rolling_correlation"
+
+def all_pairs(n_tickers: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Column indexes (i, j) of every ticker pair with i < j"""
+    return np.triu_indices(n_tickers, k=1)
+
+def rolling_pair_moments(returns: np.ndarray, left: np.ndarray, right: np.ndarray,
+                         window: int, min_periods: Optional[int] = None,
+                         corr_out: Optional[np.ndarray] = None,
+                         cov_out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling correlation and covariance of column pairs of a dates x tickers array
+    
+    The pairwise counts, sums and cross products are kept as running totals:
+    each new date is added and the date leaving the window is subtracted,
+    so every step costs O(pairs) regardless of the window length. Like
+    pandas' rolling ``corr``/``cov``, a pair only uses the days on which
+    both tickers have a value.
+    
+    Args:
+        returns: Dates x tickers returns, NaN where missing
+        left: Column index of the first ticker of every pair
+        right: Column index of the second ticker of every pair
+        window: Window length in rows
+        min_periods: Minimum common observations in the window (defaults to ``window``)
+        corr_out: Dates x pairs array receiving the correlations (e.g. a memmap)
+        cov_out: Dates x pairs array receiving the sample covariances
+    
+    Returns:
+        Tuple of (correlation, covariance) dates x pairs arrays
+    """
+    min_periods = window if min_periods is None else min_periods
+    n_dates, n_pairs = returns.shape[0], len(left)
+    if corr_out is None:
+        corr_out = np.empty((n_dates, n_pairs), dtype=np.float32)
+    if cov_out is None:
+        cov_out = np.empty((n_dates, n_pairs), dtype=np.float32)
+    
+    # Correlation and covariance are shift invariant; centering keeps the running sums accurate
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        center = np.nan_to_num(np.nanmean(returns, axis=0))
+    
+    def contribution(row: int):
+        values = np.asarray(returns[row], dtype=np.float64) - center
+        x, y = values[left], values[right]
+        both = ~(np.isnan(x) | np.isnan(y))
+        x, y = np.where(both, x, 0.0), np.where(both, y, 0.0)
+        return both.astype(np.float64), x, y, x * x, y * y, x * y
+    
+    sums = [np.zeros(n_pairs) for _ in range(6)]
+    
+    for row in range(n_dates):
+        for total, value in zip(sums, contribution(row)):
+            total += value
+        if row >= window:
+            for total, value in zip(sums, contribution(row - window)):
+                total -= value
+        
+        n, sum_x, sum_y, sum_xx, sum_yy, sum_xy = sums
+        # Running totals of an emptied window can drift a few ulps from zero
+        n = np.round(n)
+        corr_out[row] = correlation_from_sums(n, sum_x, sum_y, sum_xx, sum_yy, sum_xy,
+                                              min_periods=min_periods)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (sum_xy - sum_x * sum_y / n) / (n - 1)
+        cov[n < max(min_periods, 2)] = np.nan
+        cov_out[row] = cov
+    
+    return corr_out, cov_out
+
+class RollingCorrelation:
+    """
+    Rolling correlation/covariance cube for one window length
+    
+    ``corr`` and ``cov`` are float32 dates x pairs arrays (memory-mapped when
+    opened from disk). With every pair of the universe the pairs are the
+    upper triangle of the ticker x ticker matrix, so ``at`` can rebuild
+    the full matrix for any date.
+    """
+    
+    def __init__(self, corr: np.ndarray, cov: np.ndarray, dates: pd.DatetimeIndex,
+                 tickers: List[str], left: np.ndarray, right: np.ndarray, window: int):
+        self.corr = corr
+        self.cov = cov
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        self.window = window
+        self._pair_pos = {(self.tickers[i], self.tickers[j]): k
+                          for k, (i, j) in enumerate(zip(self.left, self.right))}
+    
+    @property
+    def pairs(self) -> List[Tuple[str, str]]:
+        return list(self._pair_pos)
+    
+    @classmethod
+    def compute(cls, returns: pd.DataFrame, window: int,
+                pairs: Optional[Sequence[Tuple[str, str]]] = None,
+                data_dir: str = "output", name: str = ROLLING_NAME,
+                min_periods: Optional[int] = None) -> 'RollingCorrelation':
+        """
+        Compute and store the rolling correlation/covariance cube
+        
+        Args:
+            returns: Aligned dates x tickers returns (e.g. ``ReturnsCache.simple``)
+            window: Window length in rows (trading days for daily data)
+            pairs: Ticker pairs to track (every pair of the universe when omitted)
+            data_dir: Directory for the result files
+            name: Result base file name; the window length is appended
+            min_periods: Minimum common observations in the window (defaults to ``window``)
+        
+        Returns:
+            RollingCorrelation backed by the memory-mapped result files
+        """
+        tickers = [str(ticker) for ticker in returns.columns]
+        if pairs is None:
+            left, right = all_pairs(len(tickers))
+        else:
+            position = {ticker: i for i, ticker in enumerate(tickers)}
+            left = np.array([position[a] for a, _ in pairs], dtype=np.int64)
+            right = np.array([position[b] for _, b in pairs], dtype=np.int64)
+        
+        os.makedirs(data_dir, exist_ok=True)
+        base = os.path.join(data_dir, f"{name}_{window}")
+        shape = (len(returns), len(left))
+        corr = np.lib.format.open_memmap(f"{base}_corr.npy.tmp", mode='w+', dtype=np.float32, shape=shape)
+        cov = np.lib.format.open_memmap(f"{base}_cov.npy.tmp", mode='w+', dtype=np.float32, shape=shape)
+        
+        rolling_pair_moments(returns.to_numpy(), left, right, window, min_periods,
+                             corr_out=corr, cov_out=cov)
+        corr.flush()
+        cov.flush()
+        del corr, cov
+        
+        dates = returns.index
+        utc_dates = dates.tz_convert('UTC') if dates.tz is not None else dates
+        index = {
+            'tickers': tickers,
+            'left': left.tolist(),
+            'right': right.tolist(),
+            'window': window,
+            'dates': utc_dates.as_unit('ns').asi8.tolist(),
+            'tz': str(dates.tz) if dates.tz is not None else None,
+        }
+        with open(f"{base}.json.tmp", 'w') as f:
+            json.dump(index, f)
+        
+        for suffix in ('_corr.npy', '_cov.npy', '.json'):
+            os.replace(f"{base}{suffix}.tmp", f"{base}{suffix}")
+        
+        logger.info(f"Rolling {window}-day correlation of {len(left)} pairs saved to {base}_corr.npy")
+        return cls.open(window, data_dir, name)
+    
+    @classmethod
+    def open(cls, window: int, data_dir: str = "output",
+             name: str = ROLLING_NAME) -> 'RollingCorrelation':
+        """Open a stored cube memory-mapped"""
+        base = os.path.join(data_dir, f"{name}_{window}")
+        with open(f"{base}.json") as f:
+            index = json.load(f)
+        
+        dates = pd.DatetimeIndex(np.asarray(index['dates'], dtype='datetime64[ns]'))
+        if index['tz'] is not None:
+            dates = dates.tz_localize('UTC').tz_convert(index['tz'])
+        
+        return cls(np.load(f"{base}_corr.npy", mmap_mode='r'),
+                   np.load(f"{base}_cov.npy", mmap_mode='r'),
+                   dates, index['tickers'], index['left'], index['right'], index['window'])
+    
+    def _row(self, date) -> int:
+        """Row of the last date on or before ``date``"""
+        date = pd.Timestamp(date)
+        if date.tz is None and self.dates.tz is not None:
+            date = date.tz_localize(self.dates.tz)
+        row = self.dates.searchsorted(date, side='right') - 1
+        if row < 0:
+            raise KeyError(f"No rolling data on or before {date}")
+        return int(row)
+    
+    def _values(self, kind: str) -> np.ndarray:
+        if kind not in ('corr', 'cov'):
+            raise ValueError(f"Unknown kind '{kind}', expected 'corr' or 'cov'")
+        return self.corr if kind == 'corr' else self.cov
+    
+    def at(self, date, kind: str = 'corr') -> pd.DataFrame:
+        """
+        Ticker x ticker matrix for the window ending on (or just before) ``date``
+        
+        Pairs that are not tracked are NaN. The diagonal is 1 for correlations
+        and NaN for covariances.
+        """
+        values = np.asarray(self._values(kind)[self._row(date)], dtype=np.float64)
+        n_tickers = len(self.tickers)
+        matrix = np.full((n_tickers, n_tickers), np.nan)
+        matrix[self.left, self.right] = values
+        matrix[self.right, self.left] = values
+        if kind == 'corr':
+            np.fill_diagonal(matrix, 1.0)
+        return pd.DataFrame(matrix, index=self.tickers, columns=self.tickers)
+    
+    def pair(self, first: str, second: str, kind: str = 'corr') -> pd.Series:
+        """Time series of one pair's rolling correlation or covariance"""
+        key = (first, second) if (first, second) in self._pair_pos else (second, first)
+        if key not in self._pair_pos:
+            raise KeyError(f"Pair {first}/{second} is not tracked")
+        values = np.asarray(self._values(kind)[:, self._pair_pos[key]], dtype=np.float64)
+        return pd.Series(values, index=self.dates, name=f"{first}/{second}")
+    
+    def average(self, kind: str = 'corr') -> pd.Series:
+        """Mean over all tracked pairs per date (e.g. the market's average correlation)"""
+        values = self._values(kind)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            mean = np.array([np.nanmean(values[row]) for row in range(len(self.dates))])
+        return pd.Series(mean, index=self.dates, name=f"average_{kind}")
+
+def compute_rolling_windows(returns: pd.DataFrame,
+                            windows: Sequence[int] = ANALYSIS_SETTINGS["rolling_windows"],
+                            pairs: Optional[Sequence[Tuple[str, str]]] = None,
+                            data_dir: str = "output",
+                            min_periods: Optional[int] = None) -> Dict[int, RollingCorrelation]:
+    """
+    Compute the rolling cubes for several window lengths
+    
+    Args:
+        returns: Aligned dates x tickers returns
+        windows: Window lengths (defaults to the configured 20/60/120 days)
+        pairs: Ticker pairs to track (every pair when omitted)
+        data_dir: Directory for the result files
+        min_periods: Minimum common observations per window (defaults to the window length)
+    
+    Returns:
+        Dictionary mapping window length to its RollingCorrelation
+    """
+    results = {}
+    for window in windows:
+        try:
+            results[window] = RollingCorrelation.compute(returns, window, pairs, data_dir,
+                                                         min_periods=min_periods)
+        except Exception as e:
+            logger.error(f"Error computing {window}-day rolling correlation: {str(e)}")
+    return results
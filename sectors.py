@@ -0,0 +1,233 @@
+"""
+BIST Trading System - Sectors Module
+Sector table and index membership for the whole universe and vectorized
+per-sector returns and breadth
+"""
+
+import logging
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import INDEX_CONSTITUENTS
+from market_panel import MarketPanel
+from market_stats import aligned_returns
+from metadata_service import MetadataService, get_metadata_service
+
+logger = logging.getLogger(__name__)
+
+SECTOR_COLUMNS = ['Ticker', 'Name', 'Sector', 'Industry', 'Market_Cap', 'Source']
+
+INDEX_SECTOR = 'Index'
+UNKNOWN_SECTOR = 'Unknown'
+
+# Used for tickers the metadata has no sector for (e.g. when fetching their info failed)
+FALLBACK_SECTORS = {
+    'Banks': ['GARAN', 'AKBNK', 'YKBNK', 'SKBNK', 'QNBTR', 'VAKBN'],
+    'Airlines': ['THYAO', 'TUKAS', 'PGSUS'],
+    'Steel': ['KRDMD', 'KRDMA', 'KRDMB', 'EREGL'],
+    'Technology': ['ASELS', 'LOGO', 'NETAS', 'KAREL'],
+    'Energy': ['TUPRS', 'TATEN', 'AYGAZ', 'NTGAZ'],
+    'Food': ['ULKER', 'SASA', 'BIMAS', 'MGROS'],
+    'Automotive': ['TOASO', 'FROTO', 'TMSN', 'OTKAR'],
+    'Real Estate': ['AGYO', 'ASGYO', 'KRGYO', 'VKGYO']
+}
+
+def is_index_ticker(ticker: str) -> bool:
+    """Whether a ticker is a Borsa Istanbul index (XU030, XU100, XBANK, ...) rather than a stock"""
+    return ticker.upper().startswith('X')
+
+def fallback_sector(ticker: str) -> str:
+    """Sector of a ticker from the built-in map, 'Index' for index rows and 'Unknown' otherwise"""
+    if is_index_ticker(ticker):
+        return INDEX_SECTOR
+    symbol = ticker.upper().split('.')[0]
+    for sector, symbols in FALLBACK_SECTORS.items():
+        if symbol in symbols:
+            return sector
+    return UNKNOWN_SECTOR
+
+def load_sector_table(tickers: Sequence[str], metadata: Optional[MetadataService] = None,
+                      refresh: bool = False) -> pd.DataFrame:
+    """
+    Sector table of a universe from the cached ticker metadata
+    
+    Index rows are labelled 'Index' without a lookup. Stocks come from the
+    metadata service, which only fetches tickers it has no fresh row for
+    (concurrently, once per TTL). Stocks without a sector fall back to the
+    built-in sector map.
+    
+    Args:
+        tickers: Tickers of the universe
+        metadata: Metadata service (defaults to the shared cached one)
+        refresh: Fetch every stock's metadata again
+    
+    Returns:
+        DataFrame indexed by Ticker with Name, Sector, Industry, Market_Cap and Source
+    """
+    tickers = list(tickers)
+    stocks = [ticker for ticker in tickers if not is_index_ticker(ticker)]
+    metadata = metadata or get_metadata_service()
+    
+    info = metadata.get_many(stocks, refresh=refresh) if stocks else \
+        pd.DataFrame(columns=SECTOR_COLUMNS[1:-1])
+    table = info.reindex(index=tickers, columns=SECTOR_COLUMNS[1:-1])
+    table.index.name = 'Ticker'
+    table['Source'] = np.where(table['Sector'].notna(), 'yfinance', 'fallback')
+    
+    indexes = [ticker for ticker in tickers if is_index_ticker(ticker)]
+    table.loc[indexes, ['Sector', 'Industry', 'Source']] = [INDEX_SECTOR, INDEX_SECTOR, 'index']
+    
+    fallback = pd.Series([fallback_sector(ticker) for ticker in table.index], index=table.index)
+    table['Sector'] = table['Sector'].fillna(fallback).astype(str)
+    table['Market_Cap'] = pd.to_numeric(table['Market_Cap'], errors='coerce')
+    return table
+
+def sector_membership(sectors: pd.Series,
+                      exclude: Sequence[str] = (INDEX_SECTOR,)) -> pd.DataFrame:
+    """
+    One-hot tickers x sectors membership matrix
+    
+    Args:
+        sectors: Sector of each ticker, indexed by ticker
+        exclude: Sectors left out of the matrix (index rows by default)
+    
+    Returns:
+        Float DataFrame with a 1 in each ticker's sector column
+    """
+    membership = pd.get_dummies(sectors, dtype=np.float64)
+    return membership.drop(columns=[sector for sector in exclude if sector in membership.columns])
+
+def index_membership(tickers: Sequence[str],
+                     constituents: Optional[Mapping[str, Sequence[str]]] = None) -> pd.DataFrame:
+    """
+    One-hot tickers x indices membership matrix from the index constituent lists
+    
+    Args:
+        tickers: Tickers of the universe (with or without the .IS suffix)
+        constituents: Index -> member symbols (defaults to config.INDEX_CONSTITUENTS)
+    
+    Returns:
+        Float DataFrame indexed by Ticker with a 1 in each index the ticker belongs to
+    """
+    constituents = INDEX_CONSTITUENTS if constituents is None else constituents
+    tickers = list(tickers)
+    symbols = pd.Index([ticker.upper().split('.')[0] for ticker in tickers])
+    return pd.DataFrame({index: symbols.isin(members).astype(np.float64)
+                         for index, members in constituents.items()},
+                        index=pd.Index(tickers, name='Ticker'))
+
+def sector_aggregates(panel: MarketPanel, table: pd.DataFrame,
+                      returns: Optional[np.ndarray] = None,
+                      exclude: Sequence[str] = (INDEX_SECTOR,),
+                      index: Optional[str] = None,
+                      constituents: Optional[Mapping[str, Sequence[str]]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Per-sector daily returns and breadth from aligned close/volume matrices
+    
+    Every aggregate is one product of a dates x tickers matrix with the
+    tickers x sectors membership matrix, so all sectors and days are
+    computed together. Each ticker only counts on the days it has a return.
+    
+    - equal: mean return of the members
+    - volume: returns weighted by the day's traded value (Close x Volume)
+    - cap: returns weighted by market cap at the previous close, scaled back
+      from the table's Market_Cap (taken at the last close)
+    - breadth: (advancers - decliners) / members with a return, in [-1, 1]
+    - members: number of members with a return
+    
+    Args:
+        panel: MarketPanel with Close (and Volume for volume weighting)
+        table: Sector table indexed by ticker (``load_sector_table``)
+        returns: Precomputed dates x tickers simple returns aligned with the panel
+        exclude: Sectors left out of the aggregation (index rows by default)
+        index: Only aggregate the constituents of this index (e.g. 'XU030')
+        constituents: Index -> member symbols (defaults to config.INDEX_CONSTITUENTS)
+    
+    Returns:
+        Dictionary of dates x sectors DataFrames, NaN where a sector has no
+        member (or no weight) that day
+    """
+    close = panel.field('Close').to_numpy(dtype=np.float64)
+    if returns is None:
+        returns = aligned_returns(close)
+    
+    sectors = table['Sector'].reindex(panel.tickers).fillna(UNKNOWN_SECTOR)
+    membership = sector_membership(sectors, exclude)
+    groups = membership.to_numpy()
+    if index is not None:
+        indices = index_membership(panel.tickers, constituents)
+        if index not in indices.columns:
+            raise ValueError(f"Unknown index {index}, expected one of {list(indices.columns)}")
+        # Non-constituents get an all-zero membership row, so they drop out of every product
+        groups = groups * indices[index].to_numpy()[:, None]
+    
+    has_return = ~np.isnan(returns)
+    filled = np.where(has_return, returns, 0.0)
+    
+    if 'Volume' in panel.fields:
+        volume = panel.field('Volume').to_numpy(dtype=np.float64)
+        turnover = np.where(has_return, np.nan_to_num(close * volume), 0.0)
+    else:
+        turnover = np.zeros_like(filled)
+    
+    # Market cap moves with the price: cap at the previous close = cap_last * previous close / last close
+    market_cap = table['Market_Cap'].reindex(panel.tickers).to_numpy(dtype=np.float64)
+    last_close = pd.DataFrame(close).ffill().iloc[-1].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        previous_cap = market_cap * (close / (1 + returns)) / last_close
+    previous_cap = np.where(has_return & np.isfinite(previous_cap), previous_cap, 0.0)
+    
+    members = has_return.astype(np.float64) @ groups
+    direction = np.sign(filled) @ groups
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aggregates = {
+            'equal': (filled @ groups) / members,
+            'volume': ((filled * turnover) @ groups) / (turnover @ groups),
+            'cap': ((filled * previous_cap) @ groups) / (previous_cap @ groups),
+            'breadth': direction / members,
+        }
+    
+    def frame(values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=panel.dates, columns=membership.columns)
+    
+    result = {name: frame(np.where(np.isfinite(values), values, np.nan))
+              for name, values in aggregates.items()}
+    result['members'] = frame(members)
+    return result
+
+def sector_index(returns: pd.DataFrame, base: float = 100.0) -> pd.DataFrame:
+    """Compound per-sector daily returns into index levels starting at ``base``"""
+    return base * (1 + returns.fillna(0.0)).cumprod()
+
+def sector_summary(aggregates: Dict[str, pd.DataFrame], table: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per sector: members, total return per weighting and average breadth
+    
+    Args:
+        aggregates: Output of ``sector_aggregates``
+        table: Sector table indexed by ticker
+    
+    Returns:
+        DataFrame with Sector, Tickers, Market_Cap, Equal_Return, Volume_Return,
+        Cap_Return and Avg_Breadth
+    """
+    sectors = aggregates['equal'].columns
+    counts = table['Sector'].value_counts()
+    caps = table.groupby('Sector')['Market_Cap'].sum(min_count=1)
+    
+    def total_return(name: str) -> pd.Series:
+        return (sector_index(aggregates[name], base=1.0).iloc[-1] - 1).to_numpy()
+    
+    summary = pd.DataFrame({
+        'Sector': sectors,
+        'Tickers': counts.reindex(sectors).fillna(0).astype(int).to_numpy(),
+        'Market_Cap': caps.reindex(sectors).to_numpy(),
+        'Equal_Return': total_return('equal'),
+        'Volume_Return': total_return('volume'),
+        'Cap_Return': total_return('cap'),
+        'Avg_Breadth': aggregates['breadth'].mean().to_numpy(),
+    })
+    return summary.sort_values('Equal_Return', ascending=False).reset_index(drop=True)
@@ -0,0 +1,150 @@
+"""
+BIST Trading System - Sweep Runner Module
+Fans a parameter grid out over worker processes sharing one market panel in shared memory
+"""
+
+import os
+import time
+import logging
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from market_panel import MarketPanel
+
+logger = logging.getLogger(__name__)
+
+class SharedPanel:
+    """
+    A market panel whose values live in a ``multiprocessing.shared_memory`` block
+    
+    The creating process copies the panel in once; workers attach by name
+    and get a MarketPanel whose values are a NumPy view of the same memory,
+    so memory use does not grow with the number of workers.
+    """
+    
+    def __init__(self, shm: shared_memory.SharedMemory, panel: MarketPanel, owner: bool):
+        self.shm = shm
+        self.panel = panel
+        self.owner = owner
+    
+    @classmethod
+    def create(cls, panel: MarketPanel) -> 'SharedPanel':
+        """Copy a panel into a new shared memory block"""
+        values = np.asarray(panel.values)
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+        shared[...] = values
+        return cls(shm, MarketPanel(shared, panel.dates, panel.tickers, panel.fields,
+                                    panel.metadata), owner=True)
+    
+    def spec(self) -> Dict:
+        """Small picklable description workers use to attach"""
+        values = self.panel.values
+        return {
+            'name': self.shm.name,
+            'shape': values.shape,
+            'dtype': values.dtype.str,
+            'dates': self.panel.dates,
+            'tickers': self.panel.tickers,
+            'fields': self.panel.fields,
+            'metadata': self.panel.metadata,
+        }
+    
+    @classmethod
+    def attach(cls, spec: Dict) -> 'SharedPanel':
+        """Attach to a block created in another process (zero copy, read-only view)"""
+        # Pool workers share the creator's resource tracker, so attaching does
+        # not register the block a second time; only the creator unlinks it
+        shm = shared_memory.SharedMemory(name=spec['name'])
+        values = np.ndarray(spec['shape'], dtype=np.dtype(spec['dtype']), buffer=shm.buf)
+        values.flags.writeable = False
+        return cls(shm, MarketPanel(values, spec['dates'], spec['tickers'], spec['fields'],
+                                    spec['metadata']), owner=False)
+    
+    def close(self) -> None:
+        """Release the mapping, and free the block if this process created it"""
+        self.panel = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+    
+    def __enter__(self) -> 'SharedPanel':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def parameter_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    """Every combination of a {parameter: values} grid"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+# Shared panel attached by the current worker process, set by the pool initializer
+_worker_shared = None
+
+def _init_worker(spec: Dict) -> None:
+    global _worker_shared
+    _worker_shared = SharedPanel.attach(spec)
+
+def _run_params(func: Callable, params: Dict, panel: Optional[MarketPanel] = None) -> Dict:
+    """Evaluate one parameter set and flatten its result into a table row"""
+    panel = panel if panel is not None else _worker_shared.panel
+    start = time.perf_counter()
+    try:
+        result = func(panel, **params)
+        error = None
+    except Exception as e:
+        logger.error(f"Error running {params}: {str(e)}")
+        result, error = {}, str(e)
+    
+    if not isinstance(result, dict):
+        result = {'value': result}
+    return dict(params, **result, elapsed=time.perf_counter() - start, error=error)
+
+def run_sweep(panel: MarketPanel, func: Callable, grid: Dict[str, Sequence],
+              max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Evaluate ``func(panel, **params)`` for every combination of a parameter grid
+    
+    The panel is copied into shared memory once and every worker process
+    attaches to it, so nothing is re-read or re-parsed per variant. With a
+    single worker the variants run in the current process on the panel
+    itself.
+    
+    Args:
+        panel: Market panel handed to every evaluation
+        func: Module-level function (picklable) taking the panel and the
+            parameters as keywords and returning a dictionary of metrics
+            (or a single value); use functools.partial for fixed arguments
+        grid: {parameter: values} grid
+        max_workers: Number of worker processes (defaults to the CPU count)
+    
+    Returns:
+        Tidy DataFrame with one row per variant, in grid order: the parameters,
+        the returned metrics, elapsed seconds and the error (None on success)
+    """
+    variants = parameter_grid(grid)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(variants)) if variants else 1
+    start = time.perf_counter()
+    
+    if max_workers <= 1:
+        rows = [_run_params(func, params, panel) for params in variants]
+    else:
+        with SharedPanel.create(panel) as shared:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(shared.spec(),)) as executor:
+                futures = [executor.submit(_run_params, func, params) for params in variants]
+                rows = [future.result() for future in futures]
+    
+    failed = sum(row['error'] is not None for row in rows)
+    logger.info(f"Swept {len(variants)} variants over {len(panel)} tickers in "
+                f"{time.perf_counter() - start:.1f}s with {max_workers} workers ({failed} failed)")
+    
+    columns = dict.fromkeys(list(grid) + [key for row in rows for key in row])
+    columns = [key for key in columns if key not in ('elapsed', 'error')] + ['elapsed', 'error']
+    return pd.DataFrame(rows, columns=columns)
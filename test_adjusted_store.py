@@ -0,0 +1,138 @@
+"""
+BIST Trading System - Adjusted Price Store Tests
+Checks raw storage, corporate-action factors and per-ticker factor invalidation
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adjusted_store import AdjustedPriceStore, adjustment_factors, undo_split_adjustment
+from data_downloader import BISTDataDownloader
+from download_manifest import DownloadManifest
+
+DATES = pd.bdate_range('2025-01-02', periods=40, tz='Europe/Istanbul')
+
+def raw_bars(dates=DATES, start=10.0, seed=0):
+    """Unadjusted bars with the columns yfinance returns for auto_adjust=False"""
+    rng = np.random.default_rng(seed)
+    close = start * np.cumprod(1 + rng.normal(0, 0.01, len(dates)))
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(1000, 5000, len(dates)).astype(float),
+        'Dividends': 0.0, 'Stock Splits': 0.0,
+    }, index=dates)
+
+def as_yahoo(raw):
+    """What Yahoo serves for raw bars: every split up to today applied to earlier bars"""
+    data = raw.copy()
+    splits = data['Stock Splits'].where(data['Stock Splits'] > 0, 1.0)
+    later = splits[::-1].cumprod()[::-1].shift(-1, fill_value=1.0)
+    for col in ('Open', 'High', 'Low', 'Close', 'Dividends'):
+        data[col] = data[col] / later
+    data['Volume'] = data['Volume'] * later
+    return data
+
+def test_undo_split_adjustment_restores_traded_prices():
+    raw = raw_bars()
+    raw.iloc[20:, [0, 1, 2, 3]] /= 2
+    raw.iloc[20, raw.columns.get_loc('Stock Splits')] = 2.0
+    
+    splits = pd.DataFrame({'Date': ['2025-01-30'], 'Value': [2.0]})
+    restored = undo_split_adjustment(as_yahoo(raw), splits)
+    
+    np.testing.assert_allclose(restored['Close'], raw['Close'])
+    np.testing.assert_allclose(restored['Volume'], raw['Volume'])
+
+def test_adjustment_factors_for_splits_rights_and_dividends():
+    close = pd.Series([10.0, 10.0, 10.0, 5.0, 5.0, 4.0], index=DATES[:6])
+    actions = pd.DataFrame({
+        'Date': ['2025-01-07', '2025-01-08', '2025-01-09'],
+        'Type': ['split', 'dividend', 'rights'],
+        'Value': [2.0, 0.5, 1.0], 'Price': [np.nan, np.nan, 1.0], 'In_Raw': False,
+    })
+    
+    factors = adjustment_factors(actions, close).set_index('Date')
+    
+    # Rights: (5 + 1 * 1) / 2 = 3 ex-rights on a previous close of 5
+    assert factors.loc['2025-01-09', 'Split_Factor'] == pytest.approx(0.6)
+    assert factors.loc['2025-01-08', 'Split_Factor'] == pytest.approx(0.6)
+    assert factors.loc['2025-01-08', 'Total_Factor'] == pytest.approx(0.6 * 0.9)
+    assert factors.loc['2025-01-07', 'Split_Factor'] == pytest.approx(0.3)
+    assert factors.loc['2025-01-07', 'Volume_Factor'] == pytest.approx(4.0)
+
+def test_split_in_refresh_only_recomputes_that_ticker(tmp_path):
+    store = AdjustedPriceStore(str(tmp_path))
+    history = {'THYAO.IS': raw_bars(seed=1), 'GARAN.IS': raw_bars(seed=2)}
+    history['GARAN.IS'].iloc[10, history['GARAN.IS'].columns.get_loc('Dividends')] = 0.2
+    
+    for ticker, data in history.items():
+        store.write_raw(ticker, as_yahoo(data.iloc[:30]))
+    garan_factors = store.factors('GARAN.IS')
+    assert store.factors('THYAO.IS').empty
+    
+    # A 100% bedelsiz issue on day 32, seen in the next incremental refresh
+    thyao = history['THYAO.IS']
+    thyao.iloc[32:, [0, 1, 2, 3]] /= 2
+    thyao.iloc[32:, thyao.columns.get_loc('Volume')] *= 2
+    thyao.iloc[32, thyao.columns.get_loc('Stock Splits')] = 2.0
+    store.write_raw('THYAO.IS', as_yahoo(thyao.iloc[29:]))
+    
+    # Raw history is the traded prices, the adjusted series is continuous
+    np.testing.assert_allclose(store.raw('THYAO.IS')['Close'], thyao['Close'], rtol=1e-9)
+    assert store.actions('THYAO.IS')[['Date', 'Type', 'Value']].values.tolist() == \
+        [['2025-02-17', 'split', 2.0]]
+    adjusted = store.adjusted('THYAO.IS')
+    np.testing.assert_allclose(adjusted['Close'], as_yahoo(thyao)['Close'], rtol=1e-9)
+    
+    # The action and factor tables next to the raw files are not tickers
+    assert sorted(store.tickers()) == ['GARAN.IS', 'THYAO.IS']
+    
+    # GARAN's cached factors survive, also across store instances
+    assert store.factors('GARAN.IS') is garan_factors
+    reopened = AdjustedPriceStore(str(tmp_path))
+    pd.testing.assert_frame_equal(reopened.factors('GARAN.IS'), garan_factors, check_dtype=False)
+    assert reopened.adjusted('GARAN.IS')['Close'].iloc[9] == pytest.approx(
+        history['GARAN.IS']['Close'].iloc[9] * (1 - 0.2 / history['GARAN.IS']['Close'].iloc[9]))
+
+def test_adjusted_frames_are_stored_as_is(tmp_path):
+    store = AdjustedPriceStore(str(tmp_path))
+    data = raw_bars()
+    data.iloc[5, data.columns.get_loc('Stock Splits')] = 3.0
+    
+    store.write_raw('AKBNK.IS', data, adjusted='total')
+    
+    assert bool(store.actions('AKBNK.IS')['In_Raw'].iloc[0])
+    np.testing.assert_allclose(store.adjusted('AKBNK.IS')['Close'], data['Close'])
+    assert list(store.load_data_dict()) == ['AKBNK.IS']
+
+def test_downloader_refreshes_the_store_incrementally(tmp_path):
+    raw = raw_bars()
+    calls = []
+    
+    def raw_fetcher(ticker, period, interval, start=None):
+        calls.append(start)
+        return as_yahoo(raw) if start is None else as_yahoo(raw.iloc[-3:])
+    
+    store = AdjustedPriceStore(str(tmp_path / 'adjusted'))
+    downloader = BISTDataDownloader(str(tmp_path), fetcher=lambda *a, **k: None,
+                                    raw_fetcher=raw_fetcher)
+    downloader.update_adjusted_store('THYAO.IS', store)
+    merged = downloader.update_adjusted_store('THYAO.IS', store)
+    
+    assert calls == [None, '2025-02-26']
+    assert len(merged) == len(raw)
+
+def test_store_failure_leaves_the_daily_manifest_alone(tmp_path):
+    def raw_fetcher(ticker, period, interval, start=None):
+        raise TimeoutError("read timed out")
+    
+    manifest = DownloadManifest(str(tmp_path))
+    downloader = BISTDataDownloader(str(tmp_path), fetcher=lambda *a, **k: raw_bars(),
+                                    raw_fetcher=raw_fetcher, manifest=manifest, retry_attempts=1)
+    downloader.download_ticker_data('THYAO.IS', 'ytd', '1d')
+    
+    store = AdjustedPriceStore(str(tmp_path / 'adjusted'))
+    assert downloader.update_adjusted_store('THYAO.IS', store) is None
+    assert manifest.is_complete('THYAO.IS')
+    assert downloader.failed_tickers == set()
@@ -0,0 +1,136 @@
+"""
+BIST Trading System - Backtester Tests
+Checks positions, costs and attribution against a hand-computed loop and the parameter sweep
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester import (BACKTEST_STATS_COLUMNS, load_backtest_panel, ma_crossover_signals,
+                        momentum_signals, run_backtest, run_parameter_sweep)
+from data_downloader import BISTDataDownloader
+from data_storage import CSVStorage
+from market_panel import MarketPanel
+
+def make_close(n=300, n_tickers=8, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-02', periods=n, freq='B', tz='Europe/Istanbul')
+    close = 20 * np.cumprod(1 + rng.normal(0.0005, 0.02, (n, n_tickers)), axis=0)
+    close[:40, 0] = np.nan      # late listing
+    close[100:105, 1] = np.nan  # suspension
+    return pd.DataFrame(close, index=dates, columns=[f"T{i}.IS" for i in range(n_tickers)])
+
+def loop_backtest(close, signals, cost_rate):
+    """Day-by-day reference implementation"""
+    weights = np.zeros(close.shape[1])
+    last_close = np.full(close.shape[1], np.nan)
+    net, pnl = [], np.zeros(close.shape[1])
+    for t in range(len(close)):
+        prices = close.iloc[t].to_numpy()
+        returns = np.nan_to_num(prices / last_close - 1)
+        day_pnl = weights * returns
+        traded = ~np.isnan(prices)
+        target = np.where(traded, np.nan_to_num(signals.iloc[t].to_numpy()), weights)
+        cost = np.abs(target - weights) * cost_rate
+        pnl += day_pnl - cost
+        net.append(day_pnl.sum() - cost.sum())
+        weights = target
+        last_close = np.where(traded, prices, last_close)
+    return np.array(net), pnl
+
+def test_backtest_matches_day_by_day_loop():
+    close = make_close()
+    rng = np.random.default_rng(1)
+    signals = pd.DataFrame(rng.uniform(-0.2, 0.3, close.shape), index=close.index,
+                           columns=close.columns)
+    
+    result = run_backtest(close, signals, commission_rate=0.002, bsmv_rate=0.05, slippage_rate=0.0005)
+    net, pnl = loop_backtest(close, signals, 0.002 * 1.05 + 0.0005)
+    
+    np.testing.assert_allclose(result['returns'].to_numpy(), net, atol=1e-12)
+    np.testing.assert_allclose(result['attribution'].loc[close.columns, 'Net_PnL'], pnl * 100, atol=1e-9)
+    assert result['positions'].iloc[102, 1] == signals.iloc[99, 1]
+    assert result['positions'].iloc[:40, 0].eq(0).all()
+    assert result['drawdown'].max() <= 0
+    assert result['stats']['Max_Drawdown'] == pytest.approx(result['drawdown'].min() * 100)
+
+def test_costs_include_bsmv():
+    close = make_close(n=10)
+    signals = pd.DataFrame(0.0, index=close.index, columns=close.columns)
+    signals.iloc[2:, 2] = 1.0
+    
+    result = run_backtest(close, signals, commission_rate=0.001, bsmv_rate=0.05, slippage_rate=0.0)
+    
+    assert result['costs'].iloc[2] == pytest.approx(0.00105)
+    assert result['turnover'].sum() == pytest.approx(1.0)
+
+def test_parameter_sweep_across_processes(tmp_path):
+    close = make_close(n=400, n_tickers=12)
+    storage = CSVStorage(str(tmp_path))
+    for ticker in close.columns:
+        data = close[[ticker]].dropna().rename(columns={ticker: 'Close'})
+        data['Volume'] = 1e6
+        storage.save(ticker, data, "ytd", "1d")
+    
+    panel = load_backtest_panel(str(tmp_path), tickers=None)
+    grid = {'fast': [5, 10, 20], 'slow': [50, 100]}
+    results = run_parameter_sweep(panel, 'ma_crossover', grid, max_workers=2)
+    serial = run_parameter_sweep(panel, 'ma_crossover', grid, max_workers=1)
+    
+    assert len(panel) == 12 and len(results) == 6
+    assert results['Sharpe'].is_monotonic_decreasing
+    pd.testing.assert_frame_equal(results, serial)
+    
+    best = results.iloc[0]
+    signals = ma_crossover_signals(panel.values[0], int(best['fast']), int(best['slow']))
+    direct = run_backtest(panel.field('Close'),
+                          pd.DataFrame(signals, index=panel.dates, columns=panel.tickers))
+    assert direct['stats']['Sharpe'] == pytest.approx(best['Sharpe'])
+
+def test_failed_variants_are_dropped_from_the_sweep():
+    close = make_close(n=60)
+    panel = MarketPanel(close.to_numpy()[None], close.index, list(close.columns), ['Close'])
+    
+    with pytest.raises(ValueError, match="lookback"):
+        momentum_signals(close.to_numpy(), lookback=0)
+    
+    results = run_parameter_sweep(panel, 'momentum', {'lookback': [0, 5]}, max_workers=1)
+    assert results['lookback'].tolist() == [5]
+    assert 'error' not in results.columns
+    
+    failed = run_parameter_sweep(panel, 'momentum', {'lookback': [0]}, max_workers=1)
+    assert failed.empty
+    assert list(failed.columns) == ['lookback'] + BACKTEST_STATS_COLUMNS
+    assert (failed.dtypes[BACKTEST_STATS_COLUMNS] == np.float64).all()
+
+def test_load_backtest_panel_keeps_configured_tickers(tmp_path):
+    storage = CSVStorage(str(tmp_path))
+    data = make_close(n=30)[['T2.IS']].rename(columns={'T2.IS': 'Close'})
+    data['Volume'] = 1e6
+    storage.save("THYAO.IS", data, "ytd", "1d")
+    storage.save("NOTLISTED.IS", data, "ytd", "1d")
+    
+    panel = load_backtest_panel(str(tmp_path))
+    
+    assert panel.tickers == ["THYAO.IS"]
+    assert isinstance(panel, MarketPanel)
+
+def test_load_backtest_panel_opens_the_saved_panel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = CSVStorage(str(tmp_path))
+    close = make_close(n=60)
+    for ticker in ("THYAO.IS", "GARAN.IS", "NOTLISTED.IS"):
+        data = close[['T1.IS']].rename(columns={'T1.IS': 'Close'})
+        data['Volume'] = 1e6
+        storage.save(ticker, data, "ytd", "1d")
+    parsed = load_backtest_panel(str(tmp_path))
+    BISTDataDownloader(str(tmp_path)).update_panel()
+    
+    monkeypatch.setattr(CSVStorage, 'load', lambda self, path: pytest.fail(f"{path} was parsed"))
+    panel = load_backtest_panel(str(tmp_path))
+    
+    assert panel.tickers == parsed.tickers == ["GARAN.IS", "THYAO.IS"]
+    assert panel.fields == ['Close', 'Volume']
+    assert panel.dates.equals(parsed.dates)
+    np.testing.assert_array_equal(panel.values, parsed.values)
@@ -0,0 +1,74 @@
+"""
+BIST Trading System - Batched Download Tests
+Checks chunking and unpacking of multi-symbol downloads against a recorded fixture
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from data_downloader import BISTDataDownloader, HISTORY_COLUMNS, chunk_tickers, unpack_batch
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "yf_download_chunk.csv")
+
+def load_fixture():
+    return pd.read_csv(FIXTURE, header=[0, 1], index_col=0, parse_dates=True)
+
+class RecordedBatchFetcher:
+    """Serves slices of the recorded wide download for each requested chunk"""
+    
+    def __init__(self):
+        self.wide = load_fixture()
+        self.requests = []
+    
+    def __call__(self, tickers, period, interval):
+        self.requests.append(list(tickers))
+        present = [t for t in tickers if t in self.wide.columns.get_level_values(0)]
+        return self.wide.loc[:, present]
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_chunk_tickers():
+    assert chunk_tickers(list("abcde"), 2) == [["a", "b"], ["c", "d"], ["e"]]
+    with pytest.raises(ValueError):
+        chunk_tickers(["a"], 0)
+
+def test_unpack_batch_matches_history_schema():
+    frames = unpack_batch(load_fixture(), ["THYAO.IS", "GARAN.IS", "AKBNK.IS", "ASELS.IS"])
+    
+    assert set(frames) == {"THYAO.IS", "GARAN.IS", "AKBNK.IS"}
+    for data in frames.values():
+        assert list(data.columns) == HISTORY_COLUMNS
+        assert data['Volume'].dtype == 'int64'
+        assert not data[['Open', 'High', 'Low', 'Close']].isna().any().any()
+    
+    # Late-listed symbol keeps only the days it traded
+    assert len(frames["AKBNK.IS"]) == 4
+    assert len(frames["THYAO.IS"]) == 6
+    assert frames["GARAN.IS"]['Dividends'].sum() == pytest.approx(2.14)
+
+def test_unpack_batch_accepts_field_first_and_flat_columns():
+    wide = load_fixture()
+    swapped = unpack_batch(wide.swaplevel(axis=1), ["THYAO.IS", "GARAN.IS"])
+    pd.testing.assert_frame_equal(swapped["GARAN.IS"], unpack_batch(wide, ["GARAN.IS"])["GARAN.IS"])
+    
+    flat = unpack_batch(wide["THYAO.IS"], ["THYAO.IS"])
+    assert list(flat) == ["THYAO.IS"]
+
+def test_download_batched_saves_per_ticker_files(workdir):
+    fetcher = RecordedBatchFetcher()
+    downloader = BISTDataDownloader(str(workdir / "data"), batch_fetcher=fetcher)
+    tickers = ["THYAO.IS", "GARAN.IS", "AKBNK.IS", "ASELS.IS", "KRDMD.IS"]
+    
+    results = downloader.download_batched(tickers, period="ytd", chunk_size=2, delay=0)
+    
+    assert fetcher.requests == [["THYAO.IS", "GARAN.IS"], ["AKBNK.IS", "ASELS.IS"], ["KRDMD.IS"]]
+    assert list(results) == ["THYAO.IS", "GARAN.IS", "AKBNK.IS"]
+    
+    saved = pd.read_csv(workdir / "data" / "GARAN_ytd_1d.csv", index_col=0)
+    assert list(saved.columns) == HISTORY_COLUMNS + ['Ticker']
+    assert (saved['Ticker'] == "GARAN.IS").all()
@@ -0,0 +1,103 @@
+"""
+BIST Trading System - Concurrent Download Tests
+Exercises the concurrent downloader against a local fake fetcher
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_downloader import BISTDataDownloader, TokenBucket
+
+
+class FakeFetcher:
+    """Returns synthetic price history and records request concurrency"""
+    
+    def __init__(self, latency: float = 0.01, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self, ticker, period, interval):
+        with self._lock:
+            self.calls.append((ticker, time.monotonic()))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            if ticker in self.failing:
+                raise ConnectionError(f"simulated failure for {ticker}")
+            dates = pd.date_range("2025-01-02", periods=5, freq="B")
+            seed = sum(ord(c) for c in ticker)
+            close = 10 + np.arange(5) + seed % 7
+            return pd.DataFrame({
+                'Open': close, 'High': close + 1, 'Low': close - 1,
+                'Close': close, 'Volume': np.full(5, 1000 + seed)
+            }, index=dates)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+TICKERS = [f"T{i:03d}.IS" for i in range(24)]
+
+
+def test_concurrent_matches_sequential(workdir):
+    sequential = BISTDataDownloader(str(workdir / "seq"), fetcher=FakeFetcher(latency=0))
+    concurrent = BISTDataDownloader(str(workdir / "conc"), fetcher=FakeFetcher())
+    
+    expected = sequential.download_multiple_tickers(TICKERS, delay=0)
+    results = concurrent.download_multiple_tickers(TICKERS, max_workers=6,
+                                                   requests_per_second=1000)
+    
+    assert list(results) == list(expected) == TICKERS
+    for ticker in TICKERS:
+        pd.testing.assert_frame_equal(results[ticker], expected[ticker])
+    assert len(list((workdir / "conc").glob("*.csv"))) == len(TICKERS)
+
+
+def test_concurrent_bounds_workers_and_skips_failures(workdir):
+    fetcher = FakeFetcher(latency=0.02, failing={"T003.IS", "T010.IS"})
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher, backoff_base=0)
+    
+    results = downloader.download_multiple_tickers(TICKERS, max_workers=4,
+                                                   requests_per_second=1000,
+                                                   failed_retry_delay=0)
+    
+    assert fetcher.max_active <= 4
+    assert "T003.IS" not in results and "T010.IS" not in results
+    assert len(results) == len(TICKERS) - 2
+    # Each failing ticker: three attempts in the run, three more in the end-of-run retry
+    assert sum(ticker == "T003.IS" for ticker, _ in fetcher.calls) == 6
+
+
+def test_concurrent_respects_rate_limit(workdir):
+    fetcher = FakeFetcher(latency=0)
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher)
+    
+    start = time.monotonic()
+    downloader.download_multiple_tickers(TICKERS[:11], max_workers=8,
+                                         requests_per_second=50)
+    elapsed = time.monotonic() - start
+    
+    # One token is available up front, the remaining ten arrive at 50/s
+    assert elapsed >= 10 / 50 * 0.9
+    starts = sorted(t for _, t in fetcher.calls)
+    assert starts[-1] - starts[0] >= 10 / 50 * 0.9
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
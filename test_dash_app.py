@@ -0,0 +1,76 @@
+"""
+BIST Trading System - Dash Application Tests
+Checks the shared market cache, its invalidation and the memoized views
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_app import create_app
+from data_storage import CSVStorage
+
+def make_history(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.date_range('2025-01-02', periods=n, freq='B',
+                                           tz='Europe/Istanbul'), name='Date')
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': rng.integers(1e5, 1e7, n)}, index=index)
+
+@pytest.fixture
+def app(tmp_path):
+    storage = CSVStorage(str(tmp_path))
+    for i, ticker in enumerate(["THYAO.IS", "GARAN.IS", "AKBNK.IS"]):
+        storage.save(ticker, make_history(seed=i), "ytd", "1d")
+    return create_app(str(tmp_path), cache_size=4, check_interval=0)
+
+def test_views_are_memoized_per_data_version(app):
+    views = app.market_views
+    
+    first = views.render('price', 'GARAN.IS', '2025-02-01', '2025-02-28')
+    second = views.render('price', 'GARAN.IS', '2025-02-01', '2025-02-28')
+    
+    assert first.figure is second.figure
+    assert views.price_figure.cache_info().hits == 1
+    assert len(first.figure.data[0].x) == 20
+    assert views.render('volume', 'GARAN.IS', None, None).figure.data[0].type == 'bar'
+    assert views.render('overview', None, None, None).page_size == 25
+    heatmap = views.render('correlation', None, None, None, ('THYAO.IS', 'AKBNK.IS')).figure
+    assert sorted(heatmap.data[0].x) == ['AKBNK.IS', 'THYAO.IS']
+
+def test_changed_files_invalidate_the_cache(app):
+    cache = app.market_cache
+    version = cache.version
+    app.market_views.render('price', 'THYAO.IS', None, None)
+    
+    storage = CSVStorage(cache.data_dir)
+    path = storage.save("THYAO.IS", make_history(n=80, seed=7), "ytd", "1d")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    
+    figure = app.market_views.render('price', 'THYAO.IS', None, None).figure
+    
+    assert cache.version == version + 1
+    assert len(figure.data[0].x) == 80
+    assert app.market_views.price_figure.cache_info().misses == 2
+
+def test_app_layout_and_callback(app):
+    assert any('view.children' in output for output in app.callback_map)
+    assert any('ticker.options' in output for output in app.callback_map)
+
+def test_ticker_options_follow_new_downloads(app):
+    views = app.market_views
+    version, tickers, selected = views.ticker_options(None, None)
+    assert sorted(tickers) == ['AKBNK.IS', 'GARAN.IS', 'THYAO.IS']
+    assert selected == tickers[0]
+    assert views.ticker_options(version, 'GARAN.IS') is None
+    
+    storage = CSVStorage(app.market_cache.data_dir)
+    path = storage.save("ASELS.IS", make_history(seed=9), "ytd", "1d")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    
+    new_version, tickers, selected = views.ticker_options(version, 'GARAN.IS')
+    assert new_version == version + 1
+    assert 'ASELS.IS' in tickers and selected == 'GARAN.IS'
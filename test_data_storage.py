@@ -0,0 +1,99 @@
+"""
+BIST Trading System - Data Storage Tests
+Round-trips ticker frames through the CSV and columnar storage backends
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_downloader import BISTDataDownloader
+from data_storage import (CSVStorage, detect_storage, get_storage,
+                          migrate_csv_storage, ticker_from_filename)
+
+def make_history(n=250, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.date_range('2025-01-02', periods=n, freq='B',
+                                           tz='Europe/Istanbul'), name='Date')
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    return pd.DataFrame({
+        'Open': close * 0.99, 'High': close * 1.01, 'Low': close * 0.98, 'Close': close,
+        'Volume': rng.integers(1e5, 1e7, n), 'Dividends': 0.0, 'Stock Splits': 0.0,
+    }, index=index)
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.mark.parametrize("backend", ["parquet", "feather"])
+def test_columnar_round_trip_is_typed(tmp_path, backend):
+    storage = get_storage(backend, str(tmp_path))
+    data = make_history()
+    data['Ticker'] = "THYAO.IS"
+    
+    path = storage.save("THYAO.IS", data, "ytd", "1d")
+    loaded = storage.load(path)
+    
+    assert path.endswith(storage.extension)
+    assert loaded['Close'].dtype == np.float32
+    assert loaded['Volume'].dtype == np.int64
+    assert loaded.index.equals(data.index)
+    np.testing.assert_allclose(loaded['Close'], data['Close'], rtol=1e-6)
+    assert (loaded['Ticker'] == "THYAO.IS").all()
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        get_storage("hdf5", str(tmp_path))
+
+def test_migration_and_detection(tmp_path):
+    csv = CSVStorage(str(tmp_path))
+    for i, ticker in enumerate(["THYAO.IS", "GARAN.IS", "AKBNK.IS"]):
+        csv.save(ticker, make_history(seed=i), "ytd", "1d")
+    assert detect_storage(str(tmp_path)).name == "csv"
+    
+    written = migrate_csv_storage(str(tmp_path), "parquet", remove_csv=True)
+    
+    assert len(written) == 3
+    storage = detect_storage(str(tmp_path))
+    assert storage.name == "parquet"
+    assert sorted(storage.load_all()) == ["AKBNK.IS", "GARAN.IS", "THYAO.IS"]
+    assert csv.list_files() == []
+
+def test_refresh_through_parquet_storage(workdir):
+    history = make_history(n=20)
+    
+    def fetcher(ticker, period, interval, start=None):
+        if start is None:
+            return history.iloc[:15].copy()
+        return history[history.index >= pd.Timestamp(start, tz=history.index.tz)].copy()
+    
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher, storage="parquet")
+    downloader.download_ticker_data("GARAN.IS", period="ytd")
+    merged = downloader.refresh_ticker_data("GARAN.IS", period="ytd")
+    
+    stored = downloader.storage.load(downloader.storage.path_for("GARAN.IS", "ytd", "1d"))
+    assert len(merged) == len(stored) == 20
+    assert stored['Close'].dtype == np.float32
+
+def test_load_full_market_from_parquet(tmp_path):
+    data = make_history()
+    elapsed = {}
+    for name in ("csv", "parquet"):
+        (tmp_path / name).mkdir()
+        storage = get_storage(name, str(tmp_path / name))
+        for i in range(600):
+            storage.save(f"T{i:03d}.IS", data, "ytd", "1d")
+        
+        start = time.perf_counter()
+        loaded = storage.load_all(max_workers=8)
+        elapsed[name] = time.perf_counter() - start
+        assert len(loaded) == 600
+    
+    assert ticker_from_filename("T000_ytd_1d.parquet") in loaded
+    # Wall-clock time varies with the machine, so the bound is relative to the CSV
+    # load of the same files, with an absolute cap
+    assert elapsed["parquet"] < elapsed["csv"] / 2
+    assert elapsed["parquet"] < 2.0
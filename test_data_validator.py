@@ -0,0 +1,127 @@
+"""
+BIST Trading System - Data Validator Tests
+Checks each data-quality rule and the summary report built on the issues table
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_downloader import BISTDataDownloader
+from data_validator import bist_trading_days, run_lengths, summarize_issues, validate_universe
+
+def make_bars(dates, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 20 * np.cumprod(1 + rng.normal(0, 0.01, len(dates)))
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(1000, 100000, len(dates)).astype(float),
+    }, index=dates)
+
+def trading_dates(start='2025-01-02', end='2025-06-30'):
+    return bist_trading_days(start, end).tz_localize('Europe/Istanbul')
+
+def checks_of(issues, ticker):
+    return dict(zip(issues.loc[issues['Ticker'] == ticker, 'Check'],
+                    issues.loc[issues['Ticker'] == ticker, 'Count']))
+
+def test_trading_calendar_skips_weekends_and_holidays():
+    days = bist_trading_days('2025-03-28', '2025-04-04')
+    assert [day.strftime('%m-%d') for day in days] == ['03-28', '04-02', '04-03', '04-04']
+
+def test_run_lengths_restart_at_group_boundaries():
+    flag = np.array([1, 1, 0, 1, 1, 1, 1], dtype=bool)
+    new_group = np.array([1, 0, 0, 0, 0, 1, 0], dtype=bool)
+    assert run_lengths(flag, new_group).tolist() == [2, 2, 0, 2, 2, 2, 2]
+
+def test_clean_data_has_no_issues():
+    dates = trading_dates()
+    issues = validate_universe({'AKBNK.IS': make_bars(dates), 'GARAN.IS': make_bars(dates, 1)})
+    assert issues.empty
+
+def test_each_rule_is_reported_per_ticker():
+    dates = trading_dates()
+    clean = make_bars(dates)
+    
+    ohlc = clean.copy()
+    ohlc.iloc[3, ohlc.columns.get_loc('High')] = ohlc['Low'].iloc[3] * 0.9
+    ohlc.iloc[8, ohlc.columns.get_loc('Close')] = ohlc['High'].iloc[8] * 1.05
+    
+    volume = clean.copy()
+    volume.iloc[10:17, volume.columns.get_loc('Volume')] = 0       # one 7-bar streak
+    volume.iloc[30:32, volume.columns.get_loc('Volume')] = 0       # too short to report
+    
+    stale = clean.copy()
+    stale.iloc[20:27, [0, 1, 2, 3]] = stale.iloc[19, [0, 1, 2, 3]].to_numpy()
+    
+    split = clean.copy()
+    split.iloc[50:, [0, 1, 2, 3]] /= 5
+    
+    gaps = clean.drop(clean.index[[40, 41, 60]])
+    duplicated = pd.concat([clean, clean.iloc[[12]]])
+    
+    issues = validate_universe({'OHLC.IS': ohlc, 'VOL.IS': volume, 'STALE.IS': stale,
+                                'SPLIT.IS': split, 'GAP.IS': gaps, 'DUP.IS': duplicated,
+                                'CLEAN.IS': clean})
+    
+    assert checks_of(issues, 'OHLC.IS') == {'ohlc_inconsistent': 2}
+    assert checks_of(issues, 'VOL.IS') == {'zero_volume': 1}
+    assert checks_of(issues, 'STALE.IS') == {'stale_price': 1}
+    assert checks_of(issues, 'SPLIT.IS') == {'split_jump': 1}
+    assert checks_of(issues, 'GAP.IS') == {'calendar_gap': 3}
+    assert checks_of(issues, 'DUP.IS') == {'duplicate_timestamp': 1}
+    assert 'CLEAN.IS' not in set(issues['Ticker'])
+    
+    split_row = issues[issues['Check'] == 'split_jump'].iloc[0]
+    assert split_row['First_Date'] == dates[50]
+    assert 79 < float(split_row['Detail'].split()[-1].rstrip('%')) < 81
+    gap_row = issues[issues['Check'] == 'calendar_gap'].iloc[0]
+    assert (gap_row['First_Date'], gap_row['Last_Date']) == (dates[40], dates[60])
+
+def test_intraday_bars_use_local_trading_days():
+    sessions = trading_dates('2025-03-26', '2025-04-04')
+    days = [pd.date_range(day + pd.Timedelta(hours=10), periods=96, freq='5min') for day in sessions]
+    index = days[0].append(days[1:]).tz_convert('UTC')
+    bars = make_bars(index)
+    weekend = make_bars(pd.date_range('2025-03-29 10:00', periods=12, freq='5min',
+                                      tz='Europe/Istanbul').tz_convert('UTC'), seed=2)
+    
+    issues = validate_universe({'INTRA.IS': bars,
+                                'WKND.IS': pd.concat([bars, weekend]).sort_index()})
+    
+    assert checks_of(issues, 'INTRA.IS') == {}
+    assert checks_of(issues, 'WKND.IS') == {'off_calendar': 12}
+
+def test_calendar_check_skips_years_without_holidays(caplog):
+    # 2023 sessions around Kurban Bayrami (not in the holiday table) followed by 2024 sessions
+    dates_2023 = pd.bdate_range('2023-06-01', '2023-12-29')
+    dates_2023 = dates_2023[~dates_2023.isin(pd.DatetimeIndex(['2023-06-27', '2023-06-28', '2023-06-29',
+                                                               '2023-06-30', '2023-10-30']))]
+    dates_2024 = bist_trading_days('2024-01-02', '2024-03-29')
+    dates = dates_2023.append(dates_2024).tz_localize('Europe/Istanbul')
+    bars = make_bars(dates)
+    
+    with caplog.at_level('INFO', logger='data_validator'):
+        issues = validate_universe({'OLD.IS': bars, 'GAP.IS': bars.drop(dates[-10:-8])})
+    
+    assert checks_of(issues, 'OLD.IS') == {}
+    assert checks_of(issues, 'GAP.IS') == {'calendar_gap': 2}
+    assert 'Calendar check skipped' in caplog.text and '2023' in caplog.text
+
+def test_summary_report_uses_issues_table(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dates = trading_dates()
+    good = make_bars(dates)
+    bad = make_bars(dates, 1)
+    bad.iloc[5, bad.columns.get_loc('Close')] = -1.0
+    
+    downloader = BISTDataDownloader(str(tmp_path / 'data'), fetcher=lambda *a, **k: None)
+    summary = downloader.generate_summary_report({'GOOD.IS': good, 'BAD.IS': bad, 'NONE.IS': None})
+    
+    assert summary.set_index('Ticker')['Data_Quality'].to_dict() == {'GOOD.IS': 'Valid',
+                                                                      'BAD.IS': 'Issues'}
+    assert 'nonpositive_price' in summary.set_index('Ticker').at['BAD.IS', 'Issues']
+    assert len(list((tmp_path / 'output').glob('validation_issues_*.csv'))) == 1
+    
+    overview = summarize_issues(validate_universe({'BAD.IS': bad}), ['BAD.IS', 'GOOD.IS'])
+    assert overview.loc['GOOD.IS', ['Errors', 'Warnings']].tolist() == [0, 0]
+    assert downloader.validate_data(good, 'GOOD.IS') and not downloader.validate_data(bad, 'BAD.IS')
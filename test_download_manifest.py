@@ -0,0 +1,188 @@
+"""
+BIST Trading System - Download Manifest Tests
+Checks the per-ticker checkpoint records and resuming an interrupted job
+"""
+
+import json
+import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_downloader import BISTDataDownloader
+from data_storage import CSVStorage, migrate_csv_storage
+from download_manifest import DownloadManifest
+
+def make_history(n=5):
+    dates = pd.date_range("2025-01-02", periods=n, freq="B", tz="Europe/Istanbul")
+    close = 10 + np.arange(n, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1,
+                         'Close': close, 'Volume': np.full(n, 1000)}, index=dates)
+
+class Fetcher:
+    def __init__(self, empty=(), failing=(), crash_on=None):
+        self.empty = set(empty)
+        self.failing = set(failing)
+        self.crash_on = crash_on
+        self.calls = []
+    
+    def __call__(self, ticker, period, interval, **kwargs):
+        self.calls.append(ticker)
+        if ticker == self.crash_on:
+            raise KeyboardInterrupt
+        if ticker in self.failing:
+            raise ValueError(f"bad response for {ticker}")
+        if ticker in self.empty:
+            return pd.DataFrame()
+        return make_history()
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+TICKERS = ["A.IS", "B.IS", "C.IS", "D.IS", "E.IS"]
+
+def test_manifest_records_each_outcome(workdir):
+    manifest = DownloadManifest("data")
+    downloader = BISTDataDownloader("data", fetcher=Fetcher(empty={"B.IS"}, failing={"C.IS"}),
+                                    manifest=manifest)
+    
+    downloader.download_multiple_tickers(TICKERS[:3], period="ytd", delay=0)
+    
+    with open(manifest.path) as f:
+        records = {record['ticker']: record for record in map(json.loads, f)}
+    assert records["A.IS"]['status'] == 'done'
+    assert records["A.IS"]['rows'] == 5 and records["A.IS"]['last_date'] == '2025-01-08'
+    assert records["A.IS"]['file'] == 'A_ytd_1d.csv' and len(records["A.IS"]['sha256']) == 64
+    assert records["B.IS"]['status'] == 'empty'
+    assert records["C.IS"]['status'] == 'failed' and 'bad response' in records["C.IS"]['error']
+    assert not os.path.exists(manifest.path + '.tmp')
+    assert DownloadManifest("data").summary(TICKERS) == {'done': 1, 'empty': 1, 'failed': 1,
+                                                         'running': 0, 'missing': 2}
+
+def test_interrupted_job_resumes_where_it_stopped(workdir):
+    manifest = DownloadManifest("data")
+    downloader = BISTDataDownloader("data", fetcher=Fetcher(crash_on="C.IS"), manifest=manifest)
+    with pytest.raises(KeyboardInterrupt):
+        downloader.download_multiple_tickers(TICKERS, period="ytd", delay=0)
+    
+    resumed = DownloadManifest("data")
+    assert resumed.get("C.IS")['status'] == 'running'
+    pending = resumed.pending(TICKERS)
+    assert pending == ["C.IS", "D.IS", "E.IS"]
+    
+    fetcher = Fetcher()
+    BISTDataDownloader("data", fetcher=fetcher, manifest=resumed).download_multiple_tickers(
+        pending, period="ytd", delay=0)
+    
+    assert fetcher.calls == pending
+    assert resumed.pending(TICKERS) == []
+    assert resumed.get("C.IS")['attempts'] == 2
+
+def test_changed_or_truncated_files_are_downloaded_again(workdir):
+    manifest = DownloadManifest("data")
+    BISTDataDownloader("data", fetcher=Fetcher(), manifest=manifest).download_multiple_tickers(
+        TICKERS[:2], period="ytd", delay=0)
+    
+    path = os.path.join("data", manifest.get("A.IS")['file'])
+    with open(path, 'r+') as f:
+        f.truncate(os.path.getsize(path) // 2)
+    os.remove(os.path.join("data", manifest.get("B.IS")['file']))
+    
+    assert manifest.pending(TICKERS[:2]) == ["A.IS", "B.IS"]
+    assert manifest.pending(TICKERS[:2], verify=False) == []
+
+def test_adopt_skips_half_written_files(workdir):
+    storage = CSVStorage("data")
+    os.makedirs("data")
+    storage.save("A.IS", make_history(), "ytd", "1d")
+    with open(os.path.join("data", "B_ytd_1d.csv"), 'w') as f:
+        f.write("Date,Open,High\n2025-01-02 00:00:00+03:00,1.0")
+    
+    manifest = DownloadManifest("data")
+    adopted = manifest.adopt(storage, TICKERS)
+    
+    assert adopted == ["A.IS"]
+    assert manifest.pending(TICKERS) == TICKERS[1:]
+
+def test_refresh_updates_the_record(workdir):
+    manifest = DownloadManifest("data")
+    downloader = BISTDataDownloader("data", fetcher=Fetcher(), manifest=manifest)
+    downloader.download_ticker_data("A.IS", period="ytd")
+    downloader.fetcher = lambda *args, **kwargs: make_history(n=8)
+    
+    downloader.refresh_ticker_data("A.IS", period="ytd")
+    
+    assert manifest.get("A.IS")['rows'] == 8
+    assert manifest.is_complete("A.IS")
+
+def test_download_job_writes_with_the_detected_backend(workdir, monkeypatch):
+    import download_all_tickers
+    
+    os.makedirs("data")
+    CSVStorage("data").save("A.IS", make_history(), "ytd", "1d")
+    migrate_csv_storage("data", "parquet", remove_csv=True)
+    
+    fetcher = Fetcher()
+    monkeypatch.setattr(download_all_tickers, 'BIST_TICKERS', TICKERS[:3])
+    monkeypatch.setattr(download_all_tickers, 'BISTDataDownloader',
+                        partial(BISTDataDownloader, fetcher=fetcher,
+                                batch_fetcher=lambda tickers, period, interval: pd.DataFrame()))
+    
+    assert download_all_tickers.main()
+    
+    assert sorted(fetcher.calls) == ["B.IS", "C.IS"]                   # A.IS was adopted from Parquet
+    assert sorted(os.listdir("data")) == ["A_ytd_1d.parquet", "B_ytd_1d.parquet", "C_ytd_1d.parquet",
+                                          "download_manifest.jsonl", "market_panel.json",
+                                          "market_panel.npy"]
+    assert DownloadManifest("data").pending(TICKERS[:3]) == []
+
+def test_updates_append_lines_and_compaction_keeps_the_latest(workdir):
+    manifest = DownloadManifest("data", compact_every=3)
+    for ticker in TICKERS[:3]:
+        manifest.start(ticker)
+        manifest.record_failure(ticker, "timeout")
+    
+    with open(manifest.path) as f:
+        assert len(f.readlines()) == 6                                 # appended, not rewritten
+    
+    # Three superseded lines trigger a compaction on the next update
+    manifest.start("A.IS")
+    with open(manifest.path) as f:
+        assert len(f.readlines()) == 3
+    
+    # A line cut short by a crash is skipped and the file compacted on load
+    manifest.start("B.IS")
+    with open(manifest.path, 'a') as f:
+        f.write('{"ticker":"C.IS","status":"do')
+    reopened = DownloadManifest("data")
+    assert reopened.get("A.IS")['status'] == 'running' and reopened.get("A.IS")['attempts'] == 2
+    assert reopened.get("C.IS")['status'] == 'failed'
+    with open(reopened.path) as f:
+        assert [json.loads(line)['ticker'] for line in f] == TICKERS[:3]
+    
+    reopened.record_empty("C.IS")
+    reopened.close()
+    with open(reopened.path) as f:
+        assert len(f.readlines()) == 3
+
+def test_read_only_manifest_never_compacts(workdir):
+    manifest = DownloadManifest("data")
+    manifest.start("A.IS")
+    manifest.record_failure("A.IS", "timeout")
+    
+    progress = DownloadManifest("data", read_only=True)
+    assert progress.get("A.IS")['status'] == 'failed'
+    with open(manifest.path) as f:
+        assert len(f.readlines()) == 2
+    with pytest.raises(ValueError):
+        progress.start("A.IS")
+    
+    # Lines the job appends after the progress check are all kept
+    manifest.start("B.IS")
+    progress.close()
+    with open(manifest.path) as f:
+        assert len(f.readlines()) == 3
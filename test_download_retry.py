@@ -0,0 +1,122 @@
+"""
+BIST Trading System - Download Retry Tests
+Checks backoff on transient failures and the end-of-run retry of failed tickers
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from yfinance.exceptions import YFRateLimitError
+
+import data_downloader
+from data_downloader import BISTDataDownloader, backoff_delay, call_with_retry, is_retryable
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type('Response', (), {'status_code': status_code})()
+
+def make_history(n=5):
+    dates = pd.date_range("2025-01-02", periods=n, freq="B")
+    close = 10 + np.arange(n, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1,
+                         'Close': close, 'Volume': np.full(n, 1000)}, index=dates)
+
+class FlakyFetcher:
+    """Fails each ticker a fixed number of times before returning data"""
+    
+    def __init__(self, failures, error=lambda: HTTPError(503)):
+        self.failures = dict(failures)
+        self.error = error
+        self.calls = []
+    
+    def __call__(self, ticker, period, interval, **kwargs):
+        self.calls.append(ticker)
+        if self.failures.get(ticker, 0) > 0:
+            self.failures[ticker] -= 1
+            raise self.error()
+        return make_history()
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_downloader.time, 'sleep', lambda seconds: None)
+    return tmp_path
+
+def test_retryable_errors():
+    assert is_retryable(YFRateLimitError())
+    assert is_retryable(HTTPError(429)) and is_retryable(HTTPError(502))
+    assert is_retryable(ConnectionError()) and is_retryable(TimeoutError())
+    assert not is_retryable(HTTPError(404))
+    assert not is_retryable(ValueError("bad symbol"))
+
+def test_backoff_grows_exponentially_with_jitter():
+    delays = [backoff_delay(attempt, base=1.0, cap=10.0) for attempt in range(6) for _ in range(200)]
+    per_attempt = np.array(delays).reshape(6, 200)
+    
+    assert (per_attempt >= 0).all()
+    assert (per_attempt.max(axis=1) <= [1, 2, 4, 8, 10, 10]).all()
+    assert per_attempt[3].std() > 0.5
+
+def test_call_with_retry_stops_on_permanent_errors(workdir):
+    fetcher = FlakyFetcher({"A.IS": 5}, error=lambda: ValueError("bad symbol"))
+    
+    with pytest.raises(ValueError):
+        call_with_retry(fetcher, "A.IS", "1y", "1d", attempts=3)
+    assert len(fetcher.calls) == 1
+
+def test_call_with_retry_always_makes_one_attempt(workdir):
+    fetcher = FlakyFetcher({"A.IS": 5})
+    
+    with pytest.raises(HTTPError):
+        call_with_retry(fetcher, "A.IS", "1y", "1d", attempts=0)
+    assert len(fetcher.calls) == 1
+
+def test_retries_take_rate_limit_tokens(workdir, monkeypatch):
+    acquired = []
+    monkeypatch.setattr(data_downloader.TokenBucket, 'acquire', lambda self, tokens=1.0: acquired.append(self))
+    
+    fetcher = FlakyFetcher({"A.IS": 2, "B.IS": 1}, error=YFRateLimitError)
+    limiter = data_downloader.TokenBucket(1000)
+    assert call_with_retry(fetcher, "A.IS", "1y", "1d", attempts=3, limiter=limiter) is not None
+    assert acquired == [limiter] * 3
+    
+    # Concurrent downloads run every attempt, retries included, through one shared bucket
+    acquired.clear()
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher, retry_attempts=3)
+    downloader.download_multiple_tickers(["B.IS", "C.IS"], max_workers=2, requests_per_second=1000)
+    assert len(acquired) == 3 and len(set(acquired)) == 1
+    assert downloader._limiter is None
+
+def test_transient_failures_are_retried(workdir):
+    fetcher = FlakyFetcher({"A.IS": 2, "B.IS": 1}, error=YFRateLimitError)
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher, retry_attempts=3)
+    
+    results = downloader.download_multiple_tickers(["A.IS", "B.IS", "C.IS"], delay=0)
+    
+    assert list(results) == ["A.IS", "B.IS", "C.IS"]
+    assert fetcher.calls.count("A.IS") == 3
+    assert not downloader.failed_tickers
+
+def test_failed_queue_is_retried_at_the_end(workdir):
+    fetcher = FlakyFetcher({"B.IS": 3, "D.IS": 10})
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher, retry_attempts=3)
+    
+    results = downloader.download_multiple_tickers(["A.IS", "B.IS", "C.IS", "D.IS"], delay=0,
+                                                   max_workers=2, requests_per_second=1000)
+    
+    assert list(results) == ["A.IS", "B.IS", "C.IS"]
+    assert fetcher.calls[-4:] == ["B.IS", "D.IS", "D.IS", "D.IS"]
+    assert downloader.failed_tickers == {"D.IS"}
+
+def test_refresh_uses_the_retry_layer(workdir):
+    fetcher = FlakyFetcher({"A.IS": 1})
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher)
+    downloader.download_ticker_data("A.IS", period="ytd")
+    fetcher.failures["A.IS"] = 2
+    
+    assert downloader.refresh_ticker_data("A.IS", period="ytd") is not None
+    assert fetcher.calls.count("A.IS") == 5
+
+def test_session_is_shared():
+    assert data_downloader.get_session() is data_downloader.get_session()
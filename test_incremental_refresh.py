@@ -0,0 +1,116 @@
+"""
+BIST Trading System - Incremental Refresh Tests
+Checks that refreshes only fetch and append the missing bars
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_downloader import BISTDataDownloader
+from data_storage import CSVStorage, _csv_tail_offset
+
+FULL_HISTORY = pd.DataFrame({
+    'Open': np.arange(10, 20, dtype=float),
+    'High': np.arange(11, 21, dtype=float),
+    'Low': np.arange(9, 19, dtype=float),
+    'Close': np.arange(10, 20, dtype=float) + 0.5,
+    'Volume': np.arange(1000, 11000, 1000),
+}, index=pd.DatetimeIndex(pd.date_range('2025-01-02', periods=10, freq='B',
+                                         tz='Europe/Istanbul'), name='Date'))
+
+class MarketFetcher:
+    """Serves history up to a movable 'today', recording every request"""
+    
+    def __init__(self, available):
+        self.history = FULL_HISTORY.copy()
+        self.available = available
+        self.requests = []
+    
+    def __call__(self, ticker, period, interval, start=None):
+        self.requests.append(start)
+        data = self.history.iloc[:self.available]
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start, tz=data.index.tz)]
+        return data.copy()
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_csv_tail_offset(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_bytes(b"h\na\nb\nc\n")
+    assert _csv_tail_offset(str(path), 2, block_size=3) == len(b"h\na\n")
+    assert _csv_tail_offset(str(path), 0) == len(b"h\na\nb\nc\n")
+
+def test_replace_tail_leaves_the_file_intact_on_failure(tmp_path, monkeypatch):
+    storage = CSVStorage(str(tmp_path))
+    path = storage.save("THYAO.IS", FULL_HISTORY.iloc[:6], "ytd", "1d")
+    before = open(path, 'rb').read()
+    
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(pd.DataFrame, 'to_csv', crash)
+    with pytest.raises(OSError):
+        storage.replace_tail(path, FULL_HISTORY.iloc[:6], FULL_HISTORY.iloc[5:], 1)
+    
+    assert open(path, 'rb').read() == before
+
+def test_refresh_appends_only_missing_bars(workdir):
+    fetcher = MarketFetcher(available=6)
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher)
+    downloader.download_ticker_data("THYAO.IS", period="ytd")
+    
+    # The last stored bar is revised after the close, then four new bars arrive
+    fetcher.history.iloc[5, fetcher.history.columns.get_loc('Close')] = 99.0
+    fetcher.available = 10
+    
+    merged = downloader.refresh_ticker_data("THYAO.IS", period="ytd")
+    
+    assert fetcher.requests[-1] == '2025-01-09'
+    assert len(merged) == 10
+    assert not merged.index.duplicated().any()
+    assert merged['Close'].iloc[5] == 99.0
+    
+    stored = pd.read_csv(workdir / "data" / "THYAO_ytd_1d.csv", index_col=0, parse_dates=True)
+    pd.testing.assert_series_equal(stored['Close'], merged['Close'], check_freq=False)
+    assert (stored['Ticker'] == "THYAO.IS").all()
+    
+    # Rows before the revised bar are byte-identical to a fresh full download
+    full = BISTDataDownloader(str(workdir / "full"), fetcher=MarketFetcher(available=10))
+    full.download_ticker_data("THYAO.IS", period="ytd")
+    expected = (workdir / "full" / "THYAO_ytd_1d.csv").read_text().splitlines()
+    refreshed = (workdir / "data" / "THYAO_ytd_1d.csv").read_text().splitlines()
+    assert refreshed[:6] == expected[:6]
+    assert refreshed[7:] == expected[7:]
+
+def test_refresh_after_a_split_downloads_full_history(workdir):
+    fetcher = MarketFetcher(available=6)
+    fetcher.history['Dividends'] = 0.0
+    fetcher.history['Stock Splits'] = 0.0
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher)
+    downloader.download_ticker_data("THYAO.IS", period="ytd")
+    
+    # A 2:1 split on day 8 halves every earlier adjusted price
+    prices = ['Open', 'High', 'Low', 'Close']
+    fetcher.history.iloc[:7, [fetcher.history.columns.get_loc(col) for col in prices]] /= 2
+    fetcher.history.iloc[7, fetcher.history.columns.get_loc('Stock Splits')] = 2.0
+    fetcher.available = 10
+    
+    merged = downloader.refresh_ticker_data("THYAO.IS", period="ytd")
+    
+    assert fetcher.requests == [None, '2025-01-09', None]
+    np.testing.assert_allclose(merged['Close'], fetcher.history['Close'])
+
+def test_refresh_without_file_downloads_full_history(workdir):
+    fetcher = MarketFetcher(available=10)
+    downloader = BISTDataDownloader(str(workdir / "data"), fetcher=fetcher)
+    
+    results = downloader.download_multiple_tickers(["GARAN.IS"], period="ytd",
+                                                   delay=0, incremental=True)
+    
+    assert fetcher.requests == [None]
+    assert len(results["GARAN.IS"]) == 10
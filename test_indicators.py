@@ -0,0 +1,113 @@
+"""
+BIST Trading System - Technical Indicator Tests
+Checks the batch indicators against per-ticker pandas, the cache and the full-universe speed
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_downloader import BISTDataDownloader
+from data_storage import CSVStorage
+from indicators import INDICATORS_NAME, compute_indicators, load_indicators
+from market_panel import MarketPanel
+
+def make_history(n=120, seed=0, start='2025-01-02'):
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.date_range(start, periods=n, freq='B',
+                                           tz='Europe/Istanbul'), name='Date')
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    return pd.DataFrame({
+        'Open': close, 'High': close * (1 + rng.uniform(0, 0.03, n)),
+        'Low': close * (1 - rng.uniform(0, 0.03, n)), 'Close': close,
+        'Volume': rng.integers(1e5, 1e7, n),
+    }, index=index)
+
+def reference_indicators(data):
+    """Per-ticker pandas versions of every indicator"""
+    close = data['Close']
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    middle = close.rolling(20).mean()
+    std = close.rolling(20).std()
+    prev_close = close.shift()
+    true_range = pd.concat([data['High'] - data['Low'], (data['High'] - prev_close).abs(),
+                            (data['Low'] - prev_close).abs()], axis=1).max(axis=1)
+    return pd.DataFrame({
+        'SMA_20': middle,
+        'EMA_20': close.ewm(span=20, adjust=False).mean(),
+        'RSI_14': 100 - 100 / (1 + gain / loss),
+        'MACD': macd,
+        'MACD_Signal': signal,
+        'MACD_Hist': macd - signal,
+        'BB_Upper': middle + 2 * std,
+        'BB_Middle': middle,
+        'BB_Lower': middle - 2 * std,
+        'ATR_14': true_range.ewm(alpha=1 / 14, adjust=False, min_periods=14).mean(),
+        'OBV': (np.sign(delta.fillna(0)) * data['Volume']).cumsum(),
+    })
+
+def test_batch_indicators_match_per_ticker_pandas():
+    suspended = make_history(seed=2)
+    suspended = suspended.drop(suspended.index[50:58])
+    data_dict = {
+        "THYAO.IS": make_history(seed=1),
+        "GARAN.IS": suspended,
+        "AKBNK.IS": make_history(n=70, seed=3, start='2025-03-03'),
+    }
+    
+    indicators = compute_indicators(MarketPanel.from_data_dict(data_dict))
+    
+    for ticker, data in data_dict.items():
+        expected = reference_indicators(data)
+        result = indicators.ticker(ticker).reindex(columns=expected.columns)
+        result.index = expected.index
+        assert indicators.ticker(ticker).shape[0] == len(data)
+        pd.testing.assert_frame_equal(result, expected, check_names=False, check_freq=False,
+                                      check_dtype=False, rtol=1e-9, atol=1e-6)
+
+def test_indicators_are_cached_next_to_the_data(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = CSVStorage(str(tmp_path))
+    storage.save("THYAO.IS", make_history(seed=1), "ytd", "1d")
+    storage.save("GARAN.IS", make_history(seed=2), "ytd", "1d")
+    
+    first = load_indicators(data_dir=str(tmp_path))
+    cached = load_indicators(data_dir=str(tmp_path))
+    
+    assert isinstance(cached.values, np.memmap)
+    np.testing.assert_array_equal(first.values, cached.values)
+    assert cached.tickers == first.tickers and cached.fields == first.fields
+    
+    other = load_indicators(data_dir=str(tmp_path), parameters={'sma': 10})
+    assert 'SMA_10' in other.fields
+    
+    downloader = BISTDataDownloader(str(tmp_path), fetcher=lambda *args, **kwargs: make_history(seed=9))
+    downloader.download_ticker_data("AKBNK.IS", period="ytd")
+    assert not os.path.exists(tmp_path / f"{INDICATORS_NAME}.npy")
+    assert "AKBNK.IS" in load_indicators(data_dir=str(tmp_path))
+
+def test_full_universe_benchmark():
+    rng = np.random.default_rng(0)
+    n_dates, n_tickers = 250, 600
+    dates = pd.date_range('2024-01-02', periods=n_dates, freq='B', tz='Europe/Istanbul')
+    close = 50 * np.cumprod(1 + rng.normal(0, 0.02, (n_dates, n_tickers)), axis=0)
+    close[:rng.integers(0, 100), :50] = np.nan
+    values = np.stack([close, close * 1.01, close * 0.99, close,
+                       rng.integers(1e5, 1e7, (n_dates, n_tickers)).astype(float)])
+    panel = MarketPanel(values, dates, [f"T{i:03d}.IS" for i in range(n_tickers)],
+                        ['Open', 'High', 'Low', 'Close', 'Volume'])
+    
+    start = time.perf_counter()
+    indicators = compute_indicators(panel)
+    elapsed = time.perf_counter() - start
+    
+    print(f"\n{len(indicators.fields)} indicators for {n_tickers} tickers x {n_dates} days "
+          f"in {elapsed:.3f}s")
+    assert indicators.values.shape == (11, n_dates, n_tickers)
+    assert elapsed < 1.0
@@ -0,0 +1,151 @@
+"""
+BIST Trading System - Intraday Storage Tests
+Checks partitioned writes, range reads and the streaming statistics
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_downloader import BISTDataDownloader
+from download_manifest import DownloadManifest
+from intraday_storage import (PartitionedStorage, intraday_market_stats, periods_per_year,
+                              resample_bars)
+from market_panel import MarketPanel
+from market_stats import compute_market_stats
+
+def make_bars(days=5, start='2025-03-03', seed=0, interval_minutes=5):
+    """Synthetic 10:00-18:00 session bars in UTC, like Yahoo returns them"""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range(start, periods=days)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta(hours=10), day + pd.Timedelta(hours=17, minutes=55),
+                      freq=f'{interval_minutes}min', tz='Europe/Istanbul').tz_convert('UTC')
+        for day in sessions
+    ]))
+    close = 50 * np.cumprod(1 + rng.normal(0, 0.002, len(index)))
+    return pd.DataFrame({
+        'Open': close * 0.999, 'High': close * 1.002, 'Low': close * 0.998, 'Close': close,
+        'Volume': rng.integers(100, 10000, len(index)),
+    }, index=index)
+
+def test_append_partitions_by_local_day(tmp_path):
+    storage = PartitionedStorage(str(tmp_path), interval='5m')
+    storage.append('THYAO.IS', make_bars(days=3))
+    
+    assert storage.tickers() == ['THYAO.IS']
+    assert storage.dates('THYAO.IS') == ['2025-03-03', '2025-03-04', '2025-03-05']
+    day = storage.read('THYAO.IS', '2025-03-04', '2025-03-04')
+    assert len(day) == 96
+    assert str(day.index.tz) == 'Europe/Istanbul'
+    assert day.index.min().hour == 10
+
+def test_append_only_rewrites_touched_days(tmp_path):
+    storage = PartitionedStorage(str(tmp_path), interval='5m')
+    bars = make_bars(days=3)
+    storage.append('THYAO.IS', bars.iloc[:-10])
+    first_day = storage.partition_path('THYAO.IS', '2025-03-03')
+    mtime = os.stat(first_day).st_mtime_ns
+    
+    # Re-sent bars of the last day are replaced, earlier days are left alone
+    update = bars.iloc[-20:].copy()
+    update['Close'] = 1.0
+    written = storage.append('THYAO.IS', update)
+    
+    assert written == [storage.partition_path('THYAO.IS', '2025-03-05')]
+    assert os.stat(first_day).st_mtime_ns == mtime
+    stored = storage.read('THYAO.IS')
+    assert len(stored) == len(bars)
+    assert stored.index.is_monotonic_increasing
+    assert (stored['Close'].iloc[-20:] == 1.0).all()
+
+def test_range_read_only_opens_requested_partitions(tmp_path, monkeypatch):
+    storage = PartitionedStorage(str(tmp_path), interval='5m')
+    for seed, ticker in enumerate(['AKBNK.IS', 'GARAN.IS', 'THYAO.IS']):
+        storage.append(ticker, make_bars(days=10, seed=seed))
+    
+    opened = []
+    read_partition = storage._read_partition
+    monkeypatch.setattr(storage, '_read_partition',
+                        lambda path, columns=None: opened.append(path) or read_partition(path, columns))
+    
+    frames = storage.read_range(['AKBNK.IS', 'THYAO.IS'], '2025-03-10', '2025-03-11',
+                                columns=['Close'], max_workers=2)
+    
+    assert sorted(frames) == ['AKBNK.IS', 'THYAO.IS']
+    assert list(frames['THYAO.IS'].columns) == ['Close']
+    assert len(frames['THYAO.IS']) == 2 * 96
+    assert len(opened) == 4
+
+def test_streaming_stats_match_market_stats(tmp_path):
+    storage = PartitionedStorage(str(tmp_path), interval='5m')
+    data_dict = {}
+    for seed, ticker in enumerate(['AKBNK.IS', 'GARAN.IS', 'THYAO.IS']):
+        bars = make_bars(days=6, seed=seed)
+        if seed == 1:
+            bars = bars.iloc[200:]          # starts mid-session
+        storage.append(ticker, bars)
+        data_dict[ticker] = storage.read(ticker)
+    
+    streamed = intraday_market_stats(storage).set_index('Ticker')
+    expected = compute_market_stats(MarketPanel.from_data_dict(data_dict),
+                                    periods_per_year('5m')).set_index('Ticker')
+    
+    assert periods_per_year('5m') == 96 * 252
+    assert list(streamed.index) == list(expected.index)
+    assert (streamed[['Records', 'Start_Date', 'End_Date']] ==
+            expected[['Records', 'Start_Date', 'End_Date']]).all().all()
+    numeric = ['Min_Close', 'Max_Close', 'Last_Close', 'Total_Return', 'Avg_Volume', 'Volatility']
+    np.testing.assert_allclose(streamed[numeric].to_numpy(dtype=float),
+                               expected[numeric].to_numpy(dtype=float), rtol=1e-9)
+
+def test_resampled_data_dict_matches_full_resample(tmp_path):
+    storage = PartitionedStorage(str(tmp_path), interval='5m')
+    storage.append('THYAO.IS', make_bars(days=4))
+    full = storage.read('THYAO.IS')
+    
+    hourly = storage.load_data_dict(rule='1h')['THYAO.IS']
+    pd.testing.assert_frame_equal(hourly, resample_bars(full, '1h'), check_names=False,
+                                  check_freq=False, check_dtype=False)
+    
+    daily = storage.load_data_dict(rule='1D')['THYAO.IS']
+    assert len(daily) == 4
+    assert daily['Volume'].sum() == full['Volume'].sum()
+    assert daily['High'].iloc[0] == full['High'].iloc[:96].max()
+    assert daily['Close'].iloc[-1] == full['Close'].iloc[-1]
+
+def test_download_intraday_resumes_from_last_partition(tmp_path):
+    bars = make_bars(days=3)
+    calls = []
+    
+    def fetcher(ticker, period, interval, start=None):
+        calls.append((period, interval, start))
+        return bars if start is None else bars.iloc[-30:]
+    
+    storage = PartitionedStorage(str(tmp_path / 'intraday'), interval='5m')
+    downloader = BISTDataDownloader(str(tmp_path), fetcher=fetcher)
+    downloader.download_intraday_data('THYAO.IS', '5m', storage)
+    downloader.download_intraday_data('THYAO.IS', '5m', storage)
+    
+    assert calls == [('60d', '5m', None), ('60d', '5m', '2025-03-05')]
+    assert len(storage.read('THYAO.IS')) == len(bars)
+
+def test_intraday_failure_leaves_the_daily_manifest_alone(tmp_path):
+    def fetcher(ticker, period, interval, start=None):
+        if interval == '5m':
+            raise TimeoutError("read timed out")
+        return make_bars(days=3).resample('1D').last().dropna()
+    
+    manifest = DownloadManifest(str(tmp_path))
+    downloader = BISTDataDownloader(str(tmp_path), fetcher=fetcher, manifest=manifest,
+                                    retry_attempts=1)
+    downloader.download_ticker_data('THYAO.IS', 'ytd', '1d')
+    assert manifest.is_complete('THYAO.IS')
+    
+    storage = PartitionedStorage(str(tmp_path / 'intraday'), interval='5m')
+    assert downloader.download_intraday_data('THYAO.IS', '5m', storage) is None
+    
+    assert manifest.get('THYAO.IS')['status'] == 'done'
+    assert manifest.is_complete('THYAO.IS')
+    assert downloader.failed_tickers == set()
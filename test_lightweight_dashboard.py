@@ -0,0 +1,54 @@
+"""
+BIST Trading System - Lightweight Dashboard Tests
+Checks the small dashboard page and its lazily loaded side-car data
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from data_visualizer import BISTDataVisualizer
+from lightweight_dashboard import dashboard_series
+
+def make_data(n_tickers=40, n=1500):
+    rng = np.random.default_rng(2)
+    index = pd.date_range('2020-01-02', periods=n, freq='B', tz='Europe/Istanbul')
+    return {f"T{i:02d}.IS": pd.DataFrame({
+        'Close': 10 * np.cumprod(1 + rng.normal(0, 0.02, n)),
+        'Volume': rng.integers(1e5, 1e7, n),
+    }, index=index) for i in range(n_tickers)}
+
+def read_sidecar(path):
+    with open(path) as f:
+        text = f.read()
+    return json.loads(text[text.index('=') + 1:].strip().rstrip(';'))
+
+def test_dashboard_html_stays_small_and_data_is_lazy(tmp_path):
+    data_dict = make_data()
+    save_path = str(tmp_path / "dashboard.html")
+    
+    BISTDataVisualizer(str(tmp_path)).create_lightweight_dashboard(data_dict, save_path, max_points=300)
+    
+    with open(save_path) as f:
+        html = f.read()
+    assert os.path.getsize(save_path) < 20000
+    assert 'scattergl' in html and '"T39.IS"' in html
+    assert os.path.exists(tmp_path / "plotly.min.js")
+    
+    sidecars = sorted(os.listdir(tmp_path / "dashboard_data"))
+    assert len(sidecars) == 40
+    series = read_sidecar(tmp_path / "dashboard_data" / "T00.IS.js")
+    assert series['rows'] == 1500
+    assert 300 <= series['points'] <= 600
+    assert len(series['dates']) == len(series['close']) == len(series['volume'])
+    assert series['dates'][0] == '2020-01-02'
+
+def test_series_keeps_volume_spikes():
+    data = make_data(n_tickers=1)["T00.IS"]
+    data.iloc[777, 1] = 10**10
+    
+    series = dashboard_series(data, max_points=100)
+    
+    assert 10**10 in series['volume']
@@ -0,0 +1,64 @@
+"""
+BIST Trading System - Loader Benchmark
+Times the parallel loader against the original per-file read_csv loop on a synthetic 600-file directory
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_storage import CSVStorage, load_market_data
+
+N_FILES = 600
+
+@pytest.fixture(scope="module")
+def market_dir(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("data")
+    rng = np.random.default_rng(42)
+    index = pd.DatetimeIndex(pd.date_range('2025-01-02', periods=250, freq='B',
+                                           tz='Europe/Istanbul'), name='Date')
+    for i in range(N_FILES):
+        close = 50 * np.cumprod(1 + rng.normal(0, 0.02, len(index)))
+        data = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': rng.integers(1e5, 1e7, len(index)), 'Dividends': 0.0,
+            'Stock Splits': 0.0, 'Ticker': f"T{i:03d}.IS",
+        }, index=index)
+        data.to_csv(data_dir / f"T{i:03d}_ytd_1d.csv")
+    # One corrupt and one incomplete file end up in the report, not in the output
+    (data_dir / "BROKEN_ytd_1d.csv").write_text("Date,Close\nnot-a-date,abc\n")
+    (data_dir / "NOVOL_ytd_1d.csv").write_text("Date,Close\n2025-01-02 00:00:00+03:00,1.0\n")
+    return str(data_dir)
+
+def baseline_load(data_dir):
+    """The original loader loop from create_mega_viz.load_all_bist_data"""
+    data_dict = {}
+    for file in [f for f in os.listdir(data_dir) if f.endswith('.csv')]:
+        try:
+            data = pd.read_csv(os.path.join(data_dir, file), index_col=0, parse_dates=True)
+            if not data.empty and 'Close' in data.columns and 'Volume' in data.columns:
+                data_dict[file.split('_')[0] + '.IS'] = data
+        except Exception:
+            pass
+    return data_dict
+
+def test_parallel_loader_benchmark(market_dir):
+    start = time.perf_counter()
+    expected = baseline_load(market_dir)
+    baseline_elapsed = time.perf_counter() - start
+    
+    data_dict, report = load_market_data(CSVStorage(market_dir), max_workers=8)
+    
+    assert report['files'] == N_FILES + 2
+    assert report['loaded'] == N_FILES
+    assert report['skipped'] == ['NOVOL_ytd_1d.csv']
+    assert [file for file, _ in report['failed']] == ['BROKEN_ytd_1d.csv']
+    assert report['elapsed'] < baseline_elapsed
+    
+    assert sorted(data_dict) == sorted(expected)
+    sample = data_dict['T123.IS']
+    assert sample['Volume'].dtype == np.int64
+    pd.testing.assert_frame_equal(sample, expected['T123.IS'], check_index_type=False)
@@ -0,0 +1,95 @@
+"""
+BIST Trading System - Market Panel Tests
+Builds, saves and memory-maps the consolidated market panel
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from create_mega_viz import load_all_bist_data
+from dash_app import create_app
+from data_downloader import BISTDataDownloader
+from data_storage import CSVStorage
+from market_panel import MarketPanel, load_saved_panel, panel_exists
+from returns_cache import load_returns_cache
+
+def make_frames():
+    index = pd.date_range('2025-01-02', periods=6, freq='B', tz='Europe/Istanbul')
+    full = pd.DataFrame({
+        'Open': np.arange(6.0), 'High': np.arange(6.0) + 1, 'Low': np.arange(6.0) - 1,
+        'Close': np.arange(6.0) + 0.5, 'Volume': np.arange(6) * 1000 + 123456789,
+    }, index=index)
+    # Late listing with an index read back from CSV (fixed UTC offset)
+    late = full.iloc[3:].copy() * 2
+    late.index = pd.DatetimeIndex(late.index.strftime('%Y-%m-%d %H:%M:%S%z')).as_unit('us')
+    return {'THYAO.IS': full, 'AKBNK.IS': late}
+
+def test_panel_aligns_tickers_on_union_of_dates():
+    panel = MarketPanel.from_data_dict(make_frames())
+    
+    assert panel.values.shape == (5, 6, 2)
+    close = panel.field('Close')
+    assert list(close.columns) == ['THYAO.IS', 'AKBNK.IS']
+    assert close['AKBNK.IS'].isna().sum() == 3
+    assert np.shares_memory(close.to_numpy(), panel.values)
+    
+    akbnk = panel.ticker('AKBNK.IS')
+    assert len(akbnk) == 3
+    assert akbnk['Close'].iloc[0] == 7.0
+
+def test_panel_round_trip_is_memory_mapped(tmp_path):
+    panel = MarketPanel.from_data_dict(make_frames())
+    panel.save(str(tmp_path))
+    
+    assert panel_exists(str(tmp_path))
+    opened = MarketPanel.open(str(tmp_path))
+    
+    assert isinstance(opened.values, np.memmap)
+    assert opened.tickers == panel.tickers
+    assert opened.dates.equals(panel.dates)
+    np.testing.assert_array_equal(opened.values, panel.values)
+    # Volumes survive exactly
+    assert opened.field('Volume')['THYAO.IS'].iloc[-1] == 123461789
+
+def test_index_rejects_values_from_another_save(tmp_path):
+    MarketPanel.from_data_dict(make_frames()).save(str(tmp_path / "a"))
+    other = MarketPanel.from_data_dict({'GARAN.IS': make_frames()['THYAO.IS']})
+    other.save(str(tmp_path / "b"))
+    
+    # As if a crash or a reader hit the gap between the two renames of a save
+    shutil.copy(tmp_path / "b" / "market_panel.npy", tmp_path / "a" / "market_panel.npy")
+    
+    with pytest.raises(ValueError):
+        MarketPanel.open(str(tmp_path / "a"))
+    assert load_saved_panel(CSVStorage(str(tmp_path / "a"))) is None
+
+def test_consumers_open_the_saved_panel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    storage = CSVStorage("data")
+    for i, ticker in enumerate(['THYAO.IS', 'GARAN.IS', 'AKBNK.IS']):
+        data = make_frames()['THYAO.IS'] * (i + 1)
+        data['Dividends'] = 0.0
+        data.iloc[2, data.columns.get_loc('Dividends')] = 0.5
+        storage.save(ticker, data, "ytd", "1d")
+    BISTDataDownloader("data").update_panel()
+    
+    # While the files are unchanged nothing parses them again
+    def no_parsing(self, filepath):
+        raise AssertionError(f"{filepath} was parsed")
+    with monkeypatch.context() as patched:
+        patched.setattr(CSVStorage, 'load', no_parsing)
+        universe = load_all_bist_data()
+        assert sorted(universe) == ['AKBNK.IS', 'GARAN.IS', 'THYAO.IS']
+        assert universe['GARAN.IS']['Dividends'].iloc[2] == 0.5
+        assert sorted(load_returns_cache(storage=storage).tickers) == sorted(universe)
+        assert sorted(create_app("data").market_cache.data_dict) == sorted(universe)
+    
+    path = storage.save('THYAO.IS', make_frames()['THYAO.IS'].iloc[:4], "ytd", "1d")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    assert load_saved_panel(storage) is None
+    assert len(load_all_bist_data()['THYAO.IS']) == 4
@@ -0,0 +1,66 @@
+"""
+BIST Trading System - Market Statistics Tests
+Checks the vectorized engine against the original per-ticker loop
+"""
+
+import numpy as np
+import pandas as pd
+
+from market_panel import MarketPanel
+from market_stats import aligned_returns, compute_market_stats
+
+def reference_stats(data_dict):
+    """The per-ticker loop previously used by create_mega_viz.create_market_overview"""
+    rows = []
+    for ticker, data in data_dict.items():
+        rows.append({
+            'Ticker': ticker,
+            'Records': len(data),
+            'Start_Date': data.index.min().strftime('%Y-%m-%d'),
+            'End_Date': data.index.max().strftime('%Y-%m-%d'),
+            'Min_Close': data['Close'].min(),
+            'Max_Close': data['Close'].max(),
+            'Last_Close': data['Close'].iloc[-1],
+            'Total_Return': ((data['Close'].iloc[-1] / data['Close'].iloc[0]) - 1) * 100,
+            'Avg_Volume': data['Volume'].mean(),
+            'Volatility': data['Close'].pct_change().std() * np.sqrt(252) * 100,
+        })
+    return pd.DataFrame(rows)
+
+def make_universe(n_tickers=40, n_days=120, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-02', periods=n_days, freq='B', tz='Europe/Istanbul')
+    data_dict = {}
+    for i in range(n_tickers):
+        close = 20 * np.cumprod(1 + rng.normal(0, 0.03, n_days))
+        data = pd.DataFrame({'Close': close, 'Volume': rng.integers(1e3, 1e7, n_days)},
+                            index=dates)
+        if i % 5 == 1:
+            data = data.iloc[rng.integers(10, 60):]          # late listing
+        if i % 7 == 2:
+            data = data.drop(data.index[20:35])              # suspension gap
+        if i % 11 == 3:
+            data.iloc[40, 0] = np.nan                        # missing close inside
+        data_dict[f"T{i:02d}.IS"] = data
+    return data_dict
+
+def test_engine_matches_per_ticker_loop():
+    data_dict = make_universe()
+    expected = reference_stats(data_dict)
+    
+    stats = compute_market_stats(MarketPanel.from_data_dict(data_dict, fields=['Close', 'Volume']))
+    
+    assert list(stats['Ticker']) == list(expected['Ticker'])
+    for col in ['Records', 'Start_Date', 'End_Date']:
+        assert list(stats[col]) == list(expected[col]), col
+    for col in ['Min_Close', 'Max_Close', 'Last_Close', 'Total_Return', 'Avg_Volume', 'Volatility']:
+        np.testing.assert_allclose(stats[col], expected[col], rtol=1e-12, err_msg=col)
+
+def test_aligned_returns_skip_days_without_bars():
+    close = np.array([[10.0, np.nan],
+                      [np.nan, 5.0],
+                      [11.0, 6.0]])
+    returns = aligned_returns(close)
+    
+    np.testing.assert_allclose(returns[2], [0.1, 0.2])
+    assert np.isnan(returns[:2]).all()
@@ -0,0 +1,125 @@
+"""
+BIST Trading System - Market Universe Tests
+Checks the compact container against the per-ticker frames it replaces
+"""
+
+import pickle
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from create_mega_viz import create_market_overview
+from data_storage import CSVStorage, load_market_data
+from data_visualizer import BISTDataVisualizer
+from market_panel import MarketPanel
+from market_universe import MarketUniverse, load_universe, select_tickers
+
+def make_data_dict(n_tickers=60, n_days=250, seed=5):
+    """Frames shaped like the downloaded files, including the per-row Ticker column"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2025-01-02', periods=n_days, tz='Europe/Istanbul')
+    data_dict = {}
+    for i in range(n_tickers):
+        close = 20 * np.cumprod(1 + rng.normal(0, 0.02, n_days))
+        data = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': rng.integers(1e3, 1e7, n_days), 'Dividends': 0.0, 'Stock Splits': 0.0,
+        }, index=dates)
+        if i % 4 == 1:
+            data = data.iloc[rng.integers(20, 100):]                   # late listing
+        if i % 6 == 2:
+            data = data.drop(data.index[30:40])                        # suspension
+        if i % 5 == 0:
+            data.iloc[-10, data.columns.get_loc('Dividends')] = 0.35      # cash dividend
+        data['Ticker'] = f'T{i:03d}.IS'
+        data_dict[f'T{i:03d}.IS'] = data
+    return data_dict
+
+def test_ticker_views_match_the_frames():
+    data_dict = make_data_dict()
+    universe = MarketUniverse.from_data_dict(data_dict)
+    
+    assert len(universe) == len(data_dict) and list(universe) == list(data_dict)
+    assert 'T001.IS' in universe and 'NOPE.IS' not in universe
+    for ticker in ('T000.IS', 'T001.IS', 'T002.IS'):
+        view, original = universe[ticker], data_dict[ticker]
+        pd.testing.assert_index_equal(view.index, original.index, check_names=False)
+        np.testing.assert_allclose(view['Close'], original['Close'], rtol=1e-6)
+        np.testing.assert_array_equal(view['Volume'], original['Volume'])
+        assert view['Close'].dtype == np.float32 and view['Volume'].dtype == np.int64
+        # Corporate actions and the Ticker column survive the packing
+        assert list(view.columns) == list(original.columns)
+        pd.testing.assert_series_equal(view['Dividends'], original['Dividends'], check_names=False,
+                                       check_index_type=False, check_freq=False)
+        assert (view['Ticker'] == ticker).all()
+
+def test_universe_is_several_times_smaller():
+    data_dict = make_data_dict()
+    frames_bytes = sum(data.memory_usage(deep=True).sum() for data in data_dict.values())
+    universe = MarketUniverse.from_data_dict(data_dict)
+    
+    assert frames_bytes / universe.nbytes > 3
+    assert not hasattr(universe, '__dict__')
+
+def test_cross_sections_and_panels():
+    data_dict = make_data_dict()
+    universe = MarketUniverse.from_data_dict(data_dict)
+    
+    day = universe.dates[50]
+    section = universe.cross_section('Close', day)
+    expected = pd.Series({ticker: data['Close'].get(day, np.nan) for ticker, data in data_dict.items()})
+    np.testing.assert_allclose(section.to_numpy(), expected.to_numpy(), rtol=1e-6)
+    
+    panel = universe.to_panel(['Close', 'Volume'])
+    reference = MarketPanel.from_data_dict(data_dict, fields=['Close', 'Volume'])
+    np.testing.assert_allclose(panel.values, reference.values, rtol=1e-6)
+    
+    # float32 prices give the float64 statistics to about six significant digits
+    stats = create_market_overview(universe)
+    expected = create_market_overview(data_dict)
+    assert stats['Records'].tolist() == [len(data) for data in data_dict.values()]
+    for column in ('Last_Close', 'Total_Return', 'Volatility'):
+        np.testing.assert_allclose(stats[column], expected[column], rtol=1e-5)
+
+def test_subset_keeps_order_and_pickles():
+    universe = MarketUniverse.from_data_dict(make_data_dict())
+    subset = select_tickers(universe, ['T005.IS', 'T001.IS', 'MISSING.IS'])
+    
+    assert isinstance(subset, MarketUniverse) and subset.tickers == ['T005.IS', 'T001.IS']
+    restored = pickle.loads(pickle.dumps(subset))
+    pd.testing.assert_frame_equal(restored['T001.IS'], universe['T001.IS'])
+    pd.testing.assert_frame_equal(subset['T005.IS'], universe['T005.IS'])
+    assert subset['T005.IS']['Dividends'].sum() == 0.35
+
+def test_visualizer_accepts_a_universe(tmp_path):
+    universe = MarketUniverse.from_data_dict(make_data_dict(n_tickers=6, n_days=150))
+    visualizer = BISTDataVisualizer(str(tmp_path))
+    
+    visualizer.plot_price_comparison(universe, str(tmp_path / 'prices.png'))
+    visualizer.plot_correlation_matrix(universe, str(tmp_path / 'correlation.png'))
+    visualizer.create_lightweight_dashboard(universe, str(tmp_path / 'dashboard.html'))
+    
+    assert (tmp_path / 'prices.png').exists()
+    assert (tmp_path / 'correlation.png').exists()
+    assert len(list((tmp_path / 'dashboard_data').glob('*.js'))) == 6
+
+def test_streaming_load_never_holds_every_frame(tmp_path):
+    data_dict = make_data_dict(n_tickers=120)
+    storage = CSVStorage(str(tmp_path))
+    for ticker, data in data_dict.items():
+        storage.save(ticker, data, "ytd", "1d")
+    
+    tracemalloc.start()
+    frames, _ = load_market_data(storage)
+    packed = MarketUniverse.from_data_dict(frames)
+    del frames
+    _, dict_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    universe, report = load_universe(storage)
+    _, streamed_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    assert report['loaded'] == 120 and universe.tickers == packed.tickers
+    pd.testing.assert_frame_equal(universe['T005.IS'], packed['T005.IS'])
+    assert streamed_peak < dict_peak * 0.7
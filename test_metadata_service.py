@@ -0,0 +1,103 @@
+"""
+BIST Trading System - Metadata Service Tests
+Exercises the cached metadata service against a local fake info fetcher
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from data_downloader import BISTDataDownloader
+from metadata_service import MetadataService
+
+TICKERS = [f"T{i:02d}.IS" for i in range(12)]
+
+
+class FakeInfo:
+    """Returns synthetic ticker info and records request concurrency"""
+    
+    def __init__(self, latency: float = 0.05, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self, ticker):
+        with self._lock:
+            self.calls.append(ticker)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            if ticker in self.failing:
+                raise ValueError(f"simulated failure for {ticker}")
+            return {'symbol': ticker, 'name': f"{ticker} A.S.", 'sector': 'Industrials',
+                    'industry': 'N/A', 'market_cap': 1e9 + len(ticker), 'currency': 'TRY'}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+def make_service(tmp_path, fetcher, **kwargs):
+    kwargs.setdefault('requests_per_second', 1000)
+    return MetadataService(str(tmp_path / 'ticker_info.csv'), fetcher=fetcher,
+                           retry_attempts=1, **kwargs)
+
+def test_universe_is_fetched_concurrently_and_persisted(tmp_path):
+    fetcher = FakeInfo()
+    service = make_service(tmp_path, fetcher, max_workers=6)
+    
+    start = time.perf_counter()
+    table = service.get_many(TICKERS)
+    elapsed = time.perf_counter() - start
+    
+    assert sorted(fetcher.calls) == TICKERS
+    assert fetcher.max_active > 1 and elapsed < len(TICKERS) * fetcher.latency / 2
+    assert list(table.index) == TICKERS
+    assert (table['Sector'] == 'Industrials').all() and table['Industry'].isna().all()
+    
+    # Served from memory, then from the table file by a new service
+    service.get_many(TICKERS)
+    reopened = make_service(tmp_path, fetcher)
+    pd.testing.assert_frame_equal(reopened.get_many(TICKERS), table)
+    assert len(fetcher.calls) == len(TICKERS)
+
+def test_expired_rows_are_refetched_and_failures_keep_stale_rows(tmp_path):
+    fetcher = FakeInfo(latency=0)
+    service = make_service(tmp_path, fetcher, ttl_days=1)
+    service.get_many(TICKERS[:4])
+    
+    # Age two rows past the TTL; one of them now fails to fetch
+    old = (datetime.now() - timedelta(days=2)).isoformat(timespec='seconds')
+    for ticker in TICKERS[:2]:
+        service._load()[ticker]['Fetched'] = old
+    fetcher.calls.clear()
+    fetcher.failing = {TICKERS[1], TICKERS[5]}
+    
+    table = service.get_many(TICKERS[:6])
+    assert sorted(fetcher.calls) == [TICKERS[0], TICKERS[1], TICKERS[4], TICKERS[5]]
+    assert service.is_fresh(TICKERS[0]) and not service.is_fresh(TICKERS[1])
+    assert table.loc[TICKERS[1], 'Name'] == f"{TICKERS[1]} A.S."       # stale row still served
+    assert table.loc[TICKERS[5]].isna().all()                          # never fetched
+    
+    fetcher.calls.clear()
+    service.get_many(TICKERS[:6], refresh=True)
+    assert sorted(fetcher.calls) == TICKERS[:6]
+
+def test_downloader_ticker_info_uses_the_cache(tmp_path):
+    fetcher = FakeInfo(latency=0)
+    downloader = BISTDataDownloader(data_dir=str(tmp_path / 'data'),
+                                    metadata=make_service(tmp_path, fetcher))
+    
+    info = downloader.get_ticker_info('THYAO.IS')
+    assert info == {'symbol': 'THYAO.IS', 'name': 'THYAO.IS A.S.', 'sector': 'Industrials',
+                    'industry': 'N/A', 'market_cap': 1e9 + 8, 'currency': 'TRY'}
+    assert downloader.get_ticker_info('THYAO.IS') == info
+    assert fetcher.calls == ['THYAO.IS']
+    
+    fetcher.failing = {'NOPE.IS'}
+    assert downloader.get_ticker_info('NOPE.IS') is None
+    assert list(downloader.get_universe_info(['THYAO.IS', 'NOPE.IS']).index) == ['THYAO.IS', 'NOPE.IS']
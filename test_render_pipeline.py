@@ -0,0 +1,68 @@
+"""
+BIST Trading System - Render Pipeline Tests
+Renders chart jobs on the process pool and checks the collected results
+"""
+
+import os
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+
+from data_visualizer import BISTDataVisualizer
+from render_pipeline import render_job_spec, run_render_jobs
+
+def make_data(tickers=("THYAO.IS", "GARAN.IS", "AKBNK.IS"), n=60):
+    rng = np.random.default_rng(5)
+    index = pd.date_range('2025-01-02', periods=n, freq='B', tz='Europe/Istanbul')
+    return {ticker: pd.DataFrame({
+        'Close': 50 * np.cumprod(1 + rng.normal(0, 0.02, n)),
+        'Volume': rng.integers(1e5, 1e7, n),
+    }, index=index) for ticker in tickers}
+
+def test_jobs_render_in_worker_processes(tmp_path):
+    data_dict = make_data()
+    jobs = [
+        render_job_spec("price", "plot_price_comparison", str(tmp_path / "price.png"), data_dict),
+        render_job_spec("heatmap", "plot_correlation_matrix", str(tmp_path / "corr.png"),
+                        data_dict, cluster=True),
+        # Missing Close column: the visualizer logs the error and writes nothing
+        render_job_spec("broken", "plot_price_comparison", str(tmp_path / "broken.png"),
+                        {"X.IS": pd.DataFrame({'Open': [1.0]})}),
+    ]
+    
+    results = run_render_jobs(jobs, str(tmp_path), max_workers=2)
+    
+    assert [result['name'] for result in results] == ["price", "heatmap", "broken"]
+    assert [result['success'] for result in results] == [True, True, False]
+    assert os.path.exists(results[0]['path'])
+    assert results[2]['path'] is None
+    assert all(result['pid'] != os.getpid() for result in results)
+    assert all(result['elapsed'] >= 0 for result in results)
+
+def test_generate_all_visualizations_collects_outputs(tmp_path):
+    visualizer = BISTDataVisualizer(str(tmp_path))
+    
+    results = visualizer.generate_all_visualizations(make_data(), max_workers=1)
+    
+    assert [result['name'] for result in results] == [
+        "price_comparison", "volume_analysis", "interactive_dashboard", "correlation_matrix"]
+    assert all(result['success'] and os.path.exists(result['path']) for result in results)
+
+def test_stale_files_and_duplicate_names_are_rejected(tmp_path):
+    stale = tmp_path / "broken.png"
+    stale.write_bytes(b"chart from an earlier run")
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+    broken = {"X.IS": pd.DataFrame({'Open': [1.0]})}
+    
+    results = run_render_jobs([render_job_spec("broken", "plot_price_comparison", str(stale), broken)],
+                              str(tmp_path), max_workers=1)
+    assert not results[0]['success'] and results[0]['path'] is None
+    plt.close('all')  # the failed in-process render leaves its figure open
+    
+    jobs = [render_job_spec("chart", "plot_price_comparison", str(tmp_path / f"{i}.png"), make_data())
+            for i in range(2)]
+    with pytest.raises(ValueError, match="chart"):
+        run_render_jobs(jobs, str(tmp_path))
@@ -0,0 +1,84 @@
+"""
+BIST Trading System - Returns Cache Tests
+Checks the cached matrices against per-ticker pandas and the cache invalidation
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_downloader import BISTDataDownloader
+from data_storage import CSVStorage
+from returns_cache import RETURNS_CACHE_NAME, ReturnsCache, load_returns_cache
+
+def make_history(n=60, seed=0, start='2025-01-02'):
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.date_range(start, periods=n, freq='B',
+                                           tz='Europe/Istanbul'), name='Date')
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(1e5, 1e7, n), 'Dividends': 0.0, 'Stock Splits': 0.0,
+    }, index=index)
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = CSVStorage(str(tmp_path))
+    storage.save("THYAO.IS", make_history(seed=1), "ytd", "1d")
+    storage.save("GARAN.IS", make_history(seed=2), "ytd", "1d")
+    storage.save("AKBNK.IS", make_history(n=40, seed=3, start='2025-02-03'), "ytd", "1d")
+    return str(tmp_path)
+
+def test_cache_matches_per_ticker_computation(data_dir):
+    data_dict = CSVStorage(data_dir).load_all()
+    cache = ReturnsCache.from_data_dict(data_dict)
+    
+    for ticker, data in data_dict.items():
+        simple = cache.simple[ticker].dropna()
+        np.testing.assert_allclose(simple, data['Close'].pct_change().dropna(), rtol=1e-12)
+        np.testing.assert_allclose(cache.log[ticker].dropna(), np.log(1 + simple), rtol=1e-12)
+        normalized = cache.normalized[ticker].dropna()
+        np.testing.assert_allclose(normalized, data['Close'] / data['Close'].iloc[0] * 100,
+                                   rtol=1e-12)
+    
+    # The late listing does not disturb correlations of the other tickers
+    expected = pd.DataFrame({t: d['Close'].pct_change().dropna() for t, d in data_dict.items()}).corr()
+    np.testing.assert_allclose(cache.simple[list(data_dict)].corr(), expected, rtol=1e-10)
+
+def test_cache_is_reused_until_downloader_rewrites_a_ticker(data_dir, monkeypatch):
+    first = load_returns_cache(data_dir=data_dir)
+    assert sorted(first.tickers) == ["AKBNK.IS", "GARAN.IS", "THYAO.IS"]
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("cache should not be rebuilt")
+    
+    with monkeypatch.context() as m:
+        m.setattr(ReturnsCache, "from_data_dict", classmethod(fail))
+        reused = load_returns_cache(data_dir=data_dir)
+    assert reused.fingerprint == first.fingerprint
+    pd.testing.assert_frame_equal(reused.simple, first.simple, check_index_type=False)
+    
+    downloader = BISTDataDownloader(data_dir, fetcher=lambda *args, **kwargs: make_history(n=80, seed=4))
+    downloader.download_ticker_data("GARAN.IS", period="ytd")
+    assert not os.path.exists(os.path.join(data_dir, f"{RETURNS_CACHE_NAME}.npz"))
+    
+    rebuilt = load_returns_cache(data_dir=data_dir)
+    assert rebuilt.fingerprint != first.fingerprint
+    assert rebuilt.simple['GARAN.IS'].count() == 79
+
+def test_cache_of_a_subset_is_not_served_for_everything(data_dir):
+    storage = CSVStorage(data_dir)
+    subset = {ticker: data for ticker, data in storage.load_all().items() if ticker != "AKBNK.IS"}
+    
+    partial = load_returns_cache(subset, storage)
+    assert sorted(partial.tickers) == ["GARAN.IS", "THYAO.IS"]
+    
+    full = load_returns_cache(data_dir=data_dir)
+    assert sorted(full.tickers) == ["AKBNK.IS", "GARAN.IS", "THYAO.IS"]
+    assert full.fingerprint != partial.fingerprint
+    
+    # A caller passing every ticker reuses the full cache
+    assert load_returns_cache(storage.load_all(), storage).fingerprint == full.fingerprint
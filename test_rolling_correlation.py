@@ -0,0 +1,51 @@
+"""
+BIST Trading System - Rolling Correlation Tests
+Checks the incremental rolling cube against pandas rolling corr/cov
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_correlation import RollingCorrelation, compute_rolling_windows
+
+def make_returns(n_days=150, n_tickers=6, seed=11):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-02', periods=n_days, freq='B', tz='Europe/Istanbul')
+    values = rng.normal(0, 0.02, (n_days, n_tickers))
+    values[rng.random(values.shape) < 0.08] = np.nan      # missing days
+    values[:40, 2] = np.nan                               # late listing
+    return pd.DataFrame(values, index=dates, columns=[f"T{i}.IS" for i in range(n_tickers)])
+
+def test_incremental_cube_matches_pandas_rolling(tmp_path):
+    returns = make_returns()
+    
+    rolling = RollingCorrelation.compute(returns, window=20, data_dir=str(tmp_path), min_periods=10)
+    
+    assert rolling.corr.dtype == np.float32
+    for first, second in rolling.pairs:
+        expected = returns[first].rolling(20, min_periods=10).corr(returns[second])
+        np.testing.assert_allclose(rolling.pair(first, second), expected, rtol=1e-5, atol=1e-6)
+        expected = returns[first].rolling(20, min_periods=10).cov(returns[second])
+        np.testing.assert_allclose(rolling.pair(first, second, kind='cov'), expected,
+                                   rtol=1e-5, atol=1e-10)
+
+def test_query_by_date_and_pair_list(tmp_path):
+    returns = make_returns()
+    pairs = [("T0.IS", "T1.IS"), ("T3.IS", "T2.IS")]
+    
+    results = compute_rolling_windows(returns, windows=[20, 60], pairs=pairs,
+                                      data_dir=str(tmp_path), min_periods=40)
+    rolling = RollingCorrelation.open(60, str(tmp_path))
+    
+    assert sorted(results) == [20, 60]
+    assert rolling.pairs == pairs
+    # A weekend date resolves to the preceding Friday's window
+    friday = returns.index[returns.index.dayofweek == 4][-2]
+    matrix = rolling.at(friday + pd.Timedelta(days=1))
+    expected = returns.loc[:friday].iloc[-60:][['T0.IS', 'T1.IS']].corr().iloc[0, 1]
+    assert matrix.loc['T1.IS', 'T0.IS'] == pytest.approx(expected, rel=1e-5)
+    assert np.isnan(matrix.loc['T0.IS', 'T4.IS'])
+    assert rolling.pair("T2.IS", "T3.IS").notna().sum() > 0
+    with pytest.raises(KeyError):
+        rolling.at(returns.index[0] - pd.Timedelta(days=1))
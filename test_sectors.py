@@ -0,0 +1,140 @@
+"""
+BIST Trading System - Sector Tests
+Checks the cached sector table and the grouped aggregates against per-sector loops
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from create_mega_viz import create_sector_analysis
+from market_panel import MarketPanel
+from market_universe import MarketUniverse
+from metadata_service import MetadataService
+from config import INDEX_CONSTITUENTS
+from sectors import index_membership, load_sector_table, sector_aggregates, sector_summary
+
+SECTORS = {'AKBNK.IS': 'Financial Services', 'GARAN.IS': 'Financial Services',
+           'THYAO.IS': 'Industrials', 'PGSUS.IS': 'Industrials', 'ASELS.IS': 'Industrials',
+           'BIMAS.IS': 'Consumer Defensive'}
+
+def make_data_dict(n_days=120, seed=9):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2025-03-03', periods=n_days, tz='Europe/Istanbul')
+    data_dict = {}
+    for i, ticker in enumerate(list(SECTORS) + ['XU100.IS']):
+        close = 30 * np.cumprod(1 + rng.normal(0, 0.02, n_days))
+        data = pd.DataFrame({'Close': close, 'Volume': rng.integers(1e4, 1e6, n_days).astype(float)},
+                            index=dates)
+        if ticker == 'PGSUS.IS':
+            data = data.iloc[40:]                                      # late listing
+        if ticker == 'GARAN.IS':
+            data = data.drop(data.index[10:15])                        # suspension
+        data_dict[ticker] = data
+    return data_dict
+
+def fake_info(calls):
+    def fetch(ticker):
+        calls.append(ticker)
+        if ticker == 'ASELS.IS':
+            return None
+        return {'symbol': ticker, 'name': ticker, 'sector': SECTORS[ticker], 'industry': 'N/A',
+                'market_cap': 1e9 * (len(calls) + 1), 'currency': 'TRY'}
+    return fetch
+
+def test_sector_table_is_fetched_once_and_falls_back(tmp_path):
+    tickers = list(SECTORS) + ['XU030.IS', 'XU100.IS']
+    calls = []
+    metadata = MetadataService(str(tmp_path / 'ticker_info.csv'), fetcher=fake_info(calls),
+                               requests_per_second=1000, retry_attempts=1)
+    
+    table = load_sector_table(tickers, metadata)
+    assert sorted(calls) == sorted(SECTORS)                            # indexes are not looked up
+    assert table.loc['XU030.IS', 'Sector'] == 'Index'
+    assert table.loc['AKBNK.IS', 'Sector'] == 'Financial Services'
+    assert pd.isna(table.loc['AKBNK.IS', 'Industry'])
+    assert table.loc['ASELS.IS', 'Sector'] == 'Technology'             # failed lookup -> built-in map
+    assert table.loc['ASELS.IS', 'Source'] == 'fallback'
+    
+    calls.clear()
+    again = load_sector_table(tickers, metadata)
+    assert calls == ['ASELS.IS']                                       # only the failed one is retried
+    pd.testing.assert_series_equal(again['Sector'], table['Sector'])
+
+def test_aggregates_match_per_sector_loops():
+    data_dict = make_data_dict()
+    panel = MarketPanel.from_data_dict(data_dict, fields=['Close', 'Volume'])
+    table = pd.DataFrame({'Sector': pd.Series(SECTORS), 'Market_Cap': 1e9})
+    table.loc['XU100.IS'] = ['Index', np.nan]
+    table.loc['BIMAS.IS', 'Market_Cap'] = 4e9
+    
+    aggregates = sector_aggregates(panel, table)
+    assert list(aggregates['equal'].columns) == ['Consumer Defensive', 'Financial Services', 'Industrials']
+    
+    returns = {ticker: data['Close'].pct_change() for ticker, data in data_dict.items()}
+    turnover = {ticker: data['Close'] * data['Volume'] for ticker, data in data_dict.items()}
+    caps = {ticker: table.loc[ticker, 'Market_Cap'] * data['Close'].shift() / data['Close'].iloc[-1]
+            for ticker, data in data_dict.items()}
+    for sector in ['Financial Services', 'Industrials']:
+        members = [ticker for ticker, name in SECTORS.items() if name == sector]
+        r = pd.DataFrame({t: returns[t] for t in members})
+        v = pd.DataFrame({t: turnover[t] for t in members}).where(r.notna())
+        c = pd.DataFrame({t: caps[t] for t in members}).where(r.notna())
+        breadth = (np.sign(r).sum(axis=1) / r.notna().sum(axis=1)).where(r.notna().any(axis=1))
+        
+        pd.testing.assert_series_equal(aggregates['equal'][sector], r.mean(axis=1),
+                                       check_names=False, check_freq=False)
+        pd.testing.assert_series_equal(aggregates['volume'][sector], (r * v).sum(axis=1, min_count=1) / v.sum(axis=1),
+                                       check_names=False, check_freq=False)
+        pd.testing.assert_series_equal(aggregates['cap'][sector], (r * c).sum(axis=1, min_count=1) / c.sum(axis=1),
+                                       check_names=False, check_freq=False)
+        pd.testing.assert_series_equal(aggregates['breadth'][sector], breadth,
+                                       check_names=False, check_freq=False)
+    
+    summary = sector_summary(aggregates, table)
+    assert set(summary['Sector']) == {'Consumer Defensive', 'Financial Services', 'Industrials'}
+    assert summary.loc[summary['Sector'] == 'Industrials', 'Tickers'].item() == 3
+
+def test_sector_analysis_covers_the_universe():
+    data_dict = make_data_dict()
+    table = pd.DataFrame({'Sector': pd.Series(SECTORS), 'Market_Cap': np.nan})
+    table.loc['XU100.IS'] = ['Index', np.nan]
+    
+    performance, aggregates, _ = create_sector_analysis(MarketUniverse.from_data_dict(data_dict),
+                                                        sector_table=table)
+    assert sorted(performance) == ['Consumer Defensive', 'Financial Services', 'Industrials']
+    banks = performance['Financial Services']
+    assert banks.iloc[0] == 100.0 and banks.notna().all()
+    assert aggregates['cap'].isna().all().all()                        # no market caps, no cap weighting
+
+def test_index_membership_is_one_hot():
+    assert set(INDEX_CONSTITUENTS['XU030']) <= set(INDEX_CONSTITUENTS['XU100'])
+    assert len(set(INDEX_CONSTITUENTS['XU100'])) == 100
+    
+    membership = index_membership(['THYAO.IS', 'ULKER.IS', 'A1CAP.IS', 'XU100.IS'])
+    assert list(membership.columns) == ['XU030', 'XU100']
+    assert membership.loc['THYAO.IS'].tolist() == [1.0, 1.0]
+    assert membership.loc['ULKER.IS'].tolist() == [0.0, 1.0]
+    assert membership.loc['A1CAP.IS'].tolist() == [0.0, 0.0]
+    assert membership.loc['XU100.IS'].tolist() == [0.0, 0.0]
+
+def test_aggregates_of_index_constituents():
+    data_dict = make_data_dict()
+    panel = MarketPanel.from_data_dict(data_dict, fields=['Close', 'Volume'])
+    table = pd.DataFrame({'Sector': pd.Series(SECTORS), 'Market_Cap': 1e9})
+    table.loc['XU100.IS'] = ['Index', np.nan]
+    constituents = {'XU030': ['AKBNK', 'THYAO', 'ASELS']}
+    
+    aggregates = sector_aggregates(panel, table, index='XU030', constituents=constituents)
+    members = list(constituents['XU030'])
+    subset = MarketPanel.from_data_dict({t: d for t, d in data_dict.items() if t.split('.')[0] in members},
+                                        fields=['Close', 'Volume'])
+    expected = sector_aggregates(subset, table)
+    
+    for name in ['equal', 'volume', 'cap', 'breadth', 'members']:
+        result = aggregates[name][expected[name].columns].loc[subset.dates]
+        pd.testing.assert_frame_equal(result, expected[name], check_freq=False)
+    assert (aggregates['members']['Consumer Defensive'] == 0).all()   # BIMAS is not a member
+    
+    with pytest.raises(ValueError, match="Unknown index"):
+        sector_aggregates(panel, table, index='XU050', constituents=constituents)
@@ -0,0 +1,72 @@
+"""
+BIST Trading System - Sweep Runner Tests
+Checks the shared-memory panel and the tidy results of a parameter sweep
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_panel import MarketPanel
+from sweep_runner import SharedPanel, run_sweep
+
+def make_panel(n=200, n_tickers=6, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-02', periods=n, freq='B', tz='Europe/Istanbul')
+    close = 50 * np.cumprod(1 + rng.normal(0, 0.02, (n, n_tickers)), axis=0)
+    volume = rng.integers(1e5, 1e7, (n, n_tickers)).astype(float)
+    return MarketPanel(np.stack([close, volume]), dates,
+                       [f"T{i}.IS" for i in range(n_tickers)], ['Close', 'Volume'])
+
+def volatility_screen(panel, window, threshold):
+    """Share of tickers whose latest rolling volatility is above a threshold"""
+    if threshold < 0:
+        raise ValueError("negative threshold")
+    volatility = panel.field('Close').pct_change().rolling(window).std().iloc[-1]
+    return {'above': float((volatility > threshold).mean()), 'shared': not panel.values.flags.writeable,
+            'pid': os.getpid()}
+
+def test_shared_panel_is_a_view_of_one_block():
+    panel = make_panel()
+    
+    with SharedPanel.create(panel) as shared:
+        attached = SharedPanel.attach(shared.spec())
+        shared.panel.values[0, 0, 0] = -1.0
+        
+        assert attached.panel.values[0, 0, 0] == -1.0
+        assert not attached.panel.values.flags.writeable
+        pd.testing.assert_frame_equal(attached.panel.field('Volume'), panel.field('Volume'))
+        attached.close()
+    
+    assert panel.values[0, 0, 0] != -1.0
+
+def test_sweep_gathers_a_tidy_table_across_workers():
+    panel = make_panel()
+    grid = {'window': [10, 20, 60], 'threshold': [-1.0, 0.015, 0.02]}
+    
+    results = run_sweep(panel, volatility_screen, grid, max_workers=2)
+    serial = run_sweep(panel, volatility_screen, grid, max_workers=1)
+    
+    assert list(results.columns) == ['window', 'threshold', 'above', 'shared', 'pid', 'elapsed', 'error']
+    assert len(results) == 9
+    assert results[['window', 'threshold']].values.tolist() == serial[['window', 'threshold']].values.tolist()
+    pd.testing.assert_series_equal(results['above'], serial['above'])
+    
+    failed = results[results['threshold'] < 0]
+    assert failed['error'].str.contains('negative threshold').all()
+    assert failed['above'].isna().all()
+    
+    workers = results.dropna(subset=['above'])
+    assert workers['shared'].astype(bool).all()
+    assert os.getpid() not in set(workers['pid'])
+
+def test_shared_block_is_released():
+    shared = SharedPanel.create(make_panel(n=5))
+    name = shared.shm.name
+    shared.close()
+    
+    with pytest.raises(FileNotFoundError):
+        SharedPanel.attach({'name': name, 'shape': (1,), 'dtype': '<f8', 'dates': None,
+                            'tickers': [], 'fields': [], 'metadata': None})
@@ -0,0 +1,57 @@
+"""
+BIST Trading System - Volume Analysis Tests
+Checks the paged volume charts and the downsampling helpers
+"""
+
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from data_visualizer import BISTDataVisualizer
+from decimation import aggregate_volume, decimate_series, lttb_indices
+
+def make_data(n_tickers, n=120):
+    rng = np.random.default_rng(9)
+    index = pd.date_range('2025-01-02', periods=n, freq='B', tz='Europe/Istanbul')
+    return {f"T{i:02d}.IS": pd.DataFrame({
+        'Close': 10 + rng.random(n), 'Volume': rng.integers(1e5, 1e7, n),
+    }, index=index) for i in range(n_tickers)}
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.random.default_rng(0).normal(size=5000)
+    y[2500] = 40.0
+    
+    kept = lttb_indices(np.arange(5000), y, 200)
+    
+    assert len(kept) == 200
+    assert kept[0] == 0 and kept[-1] == 4999
+    assert 2500 in kept
+    assert np.all(np.diff(kept) > 0)
+
+def test_weekly_aggregation_and_decimation_preserve_volume_shape():
+    volume = make_data(1)["T00.IS"]['Volume']
+    
+    weekly = aggregate_volume(volume, 'W')
+    assert weekly.sum() == volume.sum()
+    assert len(weekly) == 25                     # first week is partial (Thursday start)
+    assert (weekly.index.dayofweek == 4).all()
+    
+    decimated = decimate_series(volume, 30)
+    assert len(decimated) == 30
+    assert decimated.index[0] == volume.index[0]
+
+def test_large_universe_is_split_into_pages(tmp_path):
+    visualizer = BISTDataVisualizer(str(tmp_path))
+    
+    saved = visualizer.plot_volume_analysis(make_data(25), str(tmp_path / "volume.png"),
+                                            tickers_per_page=12, aggregate='W')
+    
+    assert [os.path.basename(path) for path in saved] == [
+        "volume_p01.png", "volume_p02.png", "volume_p03.png"]
+    assert all(os.path.exists(path) for path in saved)
+    assert plt.get_fignums() == []
+    
+    single = visualizer.plot_volume_analysis(make_data(2), str(tmp_path / "small.png"), max_bars=50)
+    assert single == [str(tmp_path / "small.png")]